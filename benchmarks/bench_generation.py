@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+Generation Benchmark - Report and project generation at scale
+
+Generates synthetic research projects (STEERING.md, N labnotes as .ipynb
+or .md, a results tree of tiny figures/tables) and measures wall time,
+CPU time (including worker processes) and peak RSS of:
+  - init_report()           cold cache, warm cache, and --update with nothing changed
+  - generate_placeholders() on already collected metadata
+  - init_project()          fresh directory, and re-run over the synthetic project
+  - export_pdf.sh (--force, and unchanged with its build cache) and
+    notebook_to_pdf.sh with stub pandoc/typst/nbconvert on PATH
+
+The stubs read their input and write a placeholder PDF/markdown, so the
+script timings cover wrapper overhead and I/O, not typesetting.
+
+Each measurement runs in a fresh subprocess so peak RSS is not shared.
+Results are written as JSON (with git commit and platform) and can be
+compared against an earlier run to spot regressions between commits;
+--compare exits 1 when any measurement is slower or larger than the
+baseline by more than --threshold.
+
+Usage:
+    bench_generation.py [--notebooks 1,10,100] [--formats ipynb,md] [--notebook-kb 64]
+                        [--results-files 10000] [--repeat 3] [--jobs N]
+                        [--scenarios name,...] [--output <results.json>]
+                        [--compare <baseline.json>] [--threshold 1.2] [--keep <dir>]
+
+Examples:
+    bench_generation.py --output bench-main.json
+    bench_generation.py --notebooks 1000 --formats md --compare bench-main.json
+    bench_generation.py --notebooks 1 --notebook-kb 1048576 --scenarios init_report_cold
+"""
+
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+REPORT_SCRIPTS = ROOT_DIR / 'plugins' / 'experiment-report' / 'scripts'
+PROJECT_SCRIPTS = ROOT_DIR / 'plugins' / 'research-project' / 'scripts'
+LABNOTE_SCRIPTS = ROOT_DIR / 'plugins' / 'lab-notebook' / 'scripts'
+
+SCENARIOS = (
+    'init_report_cold',
+    'init_report_warm',
+    'init_report_update',
+    'generate_placeholders',
+    'init_project_fresh',
+    'init_project_existing',
+    'export_pdf',
+    'export_pdf_cached',
+    'notebook_to_pdf',
+)
+
+REPORT_TITLE = 'Report_Synthetic_Benchmark'
+
+STEERING = '# Research Steering\n\n## Research Question\n\nSynthetic benchmark project.\n'
+
+DE_LINE = 'GENE{index:05d}\tbaseMean={mean:.1f}\tlog2FoldChange={fc:.3f}\tpvalue={p:.2e}\tpadj={padj:.2e}\n'
+
+# Stub tools: read the input (I/O cost) and write the expected output file.
+# pandoc renders a given template with empty metadata and the input as body.
+STUB_PANDOC = '''#!/bin/sh
+[ "$1" = "--version" ] && { echo "pandoc stub"; exit 0; }
+out=""
+input=""
+template=""
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -o) out="$2"; shift 2 ;;
+        -f|-t) shift 2 ;;
+        --template=*) template="${1#--template=}"; shift ;;
+        -*) shift ;;
+        *) input="$1"; shift ;;
+    esac
+done
+if [ -n "$out" ]; then
+    cat "$input" > /dev/null
+    printf '%%PDF-1.7\\n%%stub\\n' > "$out"
+elif [ -n "$template" ]; then
+    sed -e 's/\\$meta-json\\$/{}/' -e '/\\$body\\$/d' "$template"
+    cat "$input"
+else
+    cat "$input"
+fi
+'''
+
+STUB_TYPST = '''#!/bin/sh
+[ "$1" = "--version" ] && { echo "typst stub"; exit 0; }
+eval out=\\${$#}
+eval input=\\${$(($# - 1))}
+cat "$input" > /dev/null
+printf '%%PDF-1.7\\n%%stub\\n' > "$out"
+'''
+
+STUB_NBCONVERT = '''#!/bin/sh
+[ "$1" = "nbconvert" ] && shift
+name=""
+input=""
+dir=""
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --output) name="$2"; shift 2 ;;
+        --output-dir) dir="$2"; shift 2 ;;
+        --to) shift 2 ;;
+        -*) shift ;;
+        *) input="$1"; shift ;;
+    esac
+done
+cat "$input" > /dev/null
+printf '# %s\\n' "$name" > "${dir:-$(dirname "$input")}/$name.md"
+'''
+
+
+def _png_header(width, height):
+    """Smallest PNG prefix results_index can read dimensions from."""
+    ihdr = b'IHDR' + struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + ihdr
+            + struct.pack('>I', zlib.crc32(ihdr) & 0xffffffff))
+
+
+def _sections(exp_id, index):
+    return {
+        'Hypothesis': f'{exp_id} tests whether gene set {index} is upregulated in resistant cells.',
+        'Background & Prior Work': f'Builds on Exp{max(index - 1, 0):02d}; see notebook/knowledge/.',
+        'Materials and Methods': '### Data\n\n- TCGA-BRCA (2024-01)\n\n### Tools\n\n- DESeq2 1.38\n',
+        'Results': f'{100 + index} genes differentially expressed (padj < 0.05, n = 12, Welch t-test p = 0.003).',
+        'Discussion': '### Interpretation\n\nConsistent with prior work.\n\n### Next Steps\n\n1. qPCR validation\n',
+    }
+
+
+def write_labnote_ipynb(path, exp_id, index, size_kb):
+    """
+    Stream a synthetic .ipynb of roughly size_kb to disk.
+
+    Code cells carry a DESeq2-style stream output and a base64 PNG, so both
+    section extraction and statistic harvesting see realistic content.
+    """
+    target = size_kb * 1024
+    image_kb = max(1, min(256, size_kb // 8))
+    image = 'iVBORw0KGgo' + 'A' * (image_kb * 1024 - 11)
+    written = 0
+    cell = 0
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n "cells": [\n')
+        f.write(json.dumps({'cell_type': 'markdown', 'metadata': {}, 'source': f'# {exp_id}\n\n**Date**: 2025-01-15\n'}))
+        for heading, body in _sections(exp_id, index).items():
+            f.write(',\n' + json.dumps({'cell_type': 'markdown', 'metadata': {}, 'source': f'## {heading}\n\n{body}\n'}))
+        while written < target:
+            table = ''.join(DE_LINE.format(index=cell * 40 + i, mean=100.0 + i, fc=1.5 - i * 0.05,
+                                           p=1e-4 * (i + 1), padj=1e-3 * (i + 1)) for i in range(40))
+            text = json.dumps({
+                'cell_type': 'code',
+                'execution_count': cell,
+                'metadata': {},
+                'source': [f'res_{cell} = run_deseq(dds)\n', f'plot_volcano(res_{cell})\n'],
+                'outputs': [
+                    {'output_type': 'stream', 'name': 'stdout', 'text': table},
+                    {'output_type': 'display_data', 'metadata': {},
+                     'data': {'image/png': image, 'text/plain': ['<Figure size 800x600>']}},
+                ],
+            })
+            f.write(',\n' + text)
+            written += len(text)
+            cell += 1
+        f.write('\n ],\n "metadata": {},\n "nbformat": 4,\n "nbformat_minor": 5\n}\n')
+
+
+def write_labnote_md(path, exp_id, index, size_kb):
+    """Stream a synthetic .md labnote of roughly size_kb, padded with a Results table."""
+    target = size_kb * 1024
+    sections = _sections(exp_id, index)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'# {exp_id}\n\n**Date**: 2025-01-15\n\n')
+        for heading in ('Hypothesis', 'Background & Prior Work', 'Materials and Methods'):
+            f.write(f'## {heading}\n\n{sections[heading]}\n\n')
+        f.write(f"## Results\n\n{sections['Results']}\n\n| Gene | log2FC | padj |\n|------|--------|------|\n")
+        written = f.tell()
+        row = 0
+        while written < target:
+            line = f'| GENE{row:05d} | {1.5 - (row % 40) * 0.05:.3f} | {1e-3 * (row % 40 + 1):.2e} |\n'
+            f.write(line)
+            written += len(line)
+            row += 1
+        f.write(f"\n## Discussion\n\n{sections['Discussion']}\n")
+
+
+def make_project(project_dir, num_notebooks, fmt, size_kb, results_files):
+    """
+    Create a synthetic project.
+
+    Args:
+        project_dir: Project root to create
+        num_notebooks: Number of labnotes (Exp01..ExpNN)
+        fmt: 'ipynb' or 'md'
+        size_kb: Approximate size of each labnote
+        results_files: Total files across results/exp## (half figures, half tables)
+
+    Returns:
+        List of labnote paths
+    """
+    labnote_dir = project_dir / 'notebook' / 'labnote'
+    labnote_dir.mkdir(parents=True)
+    (project_dir / 'notebook' / 'report').mkdir()
+    (project_dir / 'STEERING.md').write_text(STEERING)
+
+    width = max(2, len(str(num_notebooks)))
+    png = _png_header(800, 600)
+    per_experiment = -(-results_files // num_notebooks)
+    labnotes = []
+    for index in range(1, num_notebooks + 1):
+        exp_id = f'Exp{index:0{width}d}'
+        path = labnote_dir / f'{exp_id}_synthetic-benchmark.{fmt}'
+        if fmt == 'ipynb':
+            write_labnote_ipynb(path, exp_id, index, size_kb)
+        else:
+            write_labnote_md(path, exp_id, index, size_kb)
+        labnotes.append(path)
+
+        results_dir = project_dir / 'results' / exp_id.lower()
+        (results_dir / 'qc').mkdir(parents=True)
+        for number in range(per_experiment):
+            if number % 2 == 0:
+                (results_dir / f'fig{number:05d}_volcano.png').write_bytes(png)
+            else:
+                target_dir = results_dir / 'qc' if number % 10 == 1 else results_dir
+                (target_dir / f'table{number:05d}_de.csv').write_text('gene,log2fc,padj\nGENE1,1.5,0.001\n')
+    return labnotes
+
+
+def make_stub_tools(bin_dir):
+    """Write stub pandoc/typst/jupyter-nbconvert executables into bin_dir."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for name, script in (('pandoc', STUB_PANDOC), ('typst', STUB_TYPST),
+                         ('jupyter-nbconvert', STUB_NBCONVERT), ('jupyter', STUB_NBCONVERT)):
+        path = bin_dir / name
+        path.write_text(script)
+        path.chmod(0o755)
+
+
+def _usage():
+    """(cpu seconds, peak RSS MB) of this process and of waited-for children."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (own.ru_utime + own.ru_stime, children.ru_utime + children.ru_stime,
+            own.ru_maxrss / 1024, children.ru_maxrss / 1024)
+
+
+def run_child(spec):
+    """Run one measurement in this (fresh) process and print the result as JSON."""
+    sys.path[:0] = [str(REPORT_SCRIPTS), str(PROJECT_SCRIPTS)]
+    scenario = spec['scenario']
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        if scenario.startswith('init_report'):
+            from init_report import init_report
+            if scenario == 'init_report_cold':
+                shutil.rmtree(Path(spec['output']) / '.cache', ignore_errors=True)
+            policy = 'update' if scenario == 'init_report_update' else 'overwrite'
+            action = lambda: init_report(spec['labnotes'], spec['output'], REPORT_TITLE,
+                                         jobs=spec['jobs'], if_exists=policy)
+        elif scenario == 'generate_placeholders':
+            from init_report import collect_notebooks_metadata, generate_placeholders
+            metadata, _ = collect_notebooks_metadata(spec['labnotes'], Path(spec['output']), jobs=spec['jobs'])
+            action = lambda: generate_placeholders(metadata)
+        elif scenario.startswith('init_project'):
+            from init_project import init_project
+            path = spec['path']
+            if scenario == 'init_project_fresh':
+                Path(path).mkdir(parents=True, exist_ok=True)
+                path = tempfile.mkdtemp(prefix='project_', dir=path)
+            action = lambda: init_project(path)
+        else:
+            env = dict(os.environ, PATH=f"{spec['stub_bin']}{os.pathsep}{os.environ.get('PATH', '')}")
+            action = lambda: subprocess.run(spec['command'], env=env, check=True,
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        cpu_before, children_before, _, _ = _usage()
+        start = time.perf_counter()
+        value = action()
+        elapsed = time.perf_counter() - start
+        cpu_after, children_after, peak_rss, children_rss = _usage()
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+    if value is None or value is False:
+        raise SystemExit(f'{scenario} failed')
+    print(json.dumps({
+        'wall_s': elapsed,
+        'cpu_s': (cpu_after - cpu_before) + (children_after - children_before),
+        'peak_rss_mb': peak_rss,
+        'children_peak_rss_mb': children_rss,
+    }))
+
+
+def measure(spec, repeat):
+    """
+    Run a scenario `repeat` times, each in a fresh subprocess.
+
+    Returns:
+        dict with median/min wall time, median CPU time and max peak RSS
+    """
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, __file__, '--child', json.dumps(spec)],
+                                check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'wall_s': round(statistics.median(r['wall_s'] for r in runs), 4),
+        'wall_s_min': round(min(r['wall_s'] for r in runs), 4),
+        'cpu_s': round(statistics.median(r['cpu_s'] for r in runs), 4),
+        'peak_rss_mb': round(max(r['peak_rss_mb'] for r in runs), 1),
+        'children_peak_rss_mb': round(max(r['children_peak_rss_mb'] for r in runs), 1),
+        'runs': len(runs),
+    }
+
+
+def run_project_scenarios(project_dir, labnotes, scenarios, repeat, jobs, stub_bin):
+    """Yield (scenario, measurement) for every selected per-project scenario, in dependency order."""
+    report_dir = project_dir / 'notebook' / 'report'
+    labnotes = [str(path) for path in labnotes]
+    report_spec = {'labnotes': labnotes, 'output': str(report_dir), 'jobs': jobs}
+
+    for scenario in ('init_report_cold', 'init_report_warm', 'init_report_update', 'generate_placeholders'):
+        if scenario in scenarios:
+            yield scenario, measure({'scenario': scenario, **report_spec}, repeat)
+
+    if 'init_project_existing' in scenarios:
+        yield 'init_project_existing', measure({'scenario': 'init_project_existing', 'path': str(project_dir)}, repeat)
+
+    if 'export_pdf' in scenarios or 'export_pdf_cached' in scenarios:
+        report_path = report_dir / f'{REPORT_TITLE}.md'
+        if not report_path.exists():
+            # The PDF scenarios need a report even when init_report is not measured
+            measure({'scenario': 'init_report_warm', **report_spec}, 1)
+        command = ['bash', str(REPORT_SCRIPTS / 'export_pdf.sh'), str(report_path), str(report_dir / 'bench.pdf')]
+        for scenario, flags in (('export_pdf', ['--force']), ('export_pdf_cached', [])):
+            if scenario in scenarios:
+                yield scenario, measure({'scenario': scenario, 'command': command + flags,
+                                         'stub_bin': str(stub_bin)}, repeat)
+
+    if 'notebook_to_pdf' in scenarios:
+        command = ['bash', str(LABNOTE_SCRIPTS / 'notebook_to_pdf.sh'), labnotes[0],
+                   str(project_dir / 'bench_labnote.pdf')]
+        yield 'notebook_to_pdf', measure({'scenario': 'notebook_to_pdf', 'command': command,
+                                          'stub_bin': str(stub_bin)}, repeat)
+
+
+def _git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def result_key(result):
+    """Identity of a measurement across runs (scenario + project shape)."""
+    if result['notebooks'] is None:
+        return result['scenario']
+    return (f"{result['scenario']}/{result['format']}/n{result['notebooks']}/{result['notebook_kb']}kb"
+            f"/r{result['results_files']}")
+
+
+def compare(results, baseline_path, threshold):
+    """Print wall-time and RSS ratios against a baseline run; returns the regressed keys."""
+    baseline = {result_key(r): r for r in json.loads(Path(baseline_path).read_text())['results']}
+    regressed = []
+    print()
+    print(f"📋 Compared with {baseline_path} (⚠️  = slower or larger than {threshold:.2f}x)")
+    for result in results:
+        key = result_key(result)
+        base = baseline.get(key)
+        if base is None:
+            print(f"   {key:<58} (not in baseline)")
+            continue
+        wall_ratio = result['wall_s'] / base['wall_s'] if base['wall_s'] else float('inf')
+        rss_ratio = result['peak_rss_mb'] / base['peak_rss_mb'] if base['peak_rss_mb'] else float('inf')
+        flag = '⚠️ ' if wall_ratio > threshold or rss_ratio > threshold else '  '
+        if flag.strip():
+            regressed.append(key)
+        print(f" {flag}{key:<58} wall {base['wall_s']:8.3f} → {result['wall_s']:8.3f} s ({wall_ratio:5.2f}x)"
+              f"   RSS {base['peak_rss_mb']:7.1f} → {result['peak_rss_mb']:7.1f} MB ({rss_ratio:5.2f}x)")
+    return regressed
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(',') if value]
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ['--child']:
+        run_child(json.loads(args[1]))
+        return
+
+    counts = [1, 10, 100]
+    formats = ['ipynb', 'md']
+    sizes_kb = [64]
+    results_files = 10000
+    repeat = 3
+    jobs = None
+    scenarios = list(SCENARIOS)
+    output_path = None
+    baseline_path = None
+    threshold = 1.2
+    keep = None
+    i = 0
+    try:
+        while i < len(args):
+            if args[i] == '--notebooks' and i + 1 < len(args):
+                counts = _int_list(args[i + 1])
+            elif args[i] == '--formats' and i + 1 < len(args):
+                formats = [fmt for fmt in args[i + 1].split(',') if fmt]
+            elif args[i] == '--notebook-kb' and i + 1 < len(args):
+                sizes_kb = _int_list(args[i + 1])
+            elif args[i] == '--results-files' and i + 1 < len(args):
+                results_files = int(args[i + 1])
+            elif args[i] == '--repeat' and i + 1 < len(args):
+                repeat = int(args[i + 1])
+            elif args[i] == '--jobs' and i + 1 < len(args):
+                jobs = int(args[i + 1])
+            elif args[i] == '--scenarios' and i + 1 < len(args):
+                scenarios = [name for name in args[i + 1].split(',') if name]
+            elif args[i] == '--output' and i + 1 < len(args):
+                output_path = Path(args[i + 1])
+            elif args[i] == '--compare' and i + 1 < len(args):
+                baseline_path = args[i + 1]
+            elif args[i] == '--threshold' and i + 1 < len(args):
+                threshold = float(args[i + 1])
+            elif args[i] == '--keep' and i + 1 < len(args):
+                keep = Path(args[i + 1])
+            else:
+                raise ValueError(args[i])
+            i += 2
+    except ValueError:
+        print(__doc__)
+        sys.exit(1)
+
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    bad_formats = [fmt for fmt in formats if fmt not in ('ipynb', 'md')]
+    if unknown or bad_formats or not counts or min(counts) < 1 or repeat < 1:
+        print(f"❌ Error: scenarios must be among {', '.join(SCENARIOS)}; formats ipynb,md; counts and --repeat >= 1")
+        sys.exit(1)
+
+    commit, dirty = _git_commit()
+    meta = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'params': {'notebooks': counts, 'formats': formats, 'notebook_kb': sizes_kb,
+                   'results_files': results_files, 'repeat': repeat, 'jobs': jobs},
+    }
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = keep or Path(tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        stub_bin = work_dir / 'stub-bin'
+        make_stub_tools(stub_bin)
+
+        if 'init_project_fresh' in scenarios:
+            spec = {'scenario': 'init_project_fresh', 'path': str(work_dir / 'fresh_projects')}
+            measurement = measure(spec, repeat)
+            results.append({'scenario': 'init_project_fresh', 'format': None, 'notebooks': None,
+                            'notebook_kb': None, 'results_files': None, **measurement})
+            print(f"   {'init_project_fresh':<58} wall {measurement['wall_s']:8.3f} s   "
+                  f"peak RSS {measurement['peak_rss_mb']:7.1f} MB")
+
+        for fmt in formats:
+            for size_kb in sizes_kb:
+                for count in counts:
+                    project_dir = work_dir / f'project_{fmt}_{size_kb}kb_{count}'
+                    if project_dir.exists():
+                        shutil.rmtree(project_dir)
+                    print(f"🔧 Writing project: {count} × {size_kb} KB .{fmt} labnotes, {results_files} results files")
+                    start = time.perf_counter()
+                    labnotes = make_project(project_dir, count, fmt, size_kb, results_files)
+                    print(f"   generated in {time.perf_counter() - start:.1f} s")
+
+                    for scenario, measurement in run_project_scenarios(project_dir, labnotes, scenarios,
+                                                                       repeat, jobs, stub_bin):
+                        result = {'scenario': scenario, 'format': fmt, 'notebooks': count, 'notebook_kb': size_kb,
+                                  'results_files': results_files, **measurement}
+                        results.append(result)
+                        print(f"   {result_key(result):<58} wall {measurement['wall_s']:8.3f} s   "
+                              f"peak RSS {measurement['peak_rss_mb']:7.1f} MB")
+                    if keep is None:
+                        shutil.rmtree(project_dir)
+
+    report = {'meta': meta, 'results': results}
+    if output_path:
+        output_path.write_text(json.dumps(report, indent=2))
+        print(f"💾 Results written: {output_path}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if baseline_path and compare(results, baseline_path, threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Notebook Reader Benchmark - Streaming section extraction vs json.load
+
+Generates a synthetic lab notebook padded with base64 image outputs and
+measures peak RSS and wall time of:
+  - json.load of the whole notebook + section extraction
+  - notebook_reader.extract_sections (streaming, outputs skipped)
+
+Each method runs in a fresh subprocess so peak RSS is not shared.
+
+Usage:
+    bench_notebook_reader.py [--size-mb <MB>] [--keep <path>]
+
+Examples:
+    bench_notebook_reader.py --size-mb 500
+    bench_notebook_reader.py --size-mb 50 --keep /tmp/big.ipynb
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / 'plugins' / 'experiment-report' / 'scripts'
+
+MARKDOWN_CELLS = [
+    '# Exp01_synthetic_benchmark\n\n**Date**: 2025-01-15\n',
+    '## Hypothesis\n\nGene X is upregulated in resistant cells (FC > 2, p < 0.05).\n',
+    '## Background & Prior Work\n\nExp00 showed differential expression of X.\n',
+    '## Materials and Methods\n\n### Data\n\n- TCGA-BRCA\n\n### Tools\n\n- DESeq2 1.38\n',
+    '## Results\n\n2,453 genes differentially expressed (adj.p < 0.05).\n',
+    '## Discussion\n\n### Interpretation\n\nWidespread reprogramming.\n\n### Next Steps\n\n1. qPCR\n',
+]
+
+# Runs inside the measured subprocess; prints wall time and peak RSS as JSON
+_CHILD = '''
+import json, resource, sys, time
+sys.path.insert(0, {scripts_dir!r})
+from notebook_reader import extract_sections, _SectionCollector, NOTEBOOK_SECTIONS
+start = time.perf_counter()
+if {method!r} == 'json.load':
+    with open({path!r}, encoding='utf-8') as f:
+        nb = json.load(f)
+    collector = _SectionCollector(NOTEBOOK_SECTIONS)
+    for cell in nb['cells']:
+        if cell['cell_type'] == 'markdown':
+            source = cell['source']
+            collector.feed(''.join(source) if isinstance(source, list) else source)
+            collector.end_cell()
+    sections = collector.result()
+else:
+    sections = extract_sections({path!r})
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'wall_s': elapsed, 'peak_rss_mb': rss_kb / 1024, 'sections': len(sections)}}))
+'''
+
+
+def write_notebook(path, size_mb, image_kb=512):
+    """
+    Write a synthetic notebook of roughly size_mb, streaming it to disk.
+
+    Args:
+        path: Output .ipynb path
+        size_mb: Target size in MB
+        image_kb: Size of each base64 image/png output
+    """
+    image = 'iVBORw0KGgo' + 'A' * (image_kb * 1024 - 11)
+    target = size_mb * 1024 * 1024
+    written = 0
+    index = 0
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n "cells": [\n')
+        for source in MARKDOWN_CELLS:
+            f.write(json.dumps({'cell_type': 'markdown', 'metadata': {}, 'source': source}) + ',\n')
+        while written < target:
+            cell = {
+                'cell_type': 'code',
+                'execution_count': index,
+                'metadata': {},
+                'source': [f'plot_{index}()\n'],
+                'outputs': [{
+                    'output_type': 'display_data',
+                    'metadata': {},
+                    'data': {'image/png': image, 'text/plain': ['<Figure size 800x600>']},
+                }],
+            }
+            text = json.dumps(cell)
+            f.write(text + ',\n')
+            written += len(text)
+            index += 1
+        f.write(json.dumps({'cell_type': 'markdown', 'metadata': {}, 'source': '## Limitations\n\nSmall n.\n'}))
+        f.write('\n ],\n "metadata": {},\n "nbformat": 4,\n "nbformat_minor": 5\n}\n')
+
+
+def run_method(method, path):
+    code = _CHILD.format(scripts_dir=str(SCRIPTS_DIR), method=method, path=str(path))
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    result = json.loads(output)
+    result['process_wall_s'] = time.perf_counter() - start
+    return result
+
+
+def main():
+    args = sys.argv[1:]
+    size_mb = 500
+    keep = None
+    i = 0
+    while i < len(args):
+        if args[i] == '--size-mb' and i + 1 < len(args):
+            size_mb = int(args[i + 1])
+            i += 2
+        elif args[i] == '--keep' and i + 1 < len(args):
+            keep = Path(args[i + 1])
+            i += 2
+        else:
+            print(__doc__)
+            sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = keep or Path(tmp) / 'Exp01_synthetic_benchmark.ipynb'
+        print(f"🔧 Writing {size_mb} MB synthetic notebook: {path}")
+        write_notebook(path, size_mb)
+        actual_mb = os.path.getsize(path) / (1024 * 1024)
+
+        results = {'notebook_mb': round(actual_mb, 1)}
+        for method in ('json.load', 'streaming'):
+            results[method] = run_method(method, path)
+            r = results[method]
+            print(f"   {method:<10} wall {r['wall_s']:7.2f} s   peak RSS {r['peak_rss_mb']:8.1f} MB   sections {r['sections']}")
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
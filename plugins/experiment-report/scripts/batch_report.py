@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Batch Report - Generates reports for many projects in one process
+
+Runs init_report() for every job in a manifest on a bounded thread pool,
+never prompts, and ends with a per-job summary of timings and failures.
+
+Usage:
+    batch_report.py <manifest.yaml|manifest.json> [--workers N] [--if-exists skip|overwrite|update]
+                    [--no-cache] [--summary <summary.json>]
+
+Manifest (paths are relative to the manifest file; labnote globs are expanded):
+    if_exists: update                 # default policy for all jobs (optional)
+    jobs:
+      - labnotes: [projA/notebook/labnote/Exp*.ipynb]
+        output: projA/notebook/report/
+        title: RNA-seq Analysis       # optional
+        if_exists: overwrite          # optional, overrides the default
+        extract_images: true          # optional, see init_report.py --extract-images
+      - labnotes: [projB/notebook/labnote/Exp01_qc.md]
+        output: projB/notebook/report/
+
+A bare list of jobs is accepted too. JSON manifests use the same keys;
+YAML manifests need PyYAML.
+
+Examples:
+    batch_report.py nightly.yaml --workers 8
+    batch_report.py nightly.json --if-exists update --summary notebook/report_summary.json
+"""
+
+import glob
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from init_report import IF_EXISTS_POLICIES, init_report
+
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+BATCH_POLICIES = tuple(policy for policy in IF_EXISTS_POLICIES if policy != 'ask')
+LOG_TAIL_LINES = 10
+
+
+def load_manifest(manifest_path):
+    """
+    Load and normalize a batch manifest.
+
+    Args:
+        manifest_path: Path to .yaml/.yml or .json manifest
+
+    Returns:
+        (jobs, default_policy) - jobs are dicts with 'name', 'labnotes',
+        'output', 'title', 'if_exists' (None when not set per job) and
+        'extract_images'
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    manifest_path = Path(manifest_path)
+    text = manifest_path.read_text(encoding='utf-8')
+    if manifest_path.suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests need PyYAML (pip install pyyaml); or use a .json manifest")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    default_policy = None
+    if isinstance(data, dict):
+        default_policy = data.get('if_exists')
+        data = data.get('jobs')
+    if not isinstance(data, list) or not data:
+        raise ValueError("Manifest must contain a non-empty list of jobs")
+    if default_policy is not None and default_policy not in BATCH_POLICIES:
+        raise ValueError(f"if_exists must be one of {', '.join(BATCH_POLICIES)} (got {default_policy})")
+
+    base_dir = manifest_path.parent
+    jobs = []
+    for number, entry in enumerate(data, 1):
+        if not isinstance(entry, dict) or not entry.get('labnotes') or not entry.get('output'):
+            raise ValueError(f"Job {number}: 'labnotes' and 'output' are required")
+        patterns = entry['labnotes']
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        labnotes = []
+        for pattern in patterns:
+            pattern = str(base_dir / pattern)
+            # Unmatched paths are kept so init_report reports them as missing
+            labnotes.extend(sorted(glob.glob(pattern)) or [pattern])
+        policy = entry.get('if_exists')
+        if policy is not None and policy not in BATCH_POLICIES:
+            raise ValueError(f"Job {number}: if_exists must be one of {', '.join(BATCH_POLICIES)} (got {policy})")
+        output = str(base_dir / entry['output'])
+        jobs.append({
+            'name': entry.get('name') or entry['output'],
+            'labnotes': labnotes,
+            'output': output,
+            'title': entry.get('title'),
+            'if_exists': policy,
+            'extract_images': bool(entry.get('extract_images')),
+        })
+    return jobs, default_policy
+
+
+class ThreadOutput(io.TextIOBase):
+    """stdout replacement that routes each worker thread's prints to its own buffer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run_job(job, if_exists, use_cache=True, output=None):
+    """
+    Run one manifest job.
+
+    Args:
+        job: Job dict from load_manifest
+        if_exists: Policy for an existing report
+        use_cache: Reuse parsed notebook content
+        output: Optional ThreadOutput capturing this thread's console output
+
+    Returns:
+        dict with 'name', 'status', 'seconds', 'report', 'error' and 'log'
+    """
+    log = io.StringIO()
+    if output is not None:
+        output.local.buffer = log
+    start = time.perf_counter()
+    outcome = {}
+    report_path = error = None
+    try:
+        # Parse in-thread: forking a parse pool per job from worker threads
+        # would multiply processes by the batch worker count
+        report_path = init_report(job['labnotes'], job['output'], job['title'], use_cache=use_cache,
+                                  jobs=1, if_exists=if_exists, outcome=outcome,
+                                  extract_images=job['extract_images'])
+        if report_path is None:
+            error = 'report generation failed (see log)'
+    except Exception as e:  # keep the batch going; the failure is in the summary
+        error = f'{type(e).__name__}: {e}'
+    finally:
+        if output is not None:
+            output.local.buffer = None
+
+    return {
+        'name': job['name'],
+        'status': 'failed' if error else outcome.get('action', 'created'),
+        'seconds': round(time.perf_counter() - start, 3),
+        'report': str(report_path) if report_path else None,
+        'error': error,
+        'log': log.getvalue(),
+    }
+
+
+def run_batch(jobs, workers=DEFAULT_WORKERS, if_exists=None, default_policy=None, use_cache=True):
+    """
+    Run manifest jobs on a bounded thread pool.
+
+    Policy precedence: job 'if_exists' > if_exists argument > manifest
+    default > 'skip'.
+
+    Args:
+        jobs: Jobs from load_manifest
+        workers: Maximum concurrent jobs
+        if_exists: Policy override from the command line
+        default_policy: Manifest-level default policy
+        use_cache: Reuse parsed notebook content
+
+    Returns:
+        List of run_job results in manifest order
+    """
+    output = ThreadOutput(sys.stdout)
+    real_stdout, sys.stdout = sys.stdout, output
+    results = [None] * len(jobs)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                executor.submit(run_job, job, job['if_exists'] or if_exists or default_policy or 'skip',
+                                use_cache, output): index
+                for index, job in enumerate(jobs)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results[futures[future]] = result
+                icon = '❌' if result['status'] == 'failed' else '✅'
+                real_stdout.write(f"{icon} [{done}/{len(jobs)}] {result['name']}: {result['status']} ({result['seconds']:.2f}s)\n")
+                real_stdout.flush()
+    finally:
+        sys.stdout = real_stdout
+    return results
+
+
+def print_summary(results, wall_seconds):
+    """Print the per-job table, totals, and log tails of failed jobs."""
+    print()
+    print("📋 Batch summary")
+    width = max(len(result['name']) for result in results)
+    print(f"   {'Status':<9} {'Time':>8}  {'Job':<{width}}  Report / Error")
+    for result in results:
+        detail = result['error'] or result['report'] or ''
+        print(f"   {result['status']:<9} {result['seconds']:>7.2f}s  {result['name']:<{width}}  {detail}")
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    totals = ', '.join(f'{count} {status}' for status, count in sorted(counts.items()))
+    job_seconds = sum(result['seconds'] for result in results)
+    print()
+    print(f"   {len(results)} job(s): {totals}")
+    print(f"   Wall time {wall_seconds:.2f}s (sum of job times {job_seconds:.2f}s)")
+
+    for result in results:
+        if result['status'] != 'failed':
+            continue
+        print()
+        print(f"❌ {result['name']}: {result['error']}")
+        for line in result['log'].rstrip().splitlines()[-LOG_TAIL_LINES:]:
+            print(f"   {line}")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0].startswith('--'):
+        print("Usage: batch_report.py <manifest.yaml|manifest.json> [--workers N] [--if-exists skip|overwrite|update]")
+        print("                       [--no-cache] [--summary <summary.json>]")
+        print()
+        print("Examples:")
+        print("  batch_report.py nightly.yaml --workers 8")
+        print("  batch_report.py nightly.json --if-exists update --summary report_summary.json")
+        sys.exit(1)
+
+    manifest_path = args[0]
+    workers = DEFAULT_WORKERS
+    if_exists = None
+    use_cache = True
+    summary_path = None
+
+    i = 1
+    while i < len(args):
+        if args[i] == '--workers' and i + 1 < len(args):
+            try:
+                workers = int(args[i + 1])
+            except ValueError:
+                workers = 0
+            if workers < 1:
+                print(f"❌ Error: --workers must be a positive integer (got {args[i + 1]})")
+                sys.exit(1)
+            i += 2
+        elif args[i] == '--if-exists' and i + 1 < len(args):
+            if_exists = args[i + 1]
+            if if_exists not in BATCH_POLICIES:
+                print(f"❌ Error: --if-exists must be one of {', '.join(BATCH_POLICIES)} (got {if_exists})")
+                sys.exit(1)
+            i += 2
+        elif args[i] == '--summary' and i + 1 < len(args):
+            summary_path = args[i + 1]
+            i += 2
+        elif args[i] == '--no-cache':
+            use_cache = False
+            i += 1
+        else:
+            i += 1
+
+    try:
+        jobs, default_policy = load_manifest(manifest_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: Could not load manifest {manifest_path}: {e}")
+        sys.exit(1)
+
+    print(f"🚀 Running {len(jobs)} report job(s) with {min(workers, len(jobs))} worker(s)")
+    start = time.perf_counter()
+    results = run_batch(jobs, workers, if_exists, default_policy, use_cache)
+    wall_seconds = time.perf_counter() - start
+    print_summary(results, wall_seconds)
+
+    if summary_path:
+        summary = {
+            'manifest': str(Path(manifest_path).resolve()),
+            'wall_seconds': round(wall_seconds, 3),
+            'jobs': results,
+        }
+        Path(summary_path).write_text(json.dumps(summary, indent=2, ensure_ascii=False))
+        print()
+        print(f"💾 Summary written: {summary_path}")
+
+    sys.exit(1 if any(result['status'] == 'failed' for result in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
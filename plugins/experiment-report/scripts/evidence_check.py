@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Evidence Check - Verifies evidence paths referenced by a generated report
+
+Pulls every backticked path and image link out of a report, resolves globs,
+and checks that the evidence exists and is not newer than the report.
+
+Each directory any reference touches is listed once; existence and globs
+are resolved against those listings, then matched files are stat'ed in
+batches. Listings and stat batches both run on a thread pool, which keeps
+1,000+ references usable on high-latency filesystems such as Lustre scratch.
+
+Paths are resolved relative to the report's directory first, then relative
+to the project root (the directory holding STEERING.md), since reports
+write `../results/` for the project-level results/ directory.
+
+Invoked via init_report.py:
+    init_report.py --verify <report.md> [--jobs N]
+"""
+
+import fnmatch
+import glob
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+DEFAULT_WORKERS = 32
+STAT_BATCH_SIZE = 16
+
+_FENCE = re.compile(r'^\s*(```|~~~)')
+_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_BACKTICK = re.compile(r'`([^`\n]+)`')
+_IMAGE = re.compile(r'!\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+["\'][^)]*["\'])?\s*\)')
+_URL = re.compile(r'^[a-z][a-z0-9+.-]*:', re.IGNORECASE)
+_GLOB_CHARS = re.compile(r'[*?\[]')
+# Unfilled template paths: Exp##, fig##_*.png, [filename]
+_PLACEHOLDER = re.compile(r'#|\[[A-Za-z_ -]{2,}\]')
+
+
+def _blank_comments(text):
+    """Remove HTML comments but keep line numbering intact."""
+    return _COMMENT.sub(lambda m: '\n' * m.group().count('\n'), text)
+
+
+def _is_path(candidate):
+    return '/' in candidate and not any(c.isspace() for c in candidate) and not _URL.match(candidate)
+
+
+def extract_references(report_text):
+    """
+    Extract evidence references from report markdown.
+
+    Fenced code blocks and HTML comments (template guidance) are skipped.
+
+    Args:
+        report_text: Report markdown
+
+    Returns:
+        List of dicts with 'ref', 'line' and 'kind' ('path' or 'image'),
+        de-duplicated by ref (first occurrence wins)
+    """
+    references = {}
+    in_fence = False
+    for line_number, line in enumerate(_blank_comments(report_text).splitlines(), 1):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        for match in _IMAGE.finditer(line):
+            ref = match.group(1)
+            if not _URL.match(ref):
+                references.setdefault(ref, {'ref': ref, 'line': line_number, 'kind': 'image'})
+        for match in _BACKTICK.finditer(line):
+            ref = match.group(1).strip()
+            if _is_path(ref):
+                references.setdefault(ref, {'ref': ref, 'line': line_number, 'kind': 'path'})
+    return list(references.values())
+
+
+def _find_project_root(start):
+    for candidate in (start, *start.parents):
+        if (candidate / 'STEERING.md').exists():
+            return candidate
+    return None
+
+
+def _candidates(ref, report_dir, project_dir):
+    """Absolute paths a reference may point to, in resolution order."""
+    ref_path = Path(ref)
+    if ref_path.is_absolute():
+        return [ref_path]
+    candidates = [report_dir / ref_path]
+    if project_dir is not None:
+        parts = [part for part in ref_path.parts if part not in ('..', '.')]
+        if parts:
+            candidates.append(project_dir.joinpath(*parts))
+    return [Path(os.path.normpath(candidate)) for candidate in candidates]
+
+
+def _list_directory(directory):
+    """
+    List one directory.
+
+    Returns:
+        dict mapping entry name to is_dir (from the directory entry type, no
+        stat), or None if the directory does not exist
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: entry.is_dir() for entry in entries}
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return None
+
+
+def _stat_batch(paths):
+    """Return {path: mtime} for a batch of paths (missing paths are omitted)."""
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime
+        except OSError:
+            continue
+    return mtimes
+
+
+def _expand_deep_glob(pattern):
+    """Globs with a wildcard above the last component (e.g. exp*/fig*.png or **)."""
+    return {match: os.path.isdir(match) for match in glob.iglob(pattern, recursive=True)}
+
+
+def _match_candidate(candidate, listings, deep):
+    """Return {path: is_dir} for one candidate using the shared listings."""
+    candidate_str = str(candidate)
+    if candidate_str in deep:
+        return deep[candidate_str]
+    listing = listings.get(str(candidate.parent)) or {}
+    name = candidate.name
+    if _GLOB_CHARS.search(name):
+        return {
+            str(candidate.parent / entry): is_dir
+            for entry, is_dir in listing.items() if fnmatch.fnmatchcase(entry, name)
+        }
+    if name in listing:
+        return {candidate_str: listing[name]}
+    return {}
+
+
+def verify_report(report_path, workers=DEFAULT_WORKERS):
+    """
+    Verify every evidence reference in a report.
+
+    Args:
+        report_path: Path to report markdown
+        workers: Threads for directory listings and stat calls
+
+    Returns:
+        dict with summary counts, 'missing', 'stale', 'placeholders' and
+        per-reference 'references' (JSON-serializable)
+    """
+    report_path = Path(report_path).resolve()
+    report_mtime = report_path.stat().st_mtime
+    report_dir = report_path.parent
+    project_dir = _find_project_root(report_dir)
+    references = extract_references(report_path.read_text(encoding='utf-8'))
+
+    # Plan: every directory a reference touches is listed exactly once
+    directories = set()
+    deep_globs = set()
+    for reference in references:
+        if _PLACEHOLDER.search(reference['ref']):
+            reference['status'] = 'placeholder'
+            continue
+        reference['candidates'] = _candidates(reference['ref'].rstrip('/'), report_dir, project_dir)
+        for candidate in reference['candidates']:
+            if _GLOB_CHARS.search(str(candidate.parent)):
+                deep_globs.add(str(candidate))
+            else:
+                directories.add(str(candidate.parent))
+
+    directories = sorted(directories)
+    deep_globs = sorted(deep_globs)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        listings = dict(zip(directories, executor.map(_list_directory, directories)))
+        deep = dict(zip(deep_globs, executor.map(_expand_deep_glob, deep_globs)))
+
+        # Resolve references against the listings (first candidate with a match wins)
+        for reference in references:
+            if reference.get('status') == 'placeholder':
+                continue
+            matches = {}
+            for candidate in reference.pop('candidates'):
+                matches = _match_candidate(candidate, listings, deep)
+                if matches:
+                    break
+            reference['resolved'] = sorted(matches)
+            reference['files'] = [path for path, is_dir in matches.items() if not is_dir]
+
+        # Stat matched files in batches; directories only prove existence
+        files = sorted({path for reference in references for path in reference.get('files', [])})
+        batches = [files[i:i + STAT_BATCH_SIZE] for i in range(0, len(files), STAT_BATCH_SIZE)]
+        mtimes = {}
+        for batch_mtimes in executor.map(_stat_batch, batches):
+            mtimes.update(batch_mtimes)
+
+    for reference in references:
+        if reference.get('status') == 'placeholder':
+            continue
+        file_mtimes = [mtimes[path] for path in reference.pop('files') if path in mtimes]
+        if not reference['resolved']:
+            reference['status'] = 'missing'
+        elif file_mtimes and max(file_mtimes) > report_mtime:
+            reference['status'] = 'stale'
+            reference['newest_mtime'] = datetime.fromtimestamp(max(file_mtimes)).isoformat(timespec='seconds')
+        else:
+            reference['status'] = 'ok'
+
+    by_status = {}
+    for reference in references:
+        by_status.setdefault(reference['status'], []).append(reference)
+
+    return {
+        'report': str(report_path),
+        'report_mtime': datetime.fromtimestamp(report_mtime).isoformat(timespec='seconds'),
+        'project_root': str(project_dir) if project_dir else None,
+        'checked': len(references),
+        'directories_listed': len(directories),
+        'files_stat': len(files),
+        'ok': len(by_status.get('ok', [])),
+        'missing': [r['ref'] for r in by_status.get('missing', [])],
+        'stale': [r['ref'] for r in by_status.get('stale', [])],
+        'placeholders': [r['ref'] for r in by_status.get('placeholder', [])],
+        'references': references,
+    }
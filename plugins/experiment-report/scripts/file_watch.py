@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+File Watch - Directory change notification with inotify or polling
+
+Watches a few directory trees and reports which paths changed, blocking
+(with no CPU use) in between. On Linux it uses inotify through ctypes with
+one watch per directory, never per file, so a results tree with tens of
+thousands of files costs one watch per subdirectory. Elsewhere, or when
+inotify is unavailable or out of watches, it falls back to polling:
+directory mtimes every interval (catches files created, deleted or
+replaced by rename, as Jupyter's autosave does) and a full stat scan every
+FULL_SCAN_EVERY polls (catches files rewritten in place).
+
+Hidden files and directories (.cache, .ipynb_checkpoints, temp files) are
+ignored.
+
+Usage:
+    file_watch.py <dir> [dir ...] [--poll]
+
+Examples:
+    file_watch.py notebook/labnote results
+    file_watch.py results --poll
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+
+
+POLL_INTERVAL = 2.0
+FULL_SCAN_EVERY = 15
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+# Whole-file events only: IN_MODIFY fires on every write() of a save
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+              | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct('iIII')
+
+
+def _visible_dirs(root, recursive):
+    """root plus (if recursive) every non-hidden directory below it."""
+    if not recursive:
+        return [root]
+    found = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        found.append(directory)
+        try:
+            with os.scandir(directory) as entries:
+                stack.extend(entry.path for entry in entries
+                             if not entry.name.startswith('.') and entry.is_dir(follow_symlinks=False))
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+    return found
+
+
+class InotifyWatcher:
+    """
+    inotify watches on every directory of the given trees.
+
+    Args:
+        roots: (directory, recursive) pairs; missing directories are skipped
+
+    Raises:
+        OSError: If inotify is unavailable or the watch limit is reached
+    """
+
+    method = 'inotify'
+
+    def __init__(self, roots):
+        libc_name = ctypes.util.find_library('c')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True) if libc_name else None
+        if self._libc is None or not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available on this platform')
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._dirs = {}
+        self._recursive = {}
+        try:
+            for root, recursive in roots:
+                if os.path.isdir(root):
+                    for directory in _visible_dirs(os.path.abspath(root), recursive):
+                        self._add(directory, recursive)
+        except OSError:
+            self.close()
+            raise
+
+    @property
+    def watches(self):
+        return len(self._dirs)
+
+    def _add(self, directory, recursive):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code in (errno.ENOENT, errno.ENOTDIR):
+                return
+            hint = ' (raise fs.inotify.max_user_watches)' if code == errno.ENOSPC else ''
+            raise OSError(code, f'{os.strerror(code)}{hint}', directory)
+        self._dirs[wd] = directory
+        self._recursive[wd] = recursive
+
+    def read(self, timeout=None):
+        """
+        Wait for changes.
+
+        Args:
+            timeout: Seconds to wait (None blocks until something changes)
+
+        Returns:
+            Set of changed paths (empty on timeout). A queue overflow
+            reports the watched roots themselves.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        # Events on ignored (hidden) names do not end the wait
+        while not changed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                break
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                continue
+            self._parse(data, changed)
+        return changed
+
+    def _parse(self, data, changed):
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            raw_name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                changed.update(self._dirs.values())
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                # Watched directory was removed
+                del self._dirs[wd], self._recursive[wd]
+                continue
+            name = os.fsdecode(raw_name)
+            if name.startswith('.'):
+                continue
+            path = os.path.join(directory, name) if name else directory
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and self._recursive[wd]:
+                # New subtree: watch it, and report files that landed before the watch
+                for subdirectory in _visible_dirs(path, True):
+                    self._add(subdirectory, True)
+                    changed.add(subdirectory)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """
+    Stat-based change detection for platforms without inotify.
+
+    Args:
+        roots: (directory, recursive) pairs
+        interval: Seconds between polls
+    """
+
+    method = 'polling'
+
+    def __init__(self, roots, interval=POLL_INTERVAL):
+        self.roots = [(os.path.abspath(root), recursive) for root, recursive in roots]
+        self.interval = interval
+        self._polls = 0
+        self._dirs = self._snapshot()
+
+    @property
+    def watches(self):
+        return len(self._dirs)
+
+    @staticmethod
+    def _scan_dir(directory, recursive):
+        """(mtime_ns, recursive, {file path: (size, mtime_ns)}) of one directory, or None if gone."""
+        files = {}
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.name.startswith('.') and entry.is_file(follow_symlinks=False):
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return None
+        return mtime_ns, recursive, files
+
+    def _snapshot(self, roots=None):
+        dirs = {}
+        for root, recursive in self.roots if roots is None else roots:
+            for directory in _visible_dirs(root, recursive):
+                scanned = self._scan_dir(directory, recursive)
+                if scanned is not None:
+                    dirs[directory] = scanned
+        return dirs
+
+    @staticmethod
+    def _diff(before, after):
+        return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+    def _poll(self):
+        self._polls += 1
+        if self._polls % FULL_SCAN_EVERY == 0:
+            # Files rewritten in place leave their directory's mtime alone
+            dirs = self._snapshot()
+            changed = dirs.keys() ^ self._dirs.keys()
+            for directory in dirs.keys() & self._dirs.keys():
+                changed |= self._diff(self._dirs[directory][2], dirs[directory][2])
+            self._dirs = dirs
+            return changed
+
+        changed = set()
+        for directory, (mtime_ns, recursive, files) in list(self._dirs.items()):
+            # Shallow roots hold few files: rescan them every poll
+            if recursive:
+                try:
+                    if os.stat(directory).st_mtime_ns == mtime_ns:
+                        continue
+                except OSError:
+                    pass
+            scanned = self._scan_dir(directory, recursive)
+            if scanned is None:
+                del self._dirs[directory]
+                changed.add(directory)
+                continue
+            self._dirs[directory] = scanned
+            changed |= self._diff(files, scanned[2])
+            if recursive and scanned[0] != mtime_ns:
+                new_dirs = self._snapshot([(path, True) for path in _visible_dirs(directory, True)[1:]
+                                           if path not in self._dirs])
+                self._dirs.update(new_dirs)
+                for path, (_, _, new_files) in new_dirs.items():
+                    changed.add(path)
+                    changed.update(new_files)
+        return changed
+
+    def read(self, timeout=None):
+        """Same contract as InotifyWatcher.read."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+            changed = self._poll()
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(roots, poll=False, interval=POLL_INTERVAL):
+    """
+    Watch roots with inotify, falling back to polling.
+
+    Args:
+        roots: (directory, recursive) pairs
+        poll: Use polling even where inotify is available
+        interval: Polling interval in seconds
+
+    Returns:
+        InotifyWatcher or PollingWatcher
+    """
+    if not poll:
+        try:
+            return InotifyWatcher(roots)
+        except OSError as e:
+            print(f"⚠️  Warning: inotify unavailable ({e}); polling every {interval:g}s")
+    return PollingWatcher(roots, interval)
+
+
+def collect_changes(watcher, debounce, max_delay):
+    """
+    Block until something changes, then keep collecting until the tree has
+    been quiet for `debounce` seconds (at most `max_delay` in total), so a
+    burst of autosave writes becomes one change set.
+
+    Returns:
+        Set of changed paths
+    """
+    changed = set()
+    while not changed:
+        changed = watcher.read(None)
+    give_up = time.monotonic() + max_delay
+    while time.monotonic() < give_up:
+        more = watcher.read(min(debounce, max(0.0, give_up - time.monotonic())))
+        if not more:
+            break
+        changed |= more
+    return changed
+
+
+def main():
+    args = sys.argv[1:]
+    roots = [(arg, True) for arg in args if not arg.startswith('--')]
+    if not roots:
+        print("Usage: file_watch.py <dir> [dir ...] [--poll]")
+        sys.exit(1)
+
+    watcher = open_watcher(roots, poll='--poll' in args)
+    print(f"👀 Watching {watcher.watches} director(ies) with {watcher.method} (Ctrl-C to stop)")
+    try:
+        while True:
+            for path in sorted(collect_changes(watcher, 0.5, 5.0)):
+                print(f"   {path}")
+            print()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,63 @@
 Report Initializer - Creates report template from lab notebooks
 
 Usage:
-    init_report.py --labnote <path1> [path2 ...] --output <output_dir> [--title <title>]
+    init_report.py --labnote <path1> [path2 ...] --output <output_dir> [--title <title>] [--if-exists skip|overwrite|update] [--extract-images] [--no-cache] [--jobs N]
+    init_report.py --update <report.md> [--labnote <path1> ...] [--extract-images] [--no-cache] [--jobs N]
+    init_report.py --verify <report.md> [--jobs N]
+
+Add --profile [trace.json] (or set RESEARCH_PROFILE) to record per-phase wall/CPU
+time, filesystem calls and peak memory; --chrome-trace <events.json> also
+writes a Chrome trace-event file (see research-project/scripts/phase_trace.py).
 
 Examples:
     init_report.py --labnote notebook/labnote/Exp01_rnaseq.ipynb --output notebook/report/
     init_report.py --labnote Exp01*.ipynb Exp02*.md --output notebook/report/ --title "RNA-seq Analysis"
+    init_report.py --update notebook/report/Report_Exp01-Exp03_integrated_analysis.md --labnote notebook/labnote/Exp*.ipynb
+    init_report.py --verify notebook/report/Report_Exp01-Exp03_integrated_analysis.md
+    init_report.py --labnote notebook/labnote/Exp*.ipynb --output notebook/report/ --profile trace.json
 """
 
+import json
+import os
+import re
+import sqlite3
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
 
+from notebook_reader import extract_sections
+from notebook_images import extract_images as extract_notebook_images
+from stats_harvester import harvest_statistics, summarize_statistics
+from evidence_check import DEFAULT_WORKERS, verify_report
+from parse_cache import ParseCache, file_digest
+from results_index import ResultsIndex, format_file_details
+from report_update import (
+    STATE_VERSION, ReportDocument, render_state, resolve_state_path, split_state, state_path, text_hash,
+)
+from atomic_write import write_atomic
+
+# The experiment registry and phase tracing live in the research-project plugin
+PROJECT_SCRIPTS = Path(__file__).resolve().parents[2] / 'research-project' / 'scripts'
+if PROJECT_SCRIPTS.is_dir() and str(PROJECT_SCRIPTS) not in sys.path:
+    sys.path.append(str(PROJECT_SCRIPTS))
+
+try:
+    from phase_trace import configure_profiling, tracer
+except ImportError:
+    class _NoTracer:
+        @staticmethod
+        def phase(name, **args):
+            return nullcontext()
+
+    tracer = _NoTracer()
+
+    def configure_profiling(args, script):
+        if '--profile' in args or '--chrome-trace' in args:
+            print("⚠️  Warning: Profiling needs the research-project plugin (phase_trace.py); ignored")
+        return args
+
 
 REPORT_TEMPLATE = '''# {title}
 
@@ -301,9 +347,9 @@ FINDING_TEMPLATE = '''### Finding {num}: {title}
 | Evidence Type | Location | Value/Description |
 |---------------|----------|-------------------|
 | Lab Notebook | `{notebook_path}` | <!-- Section reference --> |
-| Figure | `{results_path}/fig##_*.png` | <!-- Brief description --> |
-| Statistic | <!-- Source --> | <!-- e.g., p < 0.001, FC = 2.3 --> |
-| Raw Data | `{results_path}/*.csv` | <!-- Description --> |
+{figure_rows}
+{statistic_rows}
+{raw_data_rows}
 
 **Uncertainty & Confidence**:
 - Confidence level: <!-- Strong/Moderate/Weak -->
@@ -317,13 +363,174 @@ FINDING_TEMPLATE = '''### Finding {num}: {title}
 
 '''
 
+# What to do when the report file already exists
+IF_EXISTS_POLICIES = ('ask', 'skip', 'overwrite', 'update')
+
+# Evidence table rows per kind in each finding; the Figure Index lists everything
+MAX_EVIDENCE_ROWS = 5
+
+# Template rows for per-notebook tables when no notebook exists
+EXAMPLE_ROWS = {
+    'hypotheses_rows': '| H1 | [Testable statement] | Exp## | Supported/Rejected/Inconclusive |',
+    'data_sources_rows': '| [Name] | [v1.0 / 2025-01-15] | [URL/path] | Exp## |',
+    'hypothesis_eval_rows': '| H1: [Statement] | Supported/Rejected/Inconclusive | [Brief evidence] | Strong/Moderate/Weak |',
+    'notebooks_table': '| Exp## | `../labnote/Exp##_*.ipynb` | Complete | [List figures/tables] |',
+    'figures_table': '| Fig 1 | `../results/exp##/fig01_*.png` | [Description] | Finding 1 |',
+}
+
+
+def parse_notebook_content(notebook_path):
+    """
+    Parse the content-derived part of a notebook's metadata.
+
+    Everything returned here depends only on file content, so it can be
+    stored in the parse cache under the file's hash.
+
+    Args:
+        notebook_path: Path to notebook file
+
+    Returns:
+        dict with 'sections' and 'statistics' (summarized by cell)
+    """
+    return {
+        'sections': extract_sections(notebook_path),
+        'statistics': summarize_statistics(harvest_statistics(notebook_path), max_groups=MAX_EVIDENCE_ROWS),
+    }
+
+
+def parse_job(notebook_path, known_digests):
+    """
+    Worker for load_notebook_contents (runs in a pool process).
+
+    Args:
+        notebook_path: Path to notebook file
+        known_digests: Content hashes already in the cache, or None without cache
+
+    Returns:
+        (digest, content, error) - content is None when the digest is cached
+    """
+    try:
+        digest = None
+        if known_digests is not None:
+            digest = file_digest(notebook_path)
+            if digest in known_digests:
+                return digest, None, None
+        return digest, parse_notebook_content(notebook_path), None
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return None, None, str(e)
+
+
+def load_notebook_contents(labnote_paths, cache=None, jobs=None):
+    """
+    Parse notebook content across a process pool.
+
+    Cache hits by size/mtime are served in this process; hashing and parsing
+    of the remaining notebooks is fanned out with chunked submission.
+
+    Args:
+        labnote_paths: List of paths to lab notebooks
+        cache: Optional ParseCache
+        jobs: Worker processes (default: CPU count)
+
+    Returns:
+        dict mapping each parseable path to (content, error)
+    """
+    jobs = jobs or os.cpu_count() or 1
+    results = {}
+    pending = []
+    for notebook_path in dict.fromkeys(labnote_paths):
+        path = Path(notebook_path)
+        if path.suffix not in ('.ipynb', '.md') or not path.exists():
+            continue
+        content = cache.lookup(path, hash_fallback=False) if cache is not None else None
+        if content is not None:
+            results[notebook_path] = (content, None)
+        else:
+            pending.append(notebook_path)
+
+    if not pending:
+        return results
+
+    known_digests = cache.known_digests() if cache is not None else None
+    if jobs == 1 or len(pending) == 1:
+        parsed = [parse_job(notebook_path, known_digests) for notebook_path in pending]
+    else:
+        workers = min(jobs, len(pending))
+        chunksize = max(1, len(pending) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(parse_job, pending, [known_digests] * len(pending), chunksize=chunksize))
+
+    for notebook_path, (digest, content, error) in zip(pending, parsed):
+        if error is None and cache is not None:
+            if content is None:
+                content = cache.lookup_digest(notebook_path, digest)
+                if content is None:
+                    # Entry vanished since known_digests was taken
+                    content = parse_notebook_content(notebook_path)
+                    cache.store(notebook_path, digest, content)
+            else:
+                cache.store(notebook_path, digest, content)
+        results[notebook_path] = (content, error)
+
+    return results
+
+
+def open_experiment_registry(start_dir):
+    """
+    Open and sync the project's experiment registry, if available.
+
+    The registry lives in the research-project plugin; when that plugin is
+    not installed next to this one, or the project has no registry yet,
+    experiment identity falls back to filename parsing. Reports never
+    create the registry: projects scaffolded before it existed have no
+    .gitignore entry for it.
+
+    Args:
+        start_dir: Directory inside the project (e.g. the report output dir)
+
+    Returns:
+        ExperimentRegistry or None
+    """
+    try:
+        from experiment_registry import REGISTRY_FILENAME, ExperimentRegistry, find_project_root
+    except ImportError:
+        return None
+
+    project_dir = find_project_root(start_dir)
+    if project_dir is None or not (project_dir / REGISTRY_FILENAME).is_file():
+        return None
+    try:
+        registry = ExperimentRegistry(project_dir)
+        registry.sync()
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️  Warning: Experiment registry unavailable: {e}")
+        return None
+    return registry
+
+
+def labnote_project_dir(notebook_path, registry=None):
+    """
+    Project root that a labnote's results_dir is relative to.
+
+    Labnotes live in <project>/notebook/labnote/, so the root is two levels
+    above the file regardless of the working directory; labnotes elsewhere
+    use the registry's project, then the working directory.
+    """
+    path = Path(notebook_path).resolve()
+    if path.parent.name == 'labnote' and path.parent.parent.name == 'notebook':
+        return path.parents[2]
+    return registry.project_dir if registry is not None else Path.cwd()
+
 
-def extract_notebook_metadata(notebook_path):
+def extract_notebook_metadata(notebook_path, cache=None, preloaded=None, registry=None):
     """
     Extract basic metadata from a notebook file.
 
     Args:
         notebook_path: Path to notebook file
+        cache: Optional ParseCache for content-derived metadata
+        preloaded: Optional (content, error) from load_notebook_contents
+        registry: Optional ExperimentRegistry for experiment identity
 
     Returns:
         dict with metadata
@@ -342,50 +549,230 @@ def extract_notebook_metadata(notebook_path):
         print(f"⚠️  Warning: Notebook not found: {notebook_path}")
         return metadata
 
+    experiment = registry.find_labnote(path) if registry is not None else None
+    if experiment is not None:
+        metadata['experiment_number'] = experiment['exp_id']
+        if experiment['description']:
+            metadata['description'] = experiment['description']
+        results_dir = experiment['results_dir'] or f"results/{experiment['exp_id'].lower()}"
+        metadata['results_dir'] = results_dir
+        metadata['results_path'] = f'../{results_dir}'
+
     # Try to extract experiment info from filename
     # Format: Exp##_description.ext
     filename = path.stem
-    if filename.startswith('Exp'):
+    if experiment is None and filename.startswith('Exp'):
         parts = filename.split('_', 1)
         if len(parts) > 1:
             metadata['experiment_number'] = parts[0]
             metadata['description'] = parts[1].replace('-', ' ').replace('_', ' ')
             # Infer results path
             exp_lower = parts[0].lower()
+            metadata['results_dir'] = f'results/{exp_lower}'
             metadata['results_path'] = f'../results/{exp_lower}'
 
+    # Extract mapping-rules sections (streams .ipynb; outputs are never loaded)
+    metadata['sections'] = {}
+    if preloaded is not None:
+        content, error = preloaded
+        if error is not None:
+            print(f"⚠️  Warning: Could not read sections from {path.name}: {error}")
+        else:
+            metadata.update(content)
+    elif path.suffix in ('.ipynb', '.md'):
+        try:
+            if cache is not None:
+                content = cache.get_or_parse(path, parse_notebook_content)
+            else:
+                content = parse_notebook_content(path)
+            metadata.update(content)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            print(f"⚠️  Warning: Could not read sections from {path.name}: {e}")
+
     return metadata
 
 
-def generate_findings_section(notebooks_metadata):
+def summarize_section(text):
     """
-    Generate findings section with claim-evidence structure.
+    Reduce a notebook section to a single table-safe line.
 
     Args:
-        notebooks_metadata: List of metadata dicts
+        text: Section markdown
 
     Returns:
-        String containing findings section
+        First paragraph without HTML comments, or None if it is still a
+        template placeholder
+    """
+    if not text:
+        return None
+    text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
+    for paragraph in re.split(r'\n\s*\n', text):
+        line = ' '.join(paragraph.split())
+        if not line:
+            continue
+        if line.startswith(('[', '|', '#', '---')):
+            return None
+        return line.replace('|', '\\|')
+    return None
+
+
+def file_details(item):
+    """Size/dimension summary, plus the source cell for images extracted from the notebook."""
+    details = format_file_details(item)
+    if item.get('cell') is not None:
+        details += f", from notebook cell {item['cell'] + 1}"
+    return details
+
+
+def evidence_rows(meta, kind, label, placeholder):
+    """
+    Build Evidence Table rows for indexed result files.
+
+    Args:
+        meta: Notebook metadata dict (with 'figures'/'tables' from the results index)
+        kind: 'figures' or 'tables'
+        label: Evidence Type column value
+        placeholder: Location | Value cells used when nothing was indexed
+
+    Returns:
+        Markdown table rows
+    """
+    items = meta.get(kind) or []
+    if not items:
+        return f'| {label} | {placeholder} |'
+    results_path = meta.get('results_path') or '../results/exp##'
+    rows = [
+        f'| {label} | `{results_path}/{item["path"]}` | <!-- Brief description --> {file_details(item)} |'
+        for item in items[:MAX_EVIDENCE_ROWS]
+    ]
+    if len(items) > MAX_EVIDENCE_ROWS:
+        rows.append(f'| {label} | <!-- {len(items) - MAX_EVIDENCE_ROWS} more in Appendix B --> | |')
+    return '\n'.join(rows)
+
+
+def statistic_rows(meta):
+    """
+    Build Evidence Table Statistic rows from harvested statistics.
+
+    Args:
+        meta: Notebook metadata dict (with 'statistics' from the parse step)
+
+    Returns:
+        Markdown table rows (the template placeholder row if none were found)
+    """
+    groups = meta.get('statistics') or []
+    if not groups:
+        return '| Statistic | <!-- Source --> | <!-- e.g., p < 0.001, FC = 2.3 --> |'
+    rows = []
+    for group in groups:
+        if group['cell'] is None:
+            location = f"`{meta['relative_path']}` {group['where']}"
+        else:
+            location = f"`{meta['relative_path']}` cell {group['cell'] + 1} ({group['where']})"
+        values = ', '.join(group['texts']).replace('|', '\\|')
+        rows.append(f'| Statistic | {location} | {values} <!-- verify --> |')
+    return '\n'.join(rows)
+
+
+def generate_finding(meta, num):
+    """
+    Generate one finding with claim-evidence structure.
+
+    Args:
+        meta: Notebook metadata dict
+        num: Finding number (position of the notebook in the report)
+
+    Returns:
+        Finding markdown
+    """
+    title = meta.get('description', f'Finding from {meta["name"]}')
+    title = title.title()
+
+    results_path = meta.get('results_path') or '../results/exp##'
+
+    return FINDING_TEMPLATE.format(
+        num=num,
+        title=title,
+        notebook_name=meta['name'],
+        notebook_path=meta['relative_path'],
+        figure_rows=evidence_rows(meta, 'figures', 'Figure', f'`{results_path}/fig##_*.png` | <!-- Brief description -->'),
+        statistic_rows=statistic_rows(meta),
+        raw_data_rows=evidence_rows(meta, 'tables', 'Raw Data', f'`{results_path}/*.csv` | <!-- Description -->'),
+    )
+
+
+def generate_notebook_rows(meta, num, fig_start=1):
+    """
+    Generate one notebook's rows for each per-notebook report table.
+
+    Args:
+        meta: Notebook metadata dict
+        num: Notebook position in the report (H#, Finding #)
+        fig_start: Number of the notebook's first Figure Index entry
+
+    Returns:
+        dict mapping table placeholder name to a list of rows
+    """
+    hypothesis = summarize_section(meta.get('sections', {}).get('Hypothesis'))
+    hypothesis = hypothesis or f'<!-- Extract from {meta["name"]} -->'
+    exp_num = meta.get('experiment_number', 'Exp##')
+
+    if meta.get('figures') or meta.get('tables'):
+        outputs = f"{len(meta.get('figures', []))} figure(s), {len(meta.get('tables', []))} table(s)"
+    else:
+        outputs = '<!-- List figures/tables -->'
+
+    fig_rows = []
+    results_path = meta.get('results_path') or f'../results/exp{num:02d}'
+    if not meta.get('figures'):
+        fig_rows.append(f'| Fig {fig_start} | `{results_path}/fig01_*.png` | <!-- Description --> | Finding {num} |')
+    for fig_num, figure in enumerate(meta.get('figures', []), fig_start):
+        fig_rows.append(f'| Fig {fig_num} | `{results_path}/{figure["path"]}` | <!-- Description --> {file_details(figure)} | Finding {num} |')
+
+    return {
+        'hypotheses_rows': [f'| H{num} | {hypothesis} | {meta.get("experiment_number", f"Exp{num:02d}")} | Supported/Rejected/Inconclusive |'],
+        'data_sources_rows': [f'| <!-- Dataset --> | <!-- Version/Date --> | <!-- Source --> | {exp_num} |'],
+        'hypothesis_eval_rows': [f'| H{num}: <!-- Statement --> | Supported/Rejected/Inconclusive | <!-- Brief evidence --> | Strong/Moderate/Weak |'],
+        'notebooks_table': [f'| {exp_num} | `{meta["relative_path"]}` | Complete | {outputs} |'],
+        'figures_table': fig_rows,
+    }
+
+
+def generate_notebook_parts(notebooks_metadata):
     """
-    findings = []
+    Generate the finding and table rows of every existing notebook.
 
+    Args:
+        notebooks_metadata: List of metadata dicts
+
+    Returns:
+        List of dicts with 'meta', 'num', 'finding' and 'rows'
+    """
+    parts = []
+    fig_num = 0
     for i, meta in enumerate(notebooks_metadata, 1):
         if not meta['exists']:
             continue
+        rows = generate_notebook_rows(meta, i, fig_num + 1)
+        fig_num += len(rows['figures_table'])
+        parts.append({'meta': meta, 'num': i, 'finding': generate_finding(meta, i), 'rows': rows})
+    return parts
 
-        title = meta.get('description', f'Finding from {meta["name"]}')
-        title = title.title()
 
-        results_path = meta.get('results_path', '../results/exp##')
+def generate_findings_section(notebooks_metadata, parts=None):
+    """
+    Generate findings section with claim-evidence structure.
 
-        finding = FINDING_TEMPLATE.format(
-            num=i,
-            title=title,
-            notebook_name=meta['name'],
-            notebook_path=meta['relative_path'],
-            results_path=results_path
-        )
-        findings.append(finding)
+    Args:
+        notebooks_metadata: List of metadata dicts
+        parts: Optional precomputed generate_notebook_parts result
+
+    Returns:
+        String containing findings section
+    """
+    if parts is None:
+        parts = generate_notebook_parts(notebooks_metadata)
+    findings = [part['finding'] for part in parts]
 
     if not findings:
         return "<!-- No notebooks provided - add findings manually -->"
@@ -393,28 +780,24 @@ def generate_findings_section(notebooks_metadata):
     return '\n'.join(findings)
 
 
-def generate_placeholders(notebooks_metadata):
+def generate_placeholders(notebooks_metadata, parts=None):
     """
     Generate placeholder content based on notebook metadata.
 
     Args:
         notebooks_metadata: List of metadata dicts
+        parts: Optional precomputed generate_notebook_parts result
 
     Returns:
         dict of placeholder strings
     """
+    if parts is None:
+        parts = generate_notebook_parts(notebooks_metadata)
     placeholders = {}
-    num_notebooks = len([m for m in notebooks_metadata if m['exists']])
+    num_notebooks = len(parts)
 
     placeholders['num_notebooks'] = num_notebooks
-
-    # Experiments list
-    exp_names = []
-    for meta in notebooks_metadata:
-        if meta['exists']:
-            exp_num = meta.get('experiment_number', meta['name'])
-            exp_names.append(exp_num)
-    placeholders['experiments_list'] = ', '.join(exp_names) if exp_names else '[Exp##, Exp##, ...]'
+    placeholders['experiments_list'] = experiments_list(notebooks_metadata)
 
     # Background placeholder
     if num_notebooks == 0:
@@ -422,59 +805,180 @@ def generate_placeholders(notebooks_metadata):
     else:
         placeholders['background_placeholder'] = f'<!-- Synthesize background from {num_notebooks} notebook(s) -->'
 
-    # Hypotheses rows
-    hyp_rows = []
-    for i, meta in enumerate(notebooks_metadata, 1):
-        if meta['exists']:
-            exp_num = meta.get('experiment_number', f'Exp{i:02d}')
-            hyp_rows.append(f'| H{i} | <!-- Extract from {meta["name"]} --> | {exp_num} | Supported/Rejected/Inconclusive |')
-    placeholders['hypotheses_rows'] = '\n'.join(hyp_rows) if hyp_rows else '| H1 | [Testable statement] | Exp## | Supported/Rejected/Inconclusive |'
-
-    # Data sources rows
-    data_rows = []
-    for meta in notebooks_metadata:
-        if meta['exists']:
-            exp_num = meta.get('experiment_number', 'Exp##')
-            data_rows.append(f'| <!-- Dataset --> | <!-- Version/Date --> | <!-- Source --> | {exp_num} |')
-    placeholders['data_sources_rows'] = '\n'.join(data_rows) if data_rows else '| [Name] | [v1.0 / 2025-01-15] | [URL/path] | Exp## |'
+    # Per-notebook table rows, with template examples when there are none
+    for key, example in EXAMPLE_ROWS.items():
+        rows = [row for part in parts for row in part['rows'][key]]
+        placeholders[key] = '\n'.join(rows) if rows else example
 
     # Tools rows
     placeholders['tools_rows'] = '| <!-- Tool name --> | <!-- Version --> | <!-- Brief purpose --> |'
 
     # Findings section
-    placeholders['findings_section'] = generate_findings_section(notebooks_metadata)
+    placeholders['findings_section'] = generate_findings_section(notebooks_metadata, parts)
 
-    # Hypothesis evaluation rows
-    eval_rows = []
-    for i, meta in enumerate(notebooks_metadata, 1):
-        if meta['exists']:
-            eval_rows.append(f'| H{i}: <!-- Statement --> | Supported/Rejected/Inconclusive | <!-- Brief evidence --> | Strong/Moderate/Weak |')
-    placeholders['hypothesis_eval_rows'] = '\n'.join(eval_rows) if eval_rows else '| H1: [Statement] | Supported/Rejected/Inconclusive | [Brief evidence] | Strong/Moderate/Weak |'
-
-    # Notebooks table for appendix
-    nb_rows = []
-    for meta in notebooks_metadata:
-        if meta['exists']:
-            exp_num = meta.get('experiment_number', 'Exp##')
-            nb_rows.append(f'| {exp_num} | `{meta["relative_path"]}` | Complete | <!-- List figures/tables --> |')
-    placeholders['notebooks_table'] = '\n'.join(nb_rows) if nb_rows else '| Exp## | `../labnote/Exp##_*.ipynb` | Complete | [List figures/tables] |'
-
-    # Figures table for appendix
-    fig_rows = []
-    for i, meta in enumerate(notebooks_metadata, 1):
-        if meta['exists']:
-            results_path = meta.get('results_path', f'../results/exp{i:02d}')
-            fig_rows.append(f'| Fig {i} | `{results_path}/fig01_*.png` | <!-- Description --> | Finding {i} |')
-    placeholders['figures_table'] = '\n'.join(fig_rows) if fig_rows else '| Fig 1 | `../results/exp##/fig01_*.png` | [Description] | Finding 1 |'
+    placeholders['labnote_paths_cmd'] = labnote_paths_cmd(notebooks_metadata)
 
-    # Command line paths
+    return placeholders
+
+
+def experiments_list(notebooks_metadata):
+    """Experiments Covered value for the report header."""
+    exp_names = [meta.get('experiment_number', meta['name']) for meta in notebooks_metadata if meta['exists']]
+    return ', '.join(exp_names) if exp_names else '[Exp##, Exp##, ...]'
+
+
+def labnote_paths_cmd(notebooks_metadata):
+    """Notebook paths for the Reproducibility command line."""
     labnote_paths = ' '.join([meta['relative_path'] for meta in notebooks_metadata if meta['exists']])
-    placeholders['labnote_paths_cmd'] = labnote_paths if labnote_paths else '../labnote/Exp*.ipynb'
+    return labnote_paths if labnote_paths else '../labnote/Exp*.ipynb'
 
-    return placeholders
 
+def collect_notebooks_metadata(labnote_paths, output_path, use_cache=True, jobs=None, extract_images=False):
+    """
+    Extract metadata for notebooks and index their results directories.
+
+    Args:
+        labnote_paths: List of paths to lab notebooks
+        output_path: Report directory (holds .cache/)
+        use_cache: Reuse parsed notebook content from <output_path>/.cache/
+        jobs: Worker processes for notebook parsing (default: CPU count;
+            1 parses sequentially in this process)
+        extract_images: Write embedded .ipynb images into each results
+            directory before indexing it (see notebook_images.py)
+
+    Returns:
+        (list of metadata dicts, ParseCache or None)
+    """
+    with tracer.phase('discover'):
+        cache = ParseCache(output_path / '.cache') if use_cache else None
+        registry = open_experiment_registry(output_path)
+    with tracer.phase('parse_notebooks', notebooks=len(labnote_paths)):
+        preloaded = {}
+        if jobs != 1:
+            preloaded = load_notebook_contents(labnote_paths, cache, jobs)
+        notebooks_metadata = []
+        for notebook_path in labnote_paths:
+            metadata = extract_notebook_metadata(notebook_path, cache, preloaded.get(notebook_path), registry)
+            notebooks_metadata.append(metadata)
+            if metadata['exists']:
+                print(f"✅ Found notebook: {metadata['name']}")
+            else:
+                print(f"⚠️  Notebook not found: {notebook_path}")
+
+    # Index figures/tables under each experiment's results directory
+    with tracer.phase('index_results', extract_images=extract_images):
+        results_index = ResultsIndex(output_path / '.cache' / 'results_index.json' if use_cache else None)
+        num_figures = num_tables = num_extracted = 0
+        for metadata in notebooks_metadata:
+            if metadata['exists'] and metadata.get('results_dir'):
+                project_dir = labnote_project_dir(metadata['path'], registry)
+                metadata['results_abs'] = str((project_dir / metadata['results_dir']).resolve())
+                sources = {}
+                if extract_images and metadata['path'].endswith('.ipynb'):
+                    try:
+                        extracted = extract_notebook_images(metadata['path'], metadata['results_abs'])
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️  Warning: Could not extract images from {metadata['name']}: {e}")
+                    else:
+                        num_extracted += extracted['stored']
+                        for image in extracted['images']:
+                            sources.setdefault(image['path'], image['cell'])
+                metadata.update(results_index.scan(metadata['results_abs']))
+                for figure in metadata['figures']:
+                    if figure['path'] in sources:
+                        figure['cell'] = sources[figure['path']]
+                num_figures += len(metadata['figures'])
+                num_tables += len(metadata['tables'])
+        if extract_images:
+            print(f"🖼️  Extracted images: {num_extracted} new file(s) in results/.images/")
+        try:
+            results_index.save()
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write results index cache: {e}")
+        print(f"🖼️  Results index: {num_figures} figure(s), {num_tables} table(s)")
+
+    if registry is not None:
+        # Keep registry hypotheses in step with the notebooks just parsed
+        with tracer.phase('registry_update'):
+            for metadata in notebooks_metadata:
+                if metadata.get('experiment_number'):
+                    hypothesis = summarize_section(metadata.get('sections', {}).get('Hypothesis'))
+                    registry.set_hypothesis(metadata['experiment_number'], hypothesis)
+            registry.close()
+
+    if cache is not None:
+        with tracer.phase('cache_save'):
+            try:
+                cache.save()
+            except OSError as e:
+                print(f"⚠️  Warning: Could not write parse cache: {e}")
+        print(f"💾 Parse cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+
+    return notebooks_metadata, cache
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+def notebook_state(part, report_dir, cache=None):
+    """
+    State entry recorded in the report for one generated notebook.
+
+    Args:
+        part: Entry from generate_notebook_parts
+        report_dir: Directory of the report; 'path' and 'results' are
+            recorded relative to it
+        cache: Optional ParseCache (supplies the content hash without a re-read)
+
+    Returns:
+        JSON-serializable dict
+    """
+    meta = part['meta']
+    stat = os.stat(meta['path'])
+    fig_rows = part['rows']['figures_table']
+    return {
+        'path': state_path(meta['path'], report_dir),
+        'num': part['num'],
+        'experiment': meta.get('experiment_number', meta['name']),
+        'relative_path': meta['relative_path'],
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'digest': cache.known_digest(meta['path']) if cache is not None else None,
+        'results': state_path(meta['results_abs'], report_dir) if meta.get('results_abs') else None,
+        'results_mtime_ns': _mtime_ns(meta.get('results_abs')),
+        'fig_start': int(fig_rows[0].split()[2]),
+        'fig_count': len(fig_rows),
+        'finding': text_hash(part['finding']),
+        'rows': {key: [text_hash(row) for row in rows] for key, rows in part['rows'].items()},
+    }
+
+
+def _row_offset(entries, num, table):
+    """
+    Index of notebook num's first row in a table body.
 
-def init_report(labnote_paths, output_dir, title=None):
+    Each notebook's rows are generated as one block, in finding order, so
+    the rows of the notebooks before it give the position.
+    """
+    return sum(len(entry['rows'].get(table, [])) for entry in entries if entry['num'] < num)
+
+
+def _managed_values(entries):
+    """Values of the report lines that list every notebook, in report order."""
+    entries = sorted(entries, key=lambda entry: entry['num'])
+    return {
+        'experiments_list': ', '.join(entry['experiment'] for entry in entries),
+        'labnote_paths_cmd': ' '.join(entry['relative_path'] for entry in entries),
+        'num_notebooks': str(len(entries)),
+    }
+
+
+def init_report(labnote_paths, output_dir, title=None, use_cache=True, jobs=None, if_exists='ask', outcome=None,
+                extract_images=False):
     """
     Initialize report from lab notebooks.
 
@@ -482,10 +986,24 @@ def init_report(labnote_paths, output_dir, title=None):
         labnote_paths: List of paths to lab notebooks
         output_dir: Directory where report should be created
         title: Optional custom title
+        use_cache: Reuse parsed notebook content from <output_dir>/.cache/
+        jobs: Worker processes for notebook parsing (default: CPU count;
+            1 parses sequentially in this process)
+        if_exists: Existing report policy (see IF_EXISTS_POLICIES): 'ask'
+            prompts, 'skip' keeps it, 'overwrite' replaces it, 'update'
+            runs update_report on it
+        outcome: Optional dict that receives 'action' ('created', 'skipped',
+            'updated' or 'cancelled')
+        extract_images: Extract embedded .ipynb images into results/exp##/
+            so they appear in the Figure Index
 
     Returns:
-        Path to created report, or None if error
+        Path to created report (or the existing one when skipped/updated),
+        or None if error
     """
+    if if_exists not in IF_EXISTS_POLICIES:
+        raise ValueError(f"if_exists must be one of {', '.join(IF_EXISTS_POLICIES)}")
+    outcome = {} if outcome is None else outcome
     output_path = Path(output_dir).resolve()
 
     print(f"🚀 Initializing report from {len(labnote_paths)} notebook(s)")
@@ -498,14 +1016,7 @@ def init_report(labnote_paths, output_dir, title=None):
         print(f"✅ Created output directory: {output_path}")
 
     # Extract metadata from notebooks
-    notebooks_metadata = []
-    for notebook_path in labnote_paths:
-        metadata = extract_notebook_metadata(notebook_path)
-        notebooks_metadata.append(metadata)
-        if metadata['exists']:
-            print(f"✅ Found notebook: {metadata['name']}")
-        else:
-            print(f"⚠️  Notebook not found: {notebook_path}")
+    notebooks_metadata, cache = collect_notebooks_metadata(labnote_paths, output_path, use_cache, jobs, extract_images)
 
     print()
 
@@ -530,24 +1041,48 @@ def init_report(labnote_paths, output_dir, title=None):
     # Check if report already exists
     if report_path.exists():
         print(f"⚠️  Warning: Report already exists: {report_path}")
-        response = input("Overwrite? (y/N): ")
-        if response.lower() != 'y':
-            print("❌ Cancelled")
-            return None
+        if if_exists == 'skip':
+            print("⏭️  Skipped (--if-exists skip)")
+            outcome['action'] = 'skipped'
+            return report_path
+        if if_exists == 'update':
+            outcome['action'] = 'updated'
+            return update_report(report_path, labnote_paths, use_cache=use_cache, jobs=jobs,
+                                 extract_images=extract_images)
+        if if_exists == 'ask':
+            response = input("Overwrite? (y/N): ")
+            if response.lower() != 'y':
+                print("❌ Cancelled")
+                outcome['action'] = 'cancelled'
+                return None
 
     # Generate placeholders
-    placeholders = generate_placeholders(notebooks_metadata)
-    placeholders['report_filename'] = report_path.name
+    with tracer.phase('generate_placeholders'):
+        parts = generate_notebook_parts(notebooks_metadata)
+        placeholders = generate_placeholders(notebooks_metadata, parts)
+        placeholders['report_filename'] = report_path.name
 
     # Generate report content
-    report_content = REPORT_TEMPLATE.format(
-        title=title.replace('_', ' ').title(),
-        date=datetime.now().strftime('%Y-%m-%d'),
-        **placeholders
-    )
+    with tracer.phase('format_template'):
+        report_content = REPORT_TEMPLATE.format(
+            title=title.replace('_', ' ').title(),
+            date=datetime.now().strftime('%Y-%m-%d'),
+            **placeholders
+        )
+
+    # Record what was generated so --update can tell it from hand edits
+    with tracer.phase('render_state'):
+        entries = [notebook_state(part, report_path.parent, cache) for part in parts]
+        report_content += render_state({
+            'version': STATE_VERSION,
+            'notebooks': entries,
+            'lines': _managed_values(entries),
+        })
 
     # Write report
-    report_path.write_text(report_content)
+    with tracer.phase('write', bytes=len(report_content)):
+        write_atomic(report_path, report_content)
+    outcome['action'] = 'created'
     print(f"✅ Created report: {report_path}")
     print()
 
@@ -561,25 +1096,203 @@ def init_report(labnote_paths, output_dir, title=None):
     print()
     print("💡 Tip: Look for <!-- comments --> for extraction guidance")
     print("💡 Tip: Check quality gate checklists before finalizing")
+    print(f"💡 Tip: Add notebooks later with --update {report_path.name}")
+
+    return report_path
+
+
+def _notebook_changed(entry, path, report_dir):
+    """
+    Check a notebook recorded in the report state against the file on disk.
+
+    Size/mtime are compared first; a touched file whose content hash is
+    unchanged counts as unchanged (its fingerprint is refreshed in place).
+    """
+    stat = path.stat()
+    if stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+        changed = False
+    elif entry.get('digest') and stat.st_size == entry['size']:
+        changed = file_digest(path) != entry['digest']
+    else:
+        changed = True
+    if not changed:
+        entry['size'], entry['mtime_ns'] = stat.st_size, stat.st_mtime_ns
+    results = resolve_state_path(entry.get('results'), report_dir)
+    return changed or _mtime_ns(results) != entry.get('results_mtime_ns')
+
+
+def update_report(report_path, labnote_paths=None, use_cache=True, jobs=None, extract_images=False):
+    """
+    Regenerate the parts of an existing report that belong to new or
+    changed notebooks, keeping everything else as written.
 
+    Only new/changed notebooks are parsed. A changed notebook's finding and
+    table rows are replaced only if they still match what was generated;
+    hand-edited parts are kept and reported. New notebooks get the next
+    finding number and their rows are appended to each table.
+
+    Args:
+        report_path: Existing report created by init_report
+        labnote_paths: Notebooks to cover (default: those already in the report)
+        use_cache: Reuse parsed notebook content from the report's .cache/
+        jobs: Worker processes for notebook parsing
+        extract_images: Extract embedded images of new/changed .ipynb notebooks
+
+    Returns:
+        Path to updated report, or None if error
+    """
+    report_path = Path(report_path).resolve()
+    if not report_path.is_file():
+        print(f"❌ Error: Report not found: {report_path}")
+        return None
+
+    with tracer.phase('read_report'):
+        text, state = split_state(report_path.read_text(encoding='utf-8'))
+    if state is None or not state['notebooks']:
+        print(f"❌ Error: {report_path.name} has no generated notebook state")
+        print("💡 Tip: Only reports created by init_report.py with notebooks can be updated")
+        return None
+
+    # Recorded paths are relative to the report; key them by the absolute
+    # path in this checkout, as --labnote arguments are normalised the same way
+    report_dir = report_path.parent
+    entries = {str(resolve_state_path(entry['path'], report_dir)): entry for entry in state['notebooks']}
+    if not labnote_paths:
+        labnote_paths = list(entries)
+
+    print(f"🚀 Updating report: {report_path}")
+    print()
+
+    # Find new/changed notebooks by fingerprint (no parsing)
+    with tracer.phase('check_fingerprints', notebooks=len(labnote_paths)):
+        pending = []
+        for notebook_path in dict.fromkeys(labnote_paths):
+            path = Path(notebook_path)
+            if not path.exists():
+                print(f"⚠️  Notebook not found: {notebook_path}")
+                continue
+            entry = entries.get(str(path.resolve()))
+            if entry is None or _notebook_changed(entry, path, report_dir):
+                pending.append(notebook_path)
+    if not pending:
+        print("✅ Report is up to date")
+        return report_path
+
+    notebooks_metadata, cache = collect_notebooks_metadata(pending, report_path.parent, use_cache, jobs, extract_images)
+    print()
+
+    with tracer.phase('patch_report', notebooks=len(notebooks_metadata)):
+        doc = ReportDocument(text)
+        next_num = max(entry['num'] for entry in entries.values()) + 1
+        max_fig = max([doc.max_figure_number()] + [e['fig_start'] + e['fig_count'] - 1 for e in entries.values()])
+        kept = []
+        for meta in notebooks_metadata:
+            if not meta['exists']:
+                continue
+            key = str(Path(meta['path']).resolve())
+            old = entries.get(key)
+            num = old['num'] if old else next_num
+            rows = generate_notebook_rows(meta, num, old['fig_start'] if old else max_fig + 1)
+            if old and len(rows['figures_table']) > old['fig_count']:
+                # More figures than before: renumber after the current last figure
+                rows = generate_notebook_rows(meta, num, max_fig + 1)
+            part = {'meta': meta, 'num': num, 'finding': generate_finding(meta, num), 'rows': rows}
+            entry = notebook_state(part, report_dir, cache)
+
+            if old is None:
+                next_num += 1
+                if not doc.append_finding(part['finding']):
+                    kept.append(f"Finding {num} (no Findings section)")
+                for table, table_rows in rows.items():
+                    if not doc.append_rows(table, table_rows):
+                        kept.append(f"{table} rows for {entry['experiment']} (table not found)")
+                print(f"✅ Added: {meta['name']} (Finding {num})")
+            else:
+                if not doc.replace_finding(num, old['finding'], part['finding']):
+                    kept.append(f"Finding {num} ({entry['experiment']})")
+                    entry['finding'] = None
+                for table, table_rows in rows.items():
+                    old_rows = old['rows'].get(table, [])
+                    offset = _row_offset(entries.values(), num, table)
+                    if not doc.replace_rows(table, offset, old_rows, table_rows):
+                        kept.append(f"{table} rows for {entry['experiment']}")
+                        # Never match again, but keep counting the rows left in place
+                        entry['rows'][table] = [None] * len(old_rows)
+                print(f"✅ Regenerated: {meta['name']} (Finding {num})")
+            entries[key] = entry
+            max_fig = max(max_fig, entry['fig_start'] + entry['fig_count'] - 1)
+
+        # Lines listing every notebook follow along unless edited by hand
+        lines = _managed_values(entries.values())
+        for name, value in lines.items():
+            if not doc.replace_line(name, state['lines'].get(name), value):
+                lines[name] = state['lines'].get(name)
+
+        for part_name in kept:
+            print(f"⚠️  Kept hand-edited {part_name}")
+
+        state['notebooks'] = sorted(entries.values(), key=lambda entry: entry['num'])
+        state['lines'] = lines
+    with tracer.phase('write'):
+        write_atomic(report_path, doc.text() + render_state(state))
+    print()
+    print(f"✅ Updated report: {report_path}")
     return report_path
 
 
+def verify(report_path, jobs=None):
+    """
+    Verify evidence paths in a generated report and print JSON results.
+
+    Args:
+        report_path: Path to report markdown
+        jobs: Threads for directory listings/stat calls
+
+    Returns:
+        True if no evidence is missing
+    """
+    if not Path(report_path).is_file():
+        print(json.dumps({'report': str(report_path), 'error': 'Report not found'}))
+        return False
+    with tracer.phase('verify_evidence'):
+        result = verify_report(report_path, workers=jobs or DEFAULT_WORKERS)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return not result['missing']
+
+
 def main():
-    if len(sys.argv) < 5:
-        print("Usage: init_report.py --labnote <path1> [path2 ...] --output <output_dir> [--title <title>]")
+    args = configure_profiling(sys.argv[1:], 'init_report')
+    if len(args) == 2 and args[0] == '--verify':
+        with tracer.phase('verify'):
+            ok = verify(args[1])
+        sys.exit(0 if ok else 1)
+
+    if len(args) < 4 and '--update' not in args:
+        print("Usage: init_report.py --labnote <path1> [path2 ...] --output <output_dir> [--title <title>] [--if-exists skip|overwrite|update] [--extract-images] [--no-cache] [--jobs N]")
+        print("       init_report.py --update <report.md> [--labnote <path1> ...] [--extract-images] [--no-cache] [--jobs N]")
+        print("       init_report.py --verify <report.md> [--jobs N]")
+        print("       (any mode) [--profile [trace.json]] [--chrome-trace <events.json>]")
         print()
         print("Examples:")
         print("  init_report.py --labnote notebook/labnote/Exp01_rnaseq.ipynb --output notebook/report/")
         print("  init_report.py --labnote Exp01*.ipynb Exp02*.md --output notebook/report/ --title 'RNA-seq Analysis'")
+        print("  init_report.py --labnote notebook/labnote/Exp*.ipynb --output notebook/report/ --if-exists update")
+        print("  init_report.py --update notebook/report/Report_Exp01_rnaseq.md --labnote notebook/labnote/Exp*.ipynb")
+        print("  init_report.py --verify notebook/report/Report_Exp01_rnaseq.md")
+        print("  init_report.py --labnote notebook/labnote/Exp*.ipynb --output notebook/report/ --profile trace.json")
         sys.exit(1)
 
     # Parse arguments
-    args = sys.argv[1:]
-
     labnote_paths = []
     output_dir = None
     title = None
+    use_cache = True
+    jobs = None
+    verify_path = None
+    update_path = None
+    # Prompt only when someone can answer
+    if_exists = 'ask' if sys.stdin.isatty() else 'skip'
+    extract_images = False
 
     i = 0
     while i < len(args):
@@ -599,9 +1312,55 @@ def main():
             if i < len(args):
                 title = args[i]
                 i += 1
+        elif args[i] == '--verify':
+            i += 1
+            if i < len(args):
+                verify_path = args[i]
+                i += 1
+        elif args[i] == '--update':
+            i += 1
+            if i < len(args):
+                update_path = args[i]
+                i += 1
+        elif args[i] == '--if-exists':
+            i += 1
+            if i < len(args):
+                if_exists = args[i]
+                if if_exists not in IF_EXISTS_POLICIES:
+                    print(f"❌ Error: --if-exists must be one of {', '.join(IF_EXISTS_POLICIES)} (got {if_exists})")
+                    sys.exit(1)
+                i += 1
+        elif args[i] == '--no-cache':
+            use_cache = False
+            i += 1
+        elif args[i] == '--extract-images':
+            extract_images = True
+            i += 1
+        elif args[i] == '--jobs':
+            i += 1
+            if i < len(args):
+                try:
+                    jobs = int(args[i])
+                except ValueError:
+                    jobs = 0
+                if jobs < 1:
+                    print(f"❌ Error: --jobs must be a positive integer (got {args[i]})")
+                    sys.exit(1)
+                i += 1
         else:
             i += 1
 
+    if verify_path is not None:
+        with tracer.phase('verify'):
+            ok = verify(verify_path, jobs)
+        sys.exit(0 if ok else 1)
+
+    if update_path is not None:
+        with tracer.phase('update_report', notebooks=len(labnote_paths)):
+            result = update_report(update_path, labnote_paths, use_cache=use_cache, jobs=jobs,
+                                   extract_images=extract_images)
+        sys.exit(0 if result else 1)
+
     # Validate arguments
     if not labnote_paths:
         print("❌ Error: No lab notebooks specified (use --labnote)")
@@ -612,7 +1371,9 @@ def main():
         sys.exit(1)
 
     # Initialize report
-    result = init_report(labnote_paths, output_dir, title)
+    with tracer.phase('init_report', notebooks=len(labnote_paths)):
+        result = init_report(labnote_paths, output_dir, title, use_cache=use_cache, jobs=jobs, if_exists=if_exists,
+                             extract_images=extract_images)
 
     sys.exit(0 if result else 1)
 
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Notebook Images - Extracts embedded notebook images into results/exp##/
+
+Streams image outputs (base64 PNG/JPEG/GIF, inline SVG) out of an .ipynb
+via notebook_reader.iter_output_data and decodes them in chunks while
+hashing, so neither the notebook nor a whole image string is held in memory.
+
+Images are stored content-addressed:
+    results/.images/<sha256>.<ext>        single stored copy
+    results/exp##/img_<sha256[:16]>.<ext> hard link (copy if linking fails)
+
+The same figure in several notebooks or re-runs is stored once, and
+re-extracting an unchanged notebook writes nothing. img_* links of images
+no longer in the notebook are removed, so the Figure Index lists only the
+current outputs; their stored copies stay in results/.images/.
+
+Usage:
+    notebook_images.py <notebook.ipynb> <results_dir>
+
+Examples:
+    notebook_images.py notebook/labnote/Exp01_rnaseq.ipynb results/exp01
+"""
+
+import binascii
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from atomic_write import FILE_MODE
+from notebook_reader import iter_output_data
+from results_index import image_size
+
+
+# MIME type -> (file extension, base64-encoded)
+IMAGE_TYPES = {
+    'image/png': ('png', True),
+    'image/jpeg': ('jpg', True),
+    'image/gif': ('gif', True),
+    'image/svg+xml': ('svg', False),
+}
+
+STORE_DIRNAME = '.images'
+
+# Links written by extract_images (extensions of IMAGE_TYPES)
+_IMAGE_LINK = re.compile(r'img_[0-9a-f]{16}\.(?:png|jpg|gif|svg)$')
+
+
+def _decode_to_file(chunks, base64_encoded, tmp_path):
+    """
+    Decode payload chunks into a file while hashing them.
+
+    Returns:
+        (sha256 hex digest, size in bytes)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    pending = ''
+    with open(tmp_path, 'wb') as f:
+        for text in chunks:
+            if base64_encoded:
+                # Decode whole 4-character groups; carry the rest to the next chunk
+                pending += ''.join(text.split())
+                cut = len(pending) - len(pending) % 4
+                data = binascii.a2b_base64(pending[:cut])
+                pending = pending[cut:]
+            else:
+                data = text.encode('utf-8')
+            digest.update(data)
+            f.write(data)
+            size += len(data)
+        if pending:
+            data = binascii.a2b_base64(pending)
+            digest.update(data)
+            f.write(data)
+            size += len(data)
+    return digest.hexdigest(), size
+
+
+def _link_or_copy(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def extract_images(notebook_path, results_dir, store_dir=None):
+    """
+    Extract embedded images from a notebook into a results directory.
+
+    Args:
+        notebook_path: Path to .ipynb file
+        results_dir: Experiment results directory (e.g. results/exp01)
+        store_dir: Content-addressed store (default: <results_dir>/../.images)
+
+    Returns:
+        dict with 'images' (one entry per image output, in notebook order:
+        'path' relative to results_dir, 'sha256', 'mime', 'size', 'width',
+        'height', 'cell', 'output'), 'stored' (new files in the store),
+        'reused' (outputs whose content was already stored) and 'removed'
+        (stale img_* links deleted from results_dir)
+    """
+    results_dir = Path(results_dir)
+    store_dir = Path(store_dir) if store_dir else results_dir.parent / STORE_DIRNAME
+    results_dir.mkdir(parents=True, exist_ok=True)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    images = []
+    stored = reused = 0
+    tmp_path = None
+    try:
+        for cell, output, mime, chunks in iter_output_data(notebook_path, IMAGE_TYPES):
+            ext, base64_encoded = IMAGE_TYPES[mime]
+            # Unique per image: concurrent extractions (batch_report.py runs
+            # jobs as threads) share the store directory
+            fd, tmp_path = tempfile.mkstemp(prefix='.extract.', suffix='.tmp', dir=store_dir)
+            os.close(fd)
+            try:
+                sha, size = _decode_to_file(chunks, base64_encoded, tmp_path)
+            except (binascii.Error, ValueError) as e:
+                print(f"⚠️  Warning: Skipping undecodable {mime} output in cell {cell}: {e}")
+                os.unlink(tmp_path)
+                tmp_path = None
+                continue
+
+            store_path = store_dir / f'{sha}.{ext}'
+            if store_path.exists():
+                os.unlink(tmp_path)
+                reused += 1
+            else:
+                os.chmod(tmp_path, FILE_MODE)
+                os.replace(tmp_path, store_path)
+                stored += 1
+            tmp_path = None
+
+            name = f'img_{sha[:16]}.{ext}'
+            target = results_dir / name
+            if not target.exists():
+                _link_or_copy(store_path, target)
+
+            width, height = image_size(target) or (None, None)
+            images.append({
+                'path': name,
+                'sha256': sha,
+                'mime': mime,
+                'size': size,
+                'width': width,
+                'height': height,
+                'cell': cell,
+                'output': output,
+            })
+    finally:
+        # Only an image interrupted mid-decode leaves its own file behind
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    # Links left by earlier runs are hard links into the store: nothing is lost
+    current = {image['path'] for image in images}
+    removed = 0
+    for entry in os.scandir(results_dir):
+        if _IMAGE_LINK.match(entry.name) and entry.name not in current:
+            os.unlink(entry.path)
+            removed += 1
+
+    return {'images': images, 'stored': stored, 'reused': reused, 'removed': removed}
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) != 2 or args[0].startswith('--'):
+        print("Usage: notebook_images.py <notebook.ipynb> <results_dir>")
+        sys.exit(1)
+
+    try:
+        result = extract_images(args[0], args[1])
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Notebook Reader - Streams lab notebook sections without loading whole notebooks
+
+Lab notebooks routinely carry hundreds of MB of base64 image outputs. This
+module walks the .ipynb JSON incrementally, skips `outputs` payloads without
+materializing them, and returns only the markdown sections named in
+references/mapping-rules.md. Peak memory is bounded by the largest single
+cell source rather than the notebook size. Output payloads that are needed
+(embedded images) are streamed piece by piece through iter_output_data.
+
+Usage:
+    notebook_reader.py <notebook.ipynb|labnote.md> [--section <name> ...]
+
+Examples:
+    notebook_reader.py notebook/labnote/Exp01_rnaseq.ipynb
+    notebook_reader.py notebook/labnote/Exp01_rnaseq.ipynb --section Results --section Discussion
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+
+# Lab notebook sections from references/mapping-rules.md (Section Mapping table)
+NOTEBOOK_SECTIONS = (
+    'Hypothesis',
+    'Background',
+    'Materials and Methods',
+    'Data',
+    'Tools',
+    'Procedure',
+    'Results',
+    'Discussion',
+    'Interpretation',
+    'Hypothesis Evaluation',
+    'Limitations',
+    'Next Steps',
+)
+
+CHUNK_SIZE = 1 << 20  # characters per read
+
+_WHITESPACE = ' \t\n\r'
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_SCALAR_END = re.compile(r'[,}\]\s]')
+_HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+
+
+class _JsonScanner:
+    """
+    Minimal pull-style JSON scanner over a text stream.
+
+    Values can be skipped (never materialized) or read (captured and decoded
+    with json.loads). Only the current chunk plus the value being read is
+    held in memory.
+    """
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buf = ''
+        self._pos = 0
+        self._parts = None
+        self._mark = 0
+
+    def _fill(self):
+        """Replace the buffer with the next chunk; returns False at EOF."""
+        if self._parts is not None:
+            self._parts.append(self._buf[self._mark:])
+            self._mark = 0
+        self._buf = self._stream.read(self._chunk_size)
+        self._pos = 0
+        return bool(self._buf)
+
+    def _prepend(self, text):
+        """Put text carried over from the previous chunk in front of the buffer."""
+        if self._parts is not None:
+            # read_value already captured it with the previous chunk
+            self._parts[-1] = self._parts[-1][:-len(text)]
+        self._buf = text + self._buf
+
+    def _peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of notebook JSON')
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f'Expected {char!r} in notebook JSON, found {self._buf[self._pos]!r}')
+        self._pos += 1
+
+    def _skip_string(self):
+        self._pos += 1  # opening quote
+        while True:
+            # str.find (memchr) is far faster than a regex over base64 payloads;
+            # escaped quotes are rejected by counting the backslashes before them
+            buf = self._buf
+            quote = buf.find('"', self._pos)
+            while quote != -1 and _escaped(buf, quote, self._pos):
+                quote = buf.find('"', quote + 1)
+            if quote != -1:
+                self._pos = quote + 1
+                return
+            # Keep trailing backslashes: they may escape the next chunk's first character
+            tail = len(buf)
+            while tail > self._pos and buf[tail - 1] == '\\':
+                tail -= 1
+            tail = buf[tail:]
+            if not self._fill():
+                raise ValueError('Unterminated string in notebook JSON')
+            if tail:
+                self._prepend(tail)
+
+    def _skip_container(self):
+        self._pos += 1  # opening bracket
+        depth = 1
+        while depth:
+            match = _STRUCTURE.search(self._buf, self._pos)
+            if match is None:
+                self._pos = len(self._buf)
+                if not self._fill():
+                    raise ValueError('Unterminated container in notebook JSON')
+                continue
+            char = match.group()
+            if char == '"':
+                self._pos = match.start()
+                self._skip_string()
+            else:
+                self._pos = match.end()
+                depth += 1 if char in '{[' else -1
+
+    def _skip_scalar(self):
+        while True:
+            match = _SCALAR_END.search(self._buf, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return
+            self._pos = len(self._buf)
+            if not self._fill():
+                return
+
+    def skip_value(self):
+        """Consume the next value without keeping it in memory."""
+        char = self._peek()
+        if char == '"':
+            self._skip_string()
+        elif char in '{[':
+            self._skip_container()
+        else:
+            self._skip_scalar()
+
+    def iter_string(self):
+        """
+        Consume the next string value, yielding its decoded text in pieces of
+        at most one chunk, so multi-MB strings are never built in memory.
+        """
+        self._expect('"')
+        while True:
+            buf = self._buf
+            quote = buf.find('"', self._pos)
+            while quote != -1 and _escaped(buf, quote, self._pos):
+                quote = buf.find('"', quote + 1)
+            if quote != -1:
+                yield _decode_segment(buf[self._pos:quote])
+                self._pos = quote + 1
+                return
+            # Hold back an escape sequence cut off by the chunk boundary
+            cut = _incomplete_escape(buf, self._pos)
+            if cut > self._pos:
+                yield _decode_segment(buf[self._pos:cut])
+            tail = buf[cut:]
+            if not self._fill():
+                raise ValueError('Unterminated string in notebook JSON')
+            if tail:
+                self._prepend(tail)
+
+    def iter_text(self):
+        """iter_string for nbformat multiline values: a string or a list of strings."""
+        if self._peek() == '[':
+            for _ in self.iter_array():
+                yield from self.iter_string()
+        else:
+            yield from self.iter_string()
+
+    def read_value(self):
+        """Consume and decode the next value."""
+        self._peek()
+        self._parts = []
+        self._mark = self._pos
+        try:
+            self.skip_value()
+            self._parts.append(self._buf[self._mark:self._pos])
+            raw = ''.join(self._parts)
+        finally:
+            self._parts = None
+        return json.loads(raw)
+
+    def iter_object(self):
+        """
+        Yield keys of the next object. The caller must consume each value
+        (read_value/skip_value/iter_*) before advancing the generator.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self._expect(':')
+            yield key
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError(f'Expected "," or "}}" in notebook JSON, found {char!r}')
+
+    def iter_array(self):
+        """
+        Yield indices of the next array. The caller must consume each element
+        before advancing the generator.
+        """
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f'Expected "," or "]" in notebook JSON, found {char!r}')
+
+
+def _escaped(buf, index, start):
+    """True if buf[index] is preceded by an odd number of backslashes (from start)."""
+    count = 0
+    while index - count - 1 >= start and buf[index - count - 1] == '\\':
+        count += 1
+    return count % 2 == 1
+
+
+def _incomplete_escape(buf, start):
+    """Index where a trailing, incomplete escape sequence begins (len(buf) if none)."""
+    cut = len(buf)
+    backslash = buf.rfind('\\', max(start, cut - 6), cut)
+    while backslash != -1 and _escaped(buf, backslash, start):
+        # Part of an escaped backslash pair; look further left
+        backslash = buf.rfind('\\', max(start, cut - 6), backslash - 1)
+    if backslash != -1 and (backslash == cut - 1 or (buf[backslash + 1] == 'u' and cut - backslash < 6)):
+        cut = backslash
+    # A high surrogate escape stays with its low half
+    high = cut - 6
+    if (high >= start and buf[high] == '\\' and buf[high + 1] == 'u'
+            and buf[high + 2:high + 4].lower() in ('d8', 'd9', 'da', 'db') and not _escaped(buf, high, start)):
+        cut = high
+    return cut
+
+
+def _decode_segment(segment):
+    """Decode JSON string escapes in a segment holding only complete escapes."""
+    if '\\' not in segment:
+        return segment
+    return json.loads(f'"{segment}"', strict=False)
+
+
+def _join_source(source):
+    """Notebook sources are either a string or a list of lines."""
+    if isinstance(source, list):
+        return ''.join(source)
+    return source or ''
+
+
+def iter_cells(notebook_path, cell_types=None):
+    """
+    Stream cells from a notebook without loading outputs.
+
+    Args:
+        notebook_path: Path to .ipynb file
+        cell_types: Optional set of cell types to yield (e.g. {'markdown'});
+            sources of other cells are skipped unread
+
+    Yields:
+        dict with 'index', 'cell_type' and 'source' (str)
+    """
+    with open(notebook_path, encoding='utf-8') as stream:
+        scanner = _JsonScanner(stream)
+        for key in scanner.iter_object():
+            if key != 'cells':
+                scanner.skip_value()
+                continue
+            for index in scanner.iter_array():
+                cell = {'index': index, 'cell_type': None, 'source': ''}
+                source = None
+                for cell_key in scanner.iter_object():
+                    if cell_key == 'cell_type':
+                        cell['cell_type'] = scanner.read_value()
+                    elif cell_key == 'source':
+                        # nbformat writes cell_type before source; fall back to
+                        # reading the source when the order is unknown
+                        if cell_types is None or cell['cell_type'] in cell_types or cell['cell_type'] is None:
+                            source = scanner.read_value()
+                        else:
+                            scanner.skip_value()
+                    else:
+                        scanner.skip_value()
+                if cell_types is not None and cell['cell_type'] not in cell_types:
+                    continue
+                cell['source'] = _join_source(source)
+                yield cell
+
+
+def iter_output_data(notebook_path, mime_types):
+    """
+    Stream rich output payloads (e.g. base64 images) from a notebook.
+
+    Args:
+        notebook_path: Path to .ipynb file
+        mime_types: MIME types to yield (e.g. {'image/png'}); others are
+            skipped. 'stream' selects stdout/stderr text of stream outputs
+
+    Yields:
+        (cell_index, output_index, mime_type, chunks) where chunks iterates
+        the payload text piece by piece. Consume chunks before advancing;
+        an unconsumed remainder is skipped.
+    """
+    with open(notebook_path, encoding='utf-8') as stream:
+        scanner = _JsonScanner(stream)
+        for key in scanner.iter_object():
+            if key != 'cells':
+                scanner.skip_value()
+                continue
+            for cell_index in scanner.iter_array():
+                for cell_key in scanner.iter_object():
+                    if cell_key != 'outputs':
+                        scanner.skip_value()
+                        continue
+                    for output_index in scanner.iter_array():
+                        for output_key in scanner.iter_object():
+                            if output_key == 'text' and 'stream' in mime_types:
+                                chunks = scanner.iter_text()
+                                yield cell_index, output_index, 'stream', chunks
+                                for _ in chunks:
+                                    pass
+                                continue
+                            if output_key != 'data':
+                                scanner.skip_value()
+                                continue
+                            for mime_type in scanner.iter_object():
+                                if mime_type not in mime_types:
+                                    scanner.skip_value()
+                                    continue
+                                chunks = scanner.iter_text()
+                                yield cell_index, output_index, mime_type, chunks
+                                for _ in chunks:
+                                    pass
+
+
+def _normalize_heading(title):
+    title = re.sub(r'[*_`]', '', title).lower().replace('&', 'and')
+    title = re.sub(r'[^a-z0-9 ]+', ' ', title)
+    return ' '.join(title.split())
+
+
+def _match_section(title, wanted):
+    """
+    Map a heading to a wanted section name: exact match first, then the
+    longest wanted name the heading starts with ("Background & Prior Work"
+    -> "Background", "Hypothesis Evaluation" stays itself).
+    """
+    normalized = _normalize_heading(title)
+    best = None
+    for name, key in wanted.items():
+        if normalized == key:
+            return name
+        if normalized.startswith(key + ' ') and (best is None or len(key) > len(wanted[best])):
+            best = name
+    return best
+
+
+class _SectionCollector:
+    """Accumulates markdown lines into the sections whose heading is open."""
+
+    def __init__(self, sections):
+        self._wanted = {name: _normalize_heading(name) for name in sections}
+        self._open = []  # stack of (level, name)
+        self._lines = {}
+        self._in_fence = False
+
+    def feed(self, text):
+        for line in text.splitlines():
+            if line.lstrip().startswith(('```', '~~~')):
+                self._in_fence = not self._in_fence
+            heading = None if self._in_fence else _HEADING.match(line)
+            if heading:
+                level = len(heading.group(1))
+                while self._open and self._open[-1][0] >= level:
+                    self._open.pop()
+                name = _match_section(heading.group(2), self._wanted)
+                if name is not None:
+                    self._open.append((level, name))
+                    self._lines.setdefault(name, [])
+                    continue
+            for _, name in self._open:
+                self._lines[name].append(line)
+
+    def end_cell(self):
+        # A fence never spans markdown cells
+        self._in_fence = False
+
+    def result(self):
+        return {name: '\n'.join(lines).strip() for name, lines in self._lines.items()}
+
+
+def extract_sections(notebook_path, sections=NOTEBOOK_SECTIONS):
+    """
+    Extract named markdown sections from a lab notebook.
+
+    A section runs from its heading to the next heading of the same or
+    higher level, so "Discussion" includes its "Interpretation" subsection
+    and both are returned. Code cells and outputs are never read.
+
+    Args:
+        notebook_path: Path to .ipynb or .md lab notebook
+        sections: Section names to return (default: mapping-rules.md sections)
+
+    Returns:
+        dict mapping section name to its markdown text (only sections found)
+    """
+    path = Path(notebook_path)
+    collector = _SectionCollector(sections)
+
+    if path.suffix == '.ipynb':
+        for cell in iter_cells(path, cell_types={'markdown'}):
+            collector.feed(cell['source'])
+            collector.end_cell()
+    else:
+        with open(path, encoding='utf-8') as stream:
+            for line in stream:
+                collector.feed(line)
+
+    return collector.result()
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0].startswith('--'):
+        print("Usage: notebook_reader.py <notebook.ipynb|labnote.md> [--section <name> ...]")
+        sys.exit(1)
+
+    notebook_path = args[0]
+    sections = []
+    i = 1
+    while i < len(args):
+        if args[i] == '--section' and i + 1 < len(args):
+            sections.append(args[i + 1])
+            i += 2
+        else:
+            i += 1
+
+    try:
+        result = extract_sections(notebook_path, sections or NOTEBOOK_SECTIONS)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
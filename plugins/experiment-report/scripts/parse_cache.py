@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Parse Cache - Persistent on-disk cache of extracted notebook content
+
+Stores content extracted from lab notebooks (sections, ...) so repeated
+init_report.py runs only re-parse notebooks that changed.
+
+Layout (default: notebook/report/.cache/):
+    index.json              path -> size, mtime_ns, digest; digest -> last use
+    entries/<sha256>.json   extracted content, addressed by file content hash
+
+Lookup order:
+    1. path + size + mtime match the index        -> hit (no file read)
+    2. SHA-256 of the file matches a stored entry -> hit (touched/copied file)
+    3. otherwise                                  -> miss, parse and store
+
+Entries beyond the size limit are evicted least-recently-used first.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from atomic_write import write_atomic
+
+
+# Bump when the cached content format changes; older caches are discarded
+CACHE_VERSION = 2
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path):
+    """
+    Compute SHA-256 of a file with streaming reads.
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    Content-addressed cache of notebook extraction results.
+
+    Args:
+        cache_dir: Directory holding index.json and entries/
+        max_bytes: Size limit for stored entries (LRU eviction on save)
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.entries_dir = self.cache_dir / 'entries'
+        self.index_path = self.cache_dir / 'index.json'
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._paths = {}
+        self._entries = {}
+        self._dirty = False
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            index = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return
+        if index.get('version') != CACHE_VERSION:
+            return
+        self._paths = index.get('paths', {})
+        self._entries = index.get('entries', {})
+
+    def _entry_path(self, digest):
+        return self.entries_dir / f'{digest}.json'
+
+    def _read_entry(self, digest):
+        if digest not in self._entries:
+            return None
+        try:
+            return json.loads(self._entry_path(digest).read_text())
+        except (OSError, ValueError):
+            # Entry file lost or corrupt: forget it and re-parse
+            del self._entries[digest]
+            self._dirty = True
+            return None
+
+    def _touch(self, digest):
+        self._entries[digest]['last_used'] = time.time()
+        self._dirty = True
+
+    def lookup(self, notebook_path, hash_fallback=True):
+        """
+        Return cached content for a notebook without parsing it.
+
+        Args:
+            notebook_path: Path to notebook file (must exist)
+            hash_fallback: Hash the file when size/mtime do not match the index
+
+        Returns:
+            Cached content, or None on a miss
+        """
+        path = Path(notebook_path)
+        key = str(path.resolve())
+        stat = path.stat()
+
+        known = self._paths.get(key)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            content = self._read_entry(known['digest'])
+            if content is not None:
+                self.hits += 1
+                self._touch(known['digest'])
+                return content
+
+        if not hash_fallback:
+            return None
+        return self.lookup_digest(path, file_digest(path))
+
+    def lookup_digest(self, notebook_path, digest):
+        """
+        Return cached content by content hash, recording the path under it.
+
+        Args:
+            notebook_path: Path to notebook file
+            digest: SHA-256 of the file (see file_digest)
+
+        Returns:
+            Cached content, or None on a miss
+        """
+        self._remember_path(notebook_path, digest)
+        content = self._read_entry(digest)
+        if content is not None:
+            self.hits += 1
+            self._touch(digest)
+        return content
+
+    def known_digest(self, notebook_path):
+        """Content hash recorded for a notebook, if its size/mtime still match."""
+        path = Path(notebook_path)
+        known = self._paths.get(str(path.resolve()))
+        if known is None:
+            return None
+        stat = path.stat()
+        if known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['digest']
+        return None
+
+    def known_digests(self):
+        """Content hashes with a stored entry."""
+        return frozenset(self._entries)
+
+    def store(self, notebook_path, digest, content):
+        """
+        Store freshly parsed content (counts as a miss).
+
+        Args:
+            notebook_path: Path to notebook file
+            digest: SHA-256 of the file the content was parsed from
+            content: JSON-serializable content
+        """
+        self.misses += 1
+        self._remember_path(notebook_path, digest)
+        if digest in self._entries:
+            # Identical content parsed concurrently under another path
+            self._touch(digest)
+            return
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(digest)
+        write_atomic(entry_path, json.dumps(content, ensure_ascii=False))
+        self._entries[digest] = {'bytes': entry_path.stat().st_size, 'last_used': time.time()}
+
+    def _remember_path(self, notebook_path, digest):
+        path = Path(notebook_path)
+        stat = path.stat()
+        self._paths[str(path.resolve())] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+        self._dirty = True
+
+    def get_or_parse(self, notebook_path, parse):
+        """
+        Return cached content for a notebook, parsing it on a miss.
+
+        Args:
+            notebook_path: Path to notebook file (must exist)
+            parse: Callable taking the path and returning JSON-serializable content
+
+        Returns:
+            Parsed content (from cache or freshly parsed)
+        """
+        path = Path(notebook_path)
+        content = self.lookup(path, hash_fallback=False)
+        if content is not None:
+            return content
+
+        digest = file_digest(path)
+        content = self.lookup_digest(path, digest)
+        if content is not None:
+            return content
+
+        content = parse(path)
+        self.store(path, digest, content)
+        return content
+
+    def _evict(self):
+        total = sum(entry['bytes'] for entry in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        for digest in sorted(self._entries, key=lambda d: self._entries[d]['last_used']):
+            total -= self._entries.pop(digest)['bytes']
+            try:
+                self._entry_path(digest).unlink()
+            except OSError:
+                pass
+            if total <= self.max_bytes:
+                break
+        self._paths = {k: v for k, v in self._paths.items() if v['digest'] in self._entries}
+
+    def save(self):
+        """Evict over-limit entries and persist the index."""
+        if not self._dirty:
+            return
+        self._evict()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.index_path, json.dumps({
+            'version': CACHE_VERSION,
+            'paths': self._paths,
+            'entries': self._entries,
+        }, ensure_ascii=False))
+        self._dirty = False
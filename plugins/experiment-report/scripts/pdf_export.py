@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+PDF Export - Markdown report to PDF via pandoc + typst, with a build cache
+
+Runs the same conversion as `pandoc --pdf-engine=typst --template=report.typ`
+in two cached stages:
+    1. pandoc: markdown -> Typst body + document metadata
+       (keyed by the markdown content and pandoc version)
+    2. typst:  report.typ rendered with that body -> PDF
+       (keyed by stage 1, the template, every referenced image and the
+       typst version)
+
+A report whose markdown, template and figures are unchanged is skipped
+without starting either tool. A template-only change re-runs typst only.
+Templates using pandoc template features beyond variables, $if$ and $for$
+are rendered by pandoc instead (stage 1 then also depends on the template).
+
+Cache layout (next to each report):
+    .cache/pdf/index.json        output -> build key; asset fingerprints
+    .cache/pdf/typst/<key>.typ   pandoc output
+
+Usage:
+    pdf_export.py <input.md> [output.pdf] [--template <report.typ>] [--force] [--no-cache]
+    pdf_export.py <report1.md> <report2.md> ... [--force] [--no-cache]
+
+Examples:
+    pdf_export.py notebook/report/Report_Exp01-02_analysis.md
+    pdf_export.py notebook/report/Report_Exp01-02_analysis.md custom_output.pdf
+    pdf_export.py notebook/report/Report_*.md
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from atomic_write import write_atomic
+from parse_cache import file_digest
+
+
+# Bump when the cache layout or build key changes
+CACHE_VERSION = 1
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / 'assets' / 'templates' / 'report.typ'
+CACHE_DIRNAME = Path('.cache') / 'pdf'
+
+# -markdown-grid_tables avoids typst conversion errors on grid tables
+PANDOC_ARGS = ('-f', 'markdown-grid_tables', '-t', 'typst', '--standalone')
+
+_BODY_MARKER = '// pdf_export:body'
+_SPLIT_TEMPLATE = f'$meta-json$\n{_BODY_MARKER}\n$body$\n'
+
+_IMAGE_REFS = (
+    re.compile(r'!\[[^\]]*\]\(\s*<?([^)\s>]+)'),
+    re.compile(r'<img\b[^>]*?\bsrc\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE),
+)
+_URL = re.compile(r'^[a-z][a-z0-9+.-]*:', re.IGNORECASE)
+
+_TEMPLATE_TOKEN = re.compile(
+    r'\$\$'
+    r'|\$\{?(?P<block>if|for)\((?P<block_var>[\w-]+)\)\}?\$'
+    r'|\$\{?(?P<keyword>else|endif|endfor|sep)\}?\$'
+    r'|\$\{?(?P<var>[\w-]+)\}?\$'
+    r'|\$\{?[^$\n]*\}?\$'
+)
+
+
+class TemplateUnsupported(ValueError):
+    """The template needs pandoc's own renderer."""
+
+
+def _parse_template(text):
+    """Parse the pandoc template subset into nodes: str, ('var', name), ('if', name, then, else), ('for', name, body, sep)."""
+    stack = [('root', None, [], None)]
+    position = 0
+    for match in _TEMPLATE_TOKEN.finditer(text):
+        nodes = stack[-1][2] if stack[-1][3] is None else stack[-1][3]
+        nodes.append(text[position:match.start()])
+        position = match.end()
+        token = match.group()
+        if token == '$$':
+            nodes.append('$')
+        elif match.group('block'):
+            stack.append((match.group('block'), match.group('block_var'), [], None))
+        elif match.group('keyword'):
+            keyword = match.group('keyword')
+            kind, name, first, second = stack[-1]
+            if keyword in ('else', 'sep'):
+                if (kind, keyword) not in (('if', 'else'), ('for', 'sep')) or second is not None:
+                    raise TemplateUnsupported(f'unexpected ${keyword}$')
+                stack[-1] = (kind, name, first, [])
+            else:
+                if (kind, keyword) not in (('if', 'endif'), ('for', 'endfor')):
+                    raise TemplateUnsupported(f'unexpected ${keyword}$')
+                stack.pop()
+                parent = stack[-1][2] if stack[-1][3] is None else stack[-1][3]
+                parent.append((kind, name, first, second or []))
+        elif match.group('var'):
+            nodes.append(('var', match.group('var')))
+        else:
+            raise TemplateUnsupported(f'unsupported template syntax {token!r}')
+    if len(stack) != 1:
+        raise TemplateUnsupported(f'unclosed ${stack[-1][0]}$')
+    stack[0][2].append(text[position:])
+    return stack[0][2]
+
+
+def _value_text(value):
+    if isinstance(value, bool):
+        return 'true' if value else ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ''.join(_value_text(item) for item in value)
+    if value is None:
+        return ''
+    raise TemplateUnsupported('map-valued variable')
+
+
+def _render_nodes(nodes, variables):
+    out = []
+    for node in nodes:
+        if isinstance(node, str):
+            out.append(node)
+        elif node[0] == 'var':
+            out.append(_value_text(variables.get(node[1])))
+        elif node[0] == 'if':
+            value = variables.get(node[1])
+            out.append(_render_nodes(node[2] if value not in (None, False, '', [], {}) else node[3], variables))
+        else:
+            items = variables.get(node[1])
+            if items in (None, False, '', [], {}):
+                continue
+            items = items if isinstance(items, list) else [items]
+            rendered = [_render_nodes(node[2], {**variables, node[1]: item, 'it': item}) for item in items]
+            out.append(_render_nodes(node[3], variables).join(rendered) if node[3] else ''.join(rendered))
+    return ''.join(out)
+
+
+def render_template(template_text, variables):
+    """
+    Render a pandoc template using its variable, $if$ and $for$ subset.
+
+    Args:
+        template_text: Template source (e.g. report.typ)
+        variables: Document metadata plus 'body'
+
+    Returns:
+        Rendered text
+
+    Raises:
+        TemplateUnsupported: If the template uses other template features
+    """
+    return _render_nodes(_parse_template(template_text), variables)
+
+
+def referenced_assets(markdown, base_dir):
+    """Local images referenced by markdown image syntax or <img src>, resolved against base_dir."""
+    assets = set()
+    for pattern in _IMAGE_REFS:
+        for match in pattern.finditer(markdown):
+            ref = match.group(1)
+            if _URL.match(ref) or ref.startswith('#'):
+                continue
+            assets.add(str((base_dir / ref.split('#')[0]).resolve()))
+    return sorted(assets)
+
+
+def tool_versions(known=None):
+    """
+    Return {'pandoc': version line, 'typst': version line}; None for missing tools.
+
+    Args:
+        known: Optional dict of executable path -> {'size', 'mtime_ns',
+            'version'}; reused when the executable is unchanged and updated
+            otherwise, so up-to-date exports start no tool at all
+    """
+    known = {} if known is None else known
+    versions = {}
+    for tool in ('pandoc', 'typst'):
+        path = shutil.which(tool)
+        if path is None:
+            versions[tool] = None
+            continue
+        stat = os.stat(path)
+        entry = known.get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            versions[tool] = entry['version']
+            continue
+        result = subprocess.run([tool, '--version'], capture_output=True, text=True)
+        lines = result.stdout.strip().splitlines()
+        versions[tool] = lines[0] if lines else tool
+        known[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'version': versions[tool]}
+    return versions
+
+
+def _key(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class PdfBuildCache:
+    """
+    Build keys of exported PDFs, asset fingerprints and cached pandoc output.
+
+    Args:
+        cache_dir: Directory holding index.json and typst/
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / 'index.json'
+        self._outputs = {}
+        self._assets = {}
+        self.tools = {}
+        self._dirty = False
+        try:
+            index = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return
+        if index.get('version') == CACHE_VERSION:
+            self._outputs = index.get('outputs', {})
+            self._assets = index.get('assets', {})
+            self.tools = index.get('tools', {})
+
+    def asset_digest(self, path):
+        """SHA-256 of an asset, re-hashed only when its size or mtime changed (None if missing)."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        known = self._assets.get(path)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['digest']
+        digest = file_digest(path)
+        self._assets[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+        self._dirty = True
+        return digest
+
+    def is_current(self, output, build_key):
+        """True if output was built with build_key and has not changed since."""
+        known = self._outputs.get(str(output))
+        if not known or known['build_key'] != build_key:
+            return False
+        try:
+            stat = os.stat(output)
+        except OSError:
+            return False
+        return known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns
+
+    def record(self, output, build_key, stage_key):
+        """Remember the build key (and pandoc output used) of a freshly built PDF."""
+        stat = os.stat(output)
+        self._outputs[str(output)] = {'build_key': build_key, 'stage_key': stage_key,
+                                      'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        self._dirty = True
+
+    def stage_path(self, key):
+        return self.cache_dir / 'typst' / f'{key}.typ'
+
+    def store_stage(self, key, text):
+        path = self.stage_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, text)
+
+    def save(self):
+        """Persist the index and drop pandoc outputs no longer referenced."""
+        if not self._dirty:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        live = {entry['stage_key'] for entry in self._outputs.values()}
+        stage_dir = self.cache_dir / 'typst'
+        if stage_dir.is_dir():
+            for entry in os.scandir(stage_dir):
+                if entry.name.endswith('.typ') and entry.name[:-4] not in live:
+                    os.unlink(entry.path)
+        write_atomic(self.index_path, json.dumps({'version': CACHE_VERSION, 'outputs': self._outputs,
+                                                  'assets': self._assets, 'tools': self.tools}))
+        self._dirty = False
+
+
+def _run(command, cwd):
+    result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        message = (result.stderr or result.stdout).strip().splitlines()
+        raise RuntimeError(f"{Path(command[0]).name} failed: {message[-1] if message else f'exit {result.returncode}'}")
+    return result
+
+
+def _pandoc_stage(input_path, stage_key, mode, template_path, cache):
+    """
+    Return (pandoc output, ran_pandoc), from the cache when possible.
+
+    mode: 'split' (metadata + body, template rendered by render_template),
+    'template' (pandoc renders template_path) or 'default' (pandoc's own
+    typst template).
+    """
+    stage_path = cache.stage_path(stage_key) if cache is not None else None
+    if stage_path is not None and stage_path.exists():
+        return stage_path.read_text(encoding='utf-8'), False
+
+    command = ['pandoc', str(input_path), *PANDOC_ARGS]
+    split_path = input_path.with_name(f'.{input_path.stem}.{os.getpid()}.split.tpl')
+    if mode == 'split':
+        split_path.write_text(_SPLIT_TEMPLATE, encoding='utf-8')
+        command.append(f'--template={split_path}')
+    elif mode == 'template':
+        command.append(f'--template={template_path}')
+    try:
+        text = _run(command, input_path.parent).stdout
+    finally:
+        if split_path.exists():
+            split_path.unlink()
+    if cache is not None:
+        cache.store_stage(stage_key, text)
+    return text, True
+
+
+def _render_split(text, template_text):
+    """Render the template from split-mode pandoc output."""
+    meta_json, found, body = text.partition(f'\n{_BODY_MARKER}\n')
+    try:
+        variables = json.loads(meta_json)
+    except ValueError:
+        found = ''
+    if not found:
+        raise RuntimeError('unexpected pandoc output (metadata block not found)')
+    return render_template(template_text, {**variables, 'body': body.rstrip('\n')})
+
+
+def export_pdf(input_md, output_pdf=None, template=TEMPLATE_PATH, cache=None, force=False, versions=None):
+    """
+    Export one markdown report to PDF, reusing cached work where possible.
+
+    Args:
+        input_md: Markdown report path
+        output_pdf: Output path (default: input with .pdf suffix)
+        template: Pandoc template for typst (None for pandoc's default)
+        cache: Optional PdfBuildCache (None disables caching)
+        force: Re-run pandoc and typst even if the build key matches
+        versions: tool_versions() result (looked up if None)
+
+    Returns:
+        dict with 'input', 'output', 'status' ('built', 'typst-only',
+        'up-to-date' or 'failed'), 'seconds' and 'error'
+    """
+    start = time.perf_counter()
+    input_path = Path(input_md).resolve()
+    output_path = Path(output_pdf).resolve() if output_pdf else input_path.with_suffix('.pdf')
+    result = {'input': str(input_path), 'output': str(output_path), 'status': 'failed', 'seconds': 0.0, 'error': None}
+    versions = versions or tool_versions()
+
+    try:
+        markdown_bytes = input_path.read_bytes()
+        template_path = Path(template).resolve() if template else None
+        template_text = template_path.read_text(encoding='utf-8') if template_path else None
+        template_digest = hashlib.sha256(template_text.encode('utf-8')).hexdigest() if template_text else None
+
+        # Templates outside the supported subset go through pandoc
+        mode = 'default' if template_text is None else 'split'
+        if template_text is not None:
+            try:
+                _parse_template(template_text)
+            except TemplateUnsupported:
+                mode = 'template'
+
+        assets = referenced_assets(markdown_bytes.decode('utf-8', 'replace'), input_path.parent)
+        asset_digests = {path: cache.asset_digest(path) for path in assets} if cache is not None else {}
+        stage_key = _key(CACHE_VERSION, hashlib.sha256(markdown_bytes).hexdigest(), versions['pandoc'], PANDOC_ARGS,
+                         mode, template_digest if mode == 'template' else None)
+        build_key = _key(CACHE_VERSION, stage_key, template_digest, asset_digests, versions['typst'])
+        if cache is not None and not force and cache.is_current(output_path, build_key):
+            result['status'] = 'up-to-date'
+            return result
+
+        if force and cache is not None and cache.stage_path(stage_key).exists():
+            cache.stage_path(stage_key).unlink()
+        text, ran_pandoc = _pandoc_stage(input_path, stage_key, mode, template_path, cache)
+        typst_source = _render_split(text, template_text) if mode == 'split' else text
+
+        # Compile next to the report so relative image paths resolve as with
+        # pandoc; the root must contain every referenced image
+        root = os.path.commonpath([str(input_path.parent)] + [os.path.dirname(p) for p in assets if os.path.exists(p)])
+        build_path = input_path.with_name(f'.{input_path.stem}.{os.getpid()}.build.typ')
+        tmp_pdf = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp.pdf')
+        try:
+            build_path.write_text(typst_source, encoding='utf-8')
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            _run(['typst', 'compile', '--root', root, str(build_path), str(tmp_pdf)], input_path.parent)
+            os.replace(tmp_pdf, output_path)
+        finally:
+            for path in (build_path, tmp_pdf):
+                if path.exists():
+                    path.unlink()
+
+        if cache is not None:
+            cache.record(output_path, build_key, stage_key)
+        result['status'] = 'built' if ran_pandoc else 'typst-only'
+    except (OSError, UnicodeDecodeError, RuntimeError, TemplateUnsupported) as e:
+        result['error'] = str(e)
+    finally:
+        result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def sync_tool_versions(caches):
+    """
+    Look up pandoc/typst versions once for several build caches.
+
+    Args:
+        caches: PdfBuildCache objects (their cached versions are reused and refreshed)
+
+    Returns:
+        tool_versions() result
+    """
+    known_tools = {}
+    for cache in caches:
+        known_tools.update(cache.tools)
+    versions = tool_versions(known_tools)
+    for cache in caches:
+        if cache.tools != known_tools:
+            cache.tools = dict(known_tools)
+            cache._dirty = True
+    return versions
+
+
+def export_reports(inputs, output_pdf=None, template=TEMPLATE_PATH, use_cache=True, force=False):
+    """
+    Export several reports, sharing one build cache per report directory.
+
+    Args:
+        inputs: Markdown report paths
+        output_pdf: Output path (only with a single input)
+        template: Pandoc template for typst
+        use_cache: Skip unchanged reports and reuse pandoc output
+        force: Rebuild everything (still refreshes the cache)
+
+    Returns:
+        List of export_pdf results in input order
+    """
+    caches = {}
+    if use_cache:
+        for input_md in inputs:
+            directory = Path(input_md).resolve().parent
+            if directory not in caches:
+                caches[directory] = PdfBuildCache(directory / CACHE_DIRNAME)
+    versions = sync_tool_versions(caches.values())
+
+    results = []
+    for input_md in inputs:
+        cache = caches.get(Path(input_md).resolve().parent)
+        result = export_pdf(input_md, output_pdf, template, cache, force, versions)
+        results.append(result)
+        icon = {'up-to-date': '⏭️ ', 'failed': '❌'}.get(result['status'], '✅')
+        detail = result['error'] or result['output']
+        if result['status'] in ('built', 'typst-only'):
+            detail += f" ({os.path.getsize(result['output']) / 1024:.0f} KB)"
+        print(f"{icon} {Path(input_md).name}: {result['status']} ({result['seconds']:.2f}s) {detail}")
+    for cache in caches.values():
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write PDF build cache {cache.cache_dir}: {e}")
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    inputs = []
+    output_pdf = None
+    template = TEMPLATE_PATH
+    use_cache = True
+    force = False
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--template' and i + 1 < len(args):
+            template = Path(args[i + 1])
+            i += 2
+        elif args[i] == '--force':
+            force = True
+            i += 1
+        elif args[i] == '--no-cache':
+            use_cache = False
+            i += 1
+        elif args[i].endswith('.pdf') and not args[i].startswith('--'):
+            output_pdf = args[i]
+            i += 1
+        elif not args[i].startswith('--'):
+            inputs.append(args[i])
+            i += 1
+        else:
+            print(f"❌ Error: Unknown option: {args[i]}")
+            sys.exit(1)
+
+    if not inputs or (output_pdf and len(inputs) > 1):
+        print("Usage: pdf_export.py <input.md> [output.pdf] [--template <report.typ>] [--force] [--no-cache]")
+        print("       pdf_export.py <report1.md> <report2.md> ... [--force] [--no-cache]")
+        print()
+        print("Examples:")
+        print("  pdf_export.py notebook/report/Report_Exp01-02_analysis.md")
+        print("  pdf_export.py notebook/report/Report_Exp01-02_analysis.md custom_output.pdf")
+        print("  pdf_export.py notebook/report/Report_*.md")
+        sys.exit(1)
+
+    missing = [tool for tool in ('pandoc', 'typst') if shutil.which(tool) is None]
+    if missing:
+        print(f"❌ Error: Missing required tools: {' '.join(missing)}")
+        print()
+        print("Install with:")
+        print(f"  brew install {' '.join(missing)}")
+        sys.exit(1)
+
+    for input_md in inputs:
+        if not Path(input_md).is_file():
+            print(f"❌ Error: Input file not found: {input_md}")
+            sys.exit(1)
+    if template is not None and not Path(template).is_file():
+        print(f"⚠️  Warning: Template not found at {template}")
+        print("Using default pandoc + typst rendering")
+        template = None
+
+    results = export_reports(inputs, output_pdf, template, use_cache, force)
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    print()
+    print(f"📋 {len(results)} report(s): {', '.join(f'{n} {status}' for status, n in sorted(counts.items()))}")
+    sys.exit(1 if counts.get('failed') else 0)
+
+
+if __name__ == "__main__":
+    main()
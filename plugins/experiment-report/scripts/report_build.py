@@ -0,0 +1,825 @@
+#!/usr/bin/env python3
+"""
+Report Build - Make-style incremental build of reports, notebooks and PDFs
+
+Models a project's outputs as a dependency graph and rebuilds only what is
+out of date:
+
+    labnote ─→ extract:<labnote>  (sections/statistics in the parse cache)
+                      │
+    results/exp##/ ───┴─→ report:<report.md>  (update_report)
+                                 │
+    report.typ, images ──────────┴─→ pdf:<report.pdf>  (pdf_export)
+
+    labnote, notebook.typ ─→ labnote-pdf:<labnote.pdf>  (with --labnote-pdfs)
+
+Reports are the generated reports in notebook/report/ (their embedded
+state lists the labnotes they cover); every .md there gets a PDF target.
+Input fingerprints (content hashes, re-hashed only when size/mtime change)
+are stored in notebook/.cache/build.json. A target is rebuilt when it was
+never built, its output is missing or was changed, an input changed, or a
+dependency is rebuilt. Independent targets run in parallel; notebook
+parsing runs in a process pool. New reports are still created with
+init_report.py / batch_report.py.
+
+`watch` builds, then rebuilds whenever notebook/labnote/, notebook/report/,
+results/ or the templates change (see file_watch.py: inotify with one watch
+per directory, polling elsewhere). Bursts of writes such as Jupyter's
+autosave are debounced into one rebuild, and only the results
+subdirectories that changed are re-listed.
+
+Usage:
+    report_build.py build [<project_dir>] [<target> ...] [--dry-run] [--jobs N] [--labnote-pdfs] [--force]
+    report_build.py watch [<project_dir>] [<target> ...] [--jobs N] [--labnote-pdfs] [--poll] [--debounce S]
+    report_build.py graph [<project_dir>] [--labnote-pdfs]
+
+Targets are node names (e.g. pdf:Report_Exp01_rnaseq.pdf) or output paths;
+only they and their dependencies are considered.
+
+Examples:
+    report_build.py build --dry-run
+    report_build.py build --jobs 4 --labnote-pdfs
+    report_build.py build . pdf:Report_Exp01-03_integrated_analysis.pdf
+    report_build.py watch --labnote-pdfs
+    report_build.py graph
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from batch_report import ThreadOutput
+from file_watch import POLL_INTERVAL, collect_changes, open_watcher
+from init_report import parse_job, update_report
+from parse_cache import ParseCache, file_digest
+from pdf_export import CACHE_DIRNAME, TEMPLATE_PATH, PdfBuildCache, export_pdf, referenced_assets, sync_tool_versions
+from report_update import resolve_state_path, split_state
+from atomic_write import write_atomic
+
+# Labnote PDF conversion lives in the lab-notebook plugin
+LABNOTE_SCRIPTS = Path(__file__).resolve().parents[2] / 'lab-notebook' / 'scripts'
+if LABNOTE_SCRIPTS.is_dir() and str(LABNOTE_SCRIPTS) not in sys.path:
+    sys.path.append(str(LABNOTE_SCRIPTS))
+
+
+STATE_VERSION = 1
+STATE_PATH = Path('notebook') / '.cache' / 'build.json'
+REPORT_DIR = Path('notebook') / 'report'
+LABNOTE_DIR = Path('notebook') / 'labnote'
+RESULTS_DIR = Path('results')
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+MAX_REASONS = 5
+LOG_TAIL_LINES = 10
+DEBOUNCE_SECONDS = 1.0
+MAX_DEBOUNCE_SECONDS = 10.0
+
+_EXP_NAME = re.compile(r'^exp[-_ ]?(\d+)', re.IGNORECASE)
+
+
+def is_template(path):
+    """True for the scaffold's Exp00_* templates, which are not built."""
+    match = _EXP_NAME.match(Path(path).name)
+    return bool(match) and int(match.group(1)) == 0
+
+
+class Node:
+    """
+    One build target.
+
+    Args:
+        name: Unique target name ('<kind>:<output>')
+        inputs: Callable returning the input paths (files or directories);
+            called again after dependencies are rebuilt
+        outputs: Output paths (may be empty for cache-only targets)
+        action: Callable run to rebuild; returns a short status string
+        deps: Names of targets that must be built first
+        params: JSON-serializable settings that also invalidate the target
+        watch_outputs: Treat a changed (not just missing) output as stale
+        probe: Optional callable(input digests) checking the real output:
+            False when it is current whatever the record says, a reason
+            string when it is stale even if the record matches, else None
+    """
+
+    def __init__(self, name, inputs, outputs, action, deps=(), params=None, watch_outputs=True, probe=None):
+        self.name = name
+        self.inputs = inputs
+        self.outputs = [str(path) for path in outputs]
+        self.action = action
+        self.deps = list(deps)
+        self.params = params or {}
+        self.watch_outputs = watch_outputs
+        self.probe = probe
+
+
+class Fingerprints:
+    """
+    Content fingerprints of files and directory trees.
+
+    A file's recorded SHA-256 is reused while its size and mtime match, so
+    unchanged inputs are never read. A directory's fingerprint hashes the
+    relative path, size and mtime of every non-hidden file beneath it; it
+    is computed once and reused until invalidate() names a path inside.
+
+    Args:
+        known: path -> {'size', 'mtime_ns', 'digest'} from a previous build
+    """
+
+    def __init__(self, known=None):
+        self.known = dict(known or {})
+        self.trees = {}
+
+    def digest(self, path):
+        """Fingerprint of a file or directory (None if missing)."""
+        path = str(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if os.path.isdir(path):
+            if path not in self.trees:
+                self.trees[path] = self._tree_digest(path)
+            return self.trees[path]
+        known = self.known.get(path)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['digest']
+        digest = file_digest(path)
+        self.known[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+        return digest
+
+    def invalidate(self, paths):
+        """Forget directory fingerprints that contain (or are inside) any of paths."""
+        for root in list(self.trees):
+            prefix = root + os.sep
+            if any(path == root or path.startswith(prefix) or root.startswith(path + os.sep) for path in paths):
+                del self.trees[root]
+
+    @staticmethod
+    def _tree_digest(root):
+        listing = []
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+            for name in filenames:
+                if not name.startswith('.'):
+                    stat = os.stat(os.path.join(directory, name))
+                    listing.append((os.path.relpath(os.path.join(directory, name), root), stat.st_size,
+                                    stat.st_mtime_ns))
+        listing.sort()
+        return 'tree:' + hashlib.sha256(json.dumps(listing).encode('utf-8')).hexdigest()
+
+
+def _output_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class BuildState:
+    """
+    Fingerprints recorded by the last successful build of each target.
+
+    Args:
+        state_path: JSON file (notebook/.cache/build.json)
+    """
+
+    def __init__(self, state_path):
+        self.state_path = Path(state_path)
+        self.targets = {}
+        files = {}
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            state = {}
+        if state.get('version') == STATE_VERSION:
+            self.targets = state.get('targets', {})
+            files = state.get('files', {})
+        self.fingerprints = Fingerprints(files)
+
+    def record(self, node, inputs):
+        """Remember the inputs a target was just built from and its outputs."""
+        self.targets[node.name] = {
+            'params': node.params,
+            'inputs': inputs,
+            'outputs': {path: _output_stat(path) for path in node.outputs},
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def save(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.state_path, json.dumps({
+            'version': STATE_VERSION,
+            'targets': self.targets,
+            'files': self.fingerprints.known,
+        }, ensure_ascii=False))
+
+
+class BuildGraph:
+    """
+    Targets of one project and the caches their actions share.
+
+    Exp00_* templates in notebook/report/ and notebook/labnote/ get no
+    targets.
+
+    Args:
+        project_dir: Project root (contains notebook/)
+        labnote_pdfs: Also build a PDF next to every labnote
+        jobs: Worker processes for notebook parsing
+    """
+
+    def __init__(self, project_dir, labnote_pdfs=False, jobs=DEFAULT_WORKERS):
+        self.project_dir = Path(project_dir).resolve()
+        self.jobs = jobs
+        self.nodes = {}
+        self.parse_caches = {}
+        self.pdf_caches = {}
+        self.lock = threading.Lock()
+        self._parse_pool = None
+        self._pdf_versions = None
+        self._worker_dirs = None
+
+        report_dir = self.project_dir / REPORT_DIR
+        reports = sorted(report_dir.glob('*.md')) if report_dir.is_dir() else []
+        for report_path in reports:
+            if report_path.name.startswith('.') or is_template(report_path):
+                continue
+            _, state = split_state(report_path.read_text(encoding='utf-8'))
+            deps = []
+            if state is not None and state.get('notebooks'):
+                deps = [self._add_report(report_path, state['notebooks'])]
+            self._add_pdf(report_path, deps)
+        if labnote_pdfs:
+            self._add_labnote_pdfs()
+
+    def rel(self, path):
+        """Path relative to the project for display."""
+        try:
+            return os.path.relpath(path, self.project_dir)
+        except ValueError:
+            return str(path)
+
+    def _add(self, node):
+        self.nodes.setdefault(node.name, node)
+        return node.name
+
+    def _parse_cache(self, report_dir):
+        if report_dir not in self.parse_caches:
+            self.parse_caches[report_dir] = ParseCache(report_dir / '.cache')
+        return self.parse_caches[report_dir]
+
+    def _add_extract(self, labnote, report_dir):
+        cache = self._parse_cache(report_dir)
+
+        def probe(digests):
+            digest = digests.get(labnote)
+            if digest is None:
+                return 'labnote missing'  # never current; the action fails
+            # The parse cache is the real output; init_report may have filled it
+            return False if digest in cache.known_digests() else 'no cached extraction for this content'
+
+        return self._add(Node(f'extract:{self.rel(labnote)}', lambda: [labnote], [],
+                              lambda: self._extract(labnote, cache), probe=probe))
+
+    def _add_report(self, report_path, entries):
+        # State paths are relative to the report, so clones build their own files
+        report_dir = report_path.parent
+        labnotes = [str(resolve_state_path(entry['path'], report_dir)) for entry in entries]
+        results = sorted({str(resolve_state_path(entry['results'], report_dir))
+                          for entry in entries if entry.get('results')})
+        # A listed labnote that is missing gets a target too: it fails and
+        # blocks the report instead of the build reporting it up to date
+        deps = [self._add_extract(labnote, report_dir) for labnote in labnotes]
+        return self._add(Node(f'report:{report_path.name}', lambda: labnotes + results, [report_path],
+                              lambda: self._update_report(report_path, labnotes), deps, watch_outputs=False))
+
+    def _add_pdf(self, report_path, deps):
+        pdf_path = report_path.with_suffix('.pdf')
+        template = TEMPLATE_PATH if TEMPLATE_PATH.is_file() else None
+
+        def inputs():
+            text = report_path.read_text(encoding='utf-8', errors='replace') if report_path.exists() else ''
+            return [str(report_path)] + ([str(template)] if template else []) + \
+                referenced_assets(text, report_path.parent)
+
+        return self._add(Node(f'pdf:{pdf_path.name}', inputs, [pdf_path],
+                              lambda: self._export_pdf(report_path, pdf_path, template), deps,
+                              params={'template': str(template) if template else None}))
+
+    def _add_labnote_pdfs(self):
+        try:
+            from notebook_pdf_batch import TEMPLATE_PATH as NOTEBOOK_TEMPLATE, find_notebooks
+        except ImportError:
+            print("⚠️  Warning: Labnote PDFs need the lab-notebook plugin (notebook_pdf_batch.py); skipped")
+            return
+        labnote_dir = self.project_dir / LABNOTE_DIR
+        if not labnote_dir.is_dir():
+            return
+        template = NOTEBOOK_TEMPLATE if NOTEBOOK_TEMPLATE.is_file() else None
+        notebooks, _ = find_notebooks([str(labnote_dir)])
+        for notebook in notebooks:
+            if is_template(notebook):
+                continue
+            pdf_path = notebook.with_suffix('.pdf')
+            inputs = [str(notebook)] + ([str(template)] if template else [])
+            self._add(Node(f'labnote-pdf:{pdf_path.name}', lambda inputs=inputs: inputs, [pdf_path],
+                           lambda notebook=notebook, pdf_path=pdf_path: self._convert_labnote(notebook, pdf_path,
+                                                                                             template),
+                           params={'template': str(template) if template else None}))
+
+    # Actions (run on worker threads)
+
+    def _extract(self, labnote, cache):
+        if not os.path.isfile(labnote):
+            raise RuntimeError(f'labnote listed in the report state is missing: {self.rel(labnote)}')
+        known_digests = cache.known_digests()
+        if self._parse_pool is not None:
+            digest, content, error = self._parse_pool.submit(parse_job, labnote, known_digests).result()
+        else:
+            digest, content, error = parse_job(labnote, known_digests)
+        if error is not None:
+            raise RuntimeError(error)
+        with self.lock:
+            if content is None:
+                cache.lookup_digest(labnote, digest)
+                return 'cached'
+            cache.store(labnote, digest, content)
+        return 'extracted'
+
+    def _update_report(self, report_path, labnotes):
+        # Notebooks were parsed by the extract targets; persist them so
+        # update_report's own cache instance hits
+        with self.lock:
+            self._parse_cache(report_path.parent).save()
+        before = _output_stat(report_path)
+        if update_report(report_path, labnotes, jobs=1) is None:
+            raise RuntimeError('report update failed (see log)')
+        return 'updated' if _output_stat(report_path) != before else 'up-to-date'
+
+    def _export_pdf(self, report_path, pdf_path, template):
+        report_dir = report_path.parent
+        with self.lock:
+            if report_dir not in self.pdf_caches:
+                self.pdf_caches[report_dir] = PdfBuildCache(report_dir / CACHE_DIRNAME)
+            cache = self.pdf_caches[report_dir]
+            if self._pdf_versions is None:
+                self._pdf_versions = sync_tool_versions([cache])
+        result = export_pdf(report_path, pdf_path, template, cache, versions=self._pdf_versions)
+        if result['error']:
+            raise RuntimeError(result['error'])
+        return result['status']
+
+    def _convert_labnote(self, notebook, pdf_path, template):
+        from notebook_pdf_batch import convert_notebook
+        result = convert_notebook(notebook, pdf_path, self._worker_dirs.get(), template=template)
+        if result['error']:
+            print(result['log'])
+            raise RuntimeError(result['error'])
+        return result['status']
+
+    def __enter__(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix='report_build_')
+        try:
+            from notebook_pdf_batch import WorkerDirs
+            self._worker_dirs = WorkerDirs(self._tmp.name)
+        except ImportError:
+            pass
+        if self.jobs > 1:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.jobs)
+        return self
+
+    def __exit__(self, *exc):
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+        for cache in list(self.parse_caches.values()) + list(self.pdf_caches.values()):
+            try:
+                cache.save()
+            except OSError as e:
+                print(f"⚠️  Warning: Could not write cache {cache.cache_dir}: {e}")
+        self._tmp.cleanup()
+
+    def select(self, targets):
+        """
+        Names of the given targets and everything they depend on.
+
+        Args:
+            targets: Node names or output paths (empty selects everything)
+
+        Raises:
+            ValueError: If a target matches no node
+        """
+        if not targets:
+            return list(self.nodes)
+        by_output = {output: name for name, node in self.nodes.items() for output in node.outputs}
+        selected = {}
+        stack = []
+        for target in targets:
+            name = target if target in self.nodes else by_output.get(str(Path(target).resolve()))
+            if name is None:
+                raise ValueError(f"Unknown target: {target}")
+            stack.append(name)
+        while stack:
+            name = stack.pop()
+            if name not in selected:
+                selected[name] = True
+                stack.extend(self.nodes[name].deps)
+        return [name for name in self.nodes if name in selected]
+
+
+def order(graph, names):
+    """Names sorted so every target comes after its dependencies."""
+    ordered = []
+    done = set()
+
+    def visit(name):
+        if name in done:
+            return
+        done.add(name)
+        for dep in graph.nodes[name].deps:
+            visit(dep)
+        ordered.append(name)
+
+    for name in names:
+        visit(name)
+    return ordered
+
+
+def explain(graph, state, names, force=False):
+    """
+    Decide which targets are out of date and why.
+
+    Args:
+        graph: BuildGraph
+        state: BuildState of the previous build
+        names: Target names to consider
+        force: Treat every target as out of date
+
+    Returns:
+        dict mapping each stale target name to its list of reasons
+        (dependency order)
+    """
+    stale = {}
+    for name in order(graph, names):
+        node = graph.nodes[name]
+        record = state.targets.get(name)
+        reasons = []
+        if force:
+            reasons.append('forced rebuild')
+        stale_deps = [dep for dep in node.deps if dep in stale]
+        reasons.extend(f'depends on {dep}, which will be rebuilt' for dep in stale_deps)
+
+        inputs = {path: state.fingerprints.digest(path) for path in node.inputs()}
+        probe = node.probe(inputs) if node.probe is not None else None
+        # Reasons from the record (ignored when the probe finds the output current)
+        recorded = []
+        if probe is not False and record is None:
+            recorded.append(probe or 'never built')
+        elif probe is not False:
+            if record['params'] != node.params:
+                recorded.append('settings changed')
+            for path in node.outputs:
+                now = _output_stat(path)
+                if now is None:
+                    recorded.append(f'output missing: {graph.rel(path)}')
+                elif node.watch_outputs and now != record['outputs'].get(path):
+                    recorded.append(f'output changed since last build: {graph.rel(path)}')
+            for path, digest in inputs.items():
+                if path not in record['inputs']:
+                    recorded.append(f'new input: {graph.rel(path)}')
+                elif digest is None and record['inputs'][path] is not None:
+                    recorded.append(f'input missing: {graph.rel(path)}')
+                elif digest != record['inputs'][path]:
+                    recorded.append(f'changed: {graph.rel(path)}')
+            recorded.extend(f'input dropped: {graph.rel(path)}' for path in record['inputs'] if path not in inputs)
+        reasons.extend(recorded or ([probe] if probe else []))
+        if reasons:
+            stale[name] = reasons
+    return stale
+
+
+def _run_node(node, state, output):
+    log = io.StringIO()
+    output.local.buffer = log
+    start = time.perf_counter()
+    status = error = None
+    try:
+        status = node.action()
+        # Record what the target was built from (dependencies are done now)
+        inputs = {path: state.fingerprints.digest(path) for path in node.inputs()}
+        state.record(node, inputs)
+    except Exception as e:  # keep the build going; the failure is in the summary
+        error = str(e) if isinstance(e, RuntimeError) else f'{type(e).__name__}: {e}'
+    finally:
+        output.local.buffer = None
+    return {
+        'target': node.name,
+        'status': 'failed' if error else status,
+        'seconds': round(time.perf_counter() - start, 3),
+        'error': error,
+        'log': log.getvalue(),
+    }
+
+
+def run_build(graph, state, stale, workers=DEFAULT_WORKERS):
+    """
+    Rebuild stale targets, each as soon as its dependencies are done.
+
+    A failed target's dependents are skipped ('blocked'); independent
+    targets still run.
+
+    Args:
+        graph: BuildGraph (entered, so its pools exist)
+        state: BuildState updated for every successful target
+        stale: explain() result
+        workers: Maximum concurrent targets
+
+    Returns:
+        List of result dicts ('target', 'status', 'seconds', 'error', 'log')
+        in completion order
+    """
+    waiting = {name: {dep for dep in graph.nodes[name].deps if dep in stale} for name in stale}
+    results = []
+    failed = set()
+    output = ThreadOutput(sys.stdout)
+    real_stdout, sys.stdout = sys.stdout, output
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            running = {}
+            while waiting or running:
+                for name in [name for name, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    running[executor.submit(_run_node, graph.nodes[name], state, output)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = future.result()
+                    results.append(result)
+                    icon = '❌' if result['status'] == 'failed' else '✅'
+                    detail = result['error'] or result['status']
+                    real_stdout.write(f"{icon} [{len(results)}/{len(stale)}] {name}: {detail} ({result['seconds']:.2f}s)\n")
+                    if result['status'] == 'failed':
+                        failed.add(name)
+                    for deps in waiting.values():
+                        deps.discard(name)
+                    # Dependents of a failed target cannot be built (transitively)
+                    for other in order(graph, list(waiting)):
+                        if not failed & set(graph.nodes[other].deps):
+                            continue
+                        del waiting[other]
+                        failed.add(other)
+                        results.append({'target': other, 'status': 'blocked', 'seconds': 0.0,
+                                        'error': f"dependency failed: {', '.join(sorted(failed & set(graph.nodes[other].deps)))}",
+                                        'log': ''})
+                        real_stdout.write(f"⏭️  [{len(results)}/{len(stale)}] {other}: blocked\n")
+                    real_stdout.flush()
+    finally:
+        sys.stdout = real_stdout
+    return results
+
+
+def print_plan(graph, stale, considered):
+    """Print each out-of-date target with the reasons it will be rebuilt."""
+    print(f"📋 Build plan: {len(stale)} of {considered} target(s) out of date")
+    for name, reasons in stale.items():
+        print(f"   {name}")
+        for reason in reasons[:MAX_REASONS]:
+            print(f"      - {reason}")
+        if len(reasons) > MAX_REASONS:
+            print(f"      - … and {len(reasons) - MAX_REASONS} more")
+    if considered > len(stale):
+        print(f"⏭️  {considered - len(stale)} target(s) up to date")
+
+
+def print_graph(graph):
+    """Print every target with its outputs and dependencies."""
+    for name in order(graph, graph.nodes):
+        node = graph.nodes[name]
+        outputs = ', '.join(graph.rel(path) for path in node.outputs) or '(parse cache)'
+        print(f"{name}  →  {outputs}")
+        for dep in node.deps:
+            print(f"   ↳ {dep}")
+
+
+def print_summary(results, wall_seconds):
+    """Print the per-target table, totals, and log tails of failed targets."""
+    print()
+    print("📋 Build summary")
+    width = max(len(result['target']) for result in results)
+    for result in results:
+        print(f"   {result['status']:<11} {result['seconds']:>7.2f}s  {result['target']:<{width}}  {result['error'] or ''}")
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    print()
+    print(f"   {len(results)} target(s): {', '.join(f'{n} {status}' for status, n in sorted(counts.items()))}")
+    print(f"   Wall time {wall_seconds:.2f}s (sum of target times {sum(r['seconds'] for r in results):.2f}s)")
+
+    for result in results:
+        if result['status'] != 'failed':
+            continue
+        print()
+        print(f"❌ {result['target']}: {result['error']}")
+        for line in result['log'].rstrip().splitlines()[-LOG_TAIL_LINES:]:
+            print(f"   {line}")
+
+
+def build(graph, state, targets=(), workers=DEFAULT_WORKERS, force=False, dry_run=False):
+    """
+    Explain and rebuild out-of-date targets.
+
+    Args:
+        graph: BuildGraph
+        state: BuildState (saved after building)
+        targets: Target names or output paths (empty: everything)
+        workers: Maximum concurrent targets
+        force: Rebuild every selected target
+        dry_run: Only print the plan
+
+    Returns:
+        run_build results (empty when nothing was built)
+
+    Raises:
+        ValueError: If a target matches no node
+    """
+    names = graph.select(targets)
+    stale = explain(graph, state, names, force)
+    print_plan(graph, stale, len(names))
+    if not stale:
+        print("✅ Everything is up to date")
+    if dry_run or not stale:
+        return []
+
+    print()
+    print(f"🚀 Building {len(stale)} target(s) with up to {min(workers, len(stale))} worker(s)")
+    start = time.perf_counter()
+    with graph:
+        results = run_build(graph, state, stale, workers)
+    wall_seconds = time.perf_counter() - start
+    try:
+        state.save()
+    except OSError as e:
+        print(f"⚠️  Warning: Could not write build state: {e}")
+    print_summary(results, wall_seconds)
+    return results
+
+
+def _own_outputs(state, paths):
+    """Paths that are outputs this build wrote and that are unchanged since."""
+    recorded = {path: stat for target in state.targets.values() for path, stat in target['outputs'].items()}
+    return {path for path in paths if path in recorded and recorded[path] == _output_stat(path)}
+
+
+def watch(project_dir, targets=(), labnote_pdfs=False, workers=DEFAULT_WORKERS, poll=False,
+          debounce=DEBOUNCE_SECONDS):
+    """
+    Build, then rebuild after every burst of changes until interrupted.
+
+    Args:
+        project_dir: Project root
+        targets: Target names or output paths (empty: everything)
+        labnote_pdfs: Also build labnote PDFs
+        workers: Maximum concurrent targets
+        poll: Poll instead of using inotify
+        debounce: Quiet period (seconds) that ends a burst of changes
+    """
+    project_dir = Path(project_dir).resolve()
+    state = BuildState(project_dir / STATE_PATH)
+    graph = BuildGraph(project_dir, labnote_pdfs, workers)
+    try:
+        build(graph, state, targets, workers)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+
+    roots = [(project_dir / LABNOTE_DIR, False), (project_dir / REPORT_DIR, False), (project_dir / RESULTS_DIR, True),
+             (TEMPLATE_PATH.parent, False)]
+    if labnote_pdfs:
+        roots.append((LABNOTE_SCRIPTS.parent / 'assets' / 'templates', False))
+    watcher = open_watcher([(str(root), recursive) for root, recursive in roots], poll, POLL_INTERVAL)
+    print()
+    print(f"👀 Watching {watcher.watches} director(ies) with {watcher.method}; Ctrl-C to stop")
+    try:
+        while True:
+            changed = collect_changes(watcher, debounce, MAX_DEBOUNCE_SECONDS)
+            changed -= _own_outputs(state, changed)
+            if not changed:
+                continue
+            state.fingerprints.invalidate(changed)
+            names = sorted(graph.rel(path) for path in changed)
+            more = f" (+{len(names) - 3} more)" if len(names) > 3 else ''
+            print()
+            print(f"🔄 [{datetime.now():%H:%M:%S}] {len(names)} change(s): {', '.join(names[:3])}{more}")
+            # Rebuild the graph: reports may have been added or regenerated
+            graph = BuildGraph(project_dir, labnote_pdfs, workers)
+            try:
+                build(graph, state, targets, workers)
+            except ValueError as e:
+                print(f"⚠️  Warning: {e}")
+            print()
+            print("👀 Watching for changes")
+    except KeyboardInterrupt:
+        print()
+        print("⏹️  Stopped watching")
+    finally:
+        watcher.close()
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('build', 'watch', 'graph'):
+        print("Usage: report_build.py build [<project_dir>] [<target> ...] [--dry-run] [--jobs N] [--labnote-pdfs] [--force]")
+        print("       report_build.py watch [<project_dir>] [<target> ...] [--jobs N] [--labnote-pdfs] [--poll] [--debounce S]")
+        print("       report_build.py graph [<project_dir>] [--labnote-pdfs]")
+        print()
+        print("Examples:")
+        print("  report_build.py build --dry-run")
+        print("  report_build.py build --jobs 4 --labnote-pdfs")
+        print("  report_build.py build . pdf:Report_Exp01-03_integrated_analysis.pdf")
+        print("  report_build.py watch --labnote-pdfs")
+        sys.exit(1)
+
+    command = args[0]
+    positional = []
+    dry_run = force = labnote_pdfs = poll = False
+    workers = DEFAULT_WORKERS
+    debounce = DEBOUNCE_SECONDS
+    i = 1
+    while i < len(args):
+        if args[i] == '--jobs' and i + 1 < len(args):
+            try:
+                workers = int(args[i + 1])
+            except ValueError:
+                workers = 0
+            if workers < 1:
+                print(f"❌ Error: --jobs must be a positive integer (got {args[i + 1]})")
+                sys.exit(1)
+            i += 2
+        elif args[i] == '--debounce' and i + 1 < len(args):
+            try:
+                debounce = float(args[i + 1])
+            except ValueError:
+                debounce = -1
+            if debounce < 0:
+                print(f"❌ Error: --debounce must be a number of seconds (got {args[i + 1]})")
+                sys.exit(1)
+            i += 2
+        elif args[i] == '--dry-run':
+            dry_run = True
+            i += 1
+        elif args[i] == '--force':
+            force = True
+            i += 1
+        elif args[i] == '--labnote-pdfs':
+            labnote_pdfs = True
+            i += 1
+        elif args[i] == '--poll':
+            poll = True
+            i += 1
+        elif args[i].startswith('--'):
+            print(f"❌ Error: Unknown option: {args[i]}")
+            sys.exit(1)
+        else:
+            positional.append(args[i])
+            i += 1
+
+    project_dir = Path.cwd()
+    if positional and Path(positional[0]).is_dir():
+        project_dir = Path(positional.pop(0))
+    if not (project_dir / 'notebook').is_dir():
+        print(f"❌ Error: No notebook/ directory in {project_dir.resolve()}")
+        sys.exit(1)
+
+    if command == 'watch':
+        watch(project_dir, positional, labnote_pdfs, workers, poll, debounce)
+        return
+
+    graph = BuildGraph(project_dir, labnote_pdfs, workers)
+    if command == 'graph':
+        print_graph(graph)
+        return
+    if not graph.nodes:
+        print("✅ Nothing to build (no reports in notebook/report/)")
+        return
+
+    state = BuildState(graph.project_dir / STATE_PATH)
+    try:
+        results = build(graph, state, positional, workers, force, dry_run)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        print("💡 Tip: List targets with: report_build.py graph")
+        sys.exit(1)
+    sys.exit(1 if any(result['status'] in ('failed', 'blocked') for result in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Report Update - Locates and patches generated parts of an existing report
+
+init_report.py embeds a state comment at the end of every report it writes:
+per-notebook fingerprints plus hashes of the finding block and table rows
+it generated. `init_report.py --update` uses that state to regenerate only
+the parts belonging to new or changed notebooks. A generated part whose
+hash no longer matches has been edited by hand and is left untouched.
+
+Notebook and results paths in the state are relative to the report's
+directory (POSIX form), so a committed report keeps working in clones,
+copies and moved checkouts of the project.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+from pathlib import Path
+
+
+# 2: paths relative to the report directory (1 stored absolute paths)
+STATE_VERSION = 2
+STATE_MARKER = 'init_report:state'
+
+# Report tables with one or more generated rows per notebook (keys match
+# the REPORT_TEMPLATE placeholders)
+TABLE_HEADERS = {
+    'hypotheses_rows': '| ID | Hypothesis | Source Experiment | Status |',
+    'data_sources_rows': '| Dataset | Version/Date | Source | Experiments Used |',
+    'hypothesis_eval_rows': '| Hypothesis | Verdict | Evidence Summary | Confidence |',
+    'notebooks_table': '| Experiment | Notebook Path | Status | Key Outputs |',
+    'figures_table': '| Figure | Path | Description | Used In |',
+}
+
+# Generated line endings that depend on the whole notebook list (format with the value)
+MANAGED_LINES = {
+    'experiments_list': ('**Experiments Covered**: {}',),
+    'labnote_paths_cmd': ('--labnote {} --output notebook/report/',),
+    'num_notebooks': (
+        '<!-- Synthesize background from {} notebook(s) -->',
+        '<!-- Consolidate methods from {} notebook(s) -->',
+    ),
+}
+
+FINDINGS_GATE = '<!-- Quality Gate: Findings'
+
+_STATE = re.compile(r'\n?<!-- ' + re.escape(STATE_MARKER) + r'\n(.*?)\n-->\n?', re.DOTALL)
+_FINDING_HEADING = re.compile(r'^### Finding (\d+):')
+_FIGURE_NUMBER = re.compile(r'^\| Fig (\d+) \|')
+
+
+def text_hash(text):
+    """Short hash identifying a generated block or row."""
+    return hashlib.sha1(text.rstrip().encode('utf-8')).hexdigest()[:16]
+
+
+def render_state(state):
+    """Render report state as a trailing HTML comment (ignored by pandoc)."""
+    return f'\n<!-- {STATE_MARKER}\n{json.dumps(state, ensure_ascii=False, sort_keys=True)}\n-->\n'
+
+
+def state_path(path, report_dir):
+    """Path as recorded in the state: relative to report_dir, POSIX separators."""
+    return Path(os.path.relpath(Path(path).resolve(), Path(report_dir).resolve())).as_posix()
+
+
+def resolve_state_path(value, report_dir):
+    """Absolute path of a path recorded in the state (None stays None)."""
+    if value is None:
+        return None
+    return (Path(report_dir) / value).resolve()
+
+
+def _migrate_v1(state):
+    """
+    Version 1 recorded absolute paths of the checkout that wrote the report.
+
+    Those may belong to another clone, so they are not trusted: each
+    notebook is taken from its link in the report (relative_path, e.g.
+    ../labnote/Exp01_x.ipynb) and its results directory keeps its old
+    position relative to the notebook.
+    """
+    for entry in state.get('notebooks') or []:
+        old_path = entry.pop('path')
+        old_results = entry.pop('results_abs', None)
+        entry['path'] = entry['relative_path']
+        entry['results'] = None
+        if old_results:
+            relative = os.path.relpath(old_results, os.path.dirname(old_path))
+            entry['results'] = posixpath.normpath(
+                posixpath.join(posixpath.dirname(entry['path']), Path(relative).as_posix()))
+    state['version'] = STATE_VERSION
+    return state
+
+
+def split_state(text):
+    """
+    Separate the state comment from report text.
+
+    Version 1 state is migrated to the current format.
+
+    Returns:
+        (text without state, state dict or None)
+    """
+    match = _STATE.search(text)
+    if match is None:
+        return text, None
+    try:
+        state = json.loads(match.group(1))
+    except ValueError:
+        return text, None
+    if state.get('version') == 1:
+        state = _migrate_v1(state)
+    if state.get('version') != STATE_VERSION:
+        return text, None
+    return text[:match.start()] + text[match.end():], state
+
+
+class ReportDocument:
+    """
+    Line-oriented view of a report for in-place edits of generated parts.
+
+    Args:
+        text: Report markdown (without state comment)
+    """
+
+    def __init__(self, text):
+        self.lines = text.split('\n')
+
+    def text(self):
+        return '\n'.join(self.lines)
+
+    def _table_rows(self, key):
+        """Return (first_row, end) line indices of a table's body, or None."""
+        header = TABLE_HEADERS[key]
+        try:
+            start = self.lines.index(header) + 2  # skip separator row
+        except ValueError:
+            return None
+        end = start
+        while end < len(self.lines) and self.lines[end].startswith('|'):
+            end += 1
+        return start, end
+
+    def replace_rows(self, key, offset, old_hashes, new_rows):
+        """
+        Replace a notebook's generated rows if none were edited by hand.
+
+        Rows are matched in place, not by searching the table: notebooks
+        without an experiment number generate byte-identical rows, so a
+        hash alone does not tell whose row it is.
+
+        Args:
+            key: TABLE_HEADERS key
+            offset: Index of the notebook's first row in the table body
+            old_hashes: text_hash of each generated row, in order
+            new_rows: Replacement rows
+
+        Returns:
+            True if replaced, False if the rows were edited or not found
+        """
+        bounds = self._table_rows(key)
+        if bounds is None or not old_hashes:
+            return False
+        first = bounds[0] + offset
+        last = first + len(old_hashes)
+        if last > bounds[1] or [text_hash(line) for line in self.lines[first:last]] != list(old_hashes):
+            return False
+        self.lines[first:last] = new_rows
+        return True
+
+    def append_rows(self, key, rows):
+        """Append rows at the end of a table. Returns False if the table is missing."""
+        bounds = self._table_rows(key)
+        if bounds is None:
+            return False
+        self.lines[bounds[1]:bounds[1]] = rows
+        return True
+
+    def max_figure_number(self):
+        bounds = self._table_rows('figures_table')
+        if bounds is None:
+            return 0
+        numbers = [int(m.group(1)) for m in map(_FIGURE_NUMBER.match, self.lines[bounds[0]:bounds[1]]) if m]
+        return max(numbers, default=0)
+
+    def _finding_bounds(self, num):
+        """Return (start, end) of Finding num's content lines, or None."""
+        for start, line in enumerate(self.lines):
+            match = _FINDING_HEADING.match(line)
+            if match and int(match.group(1)) == num:
+                break
+        else:
+            return None
+        end = start + 1
+        while end < len(self.lines) and not (
+                _FINDING_HEADING.match(self.lines[end]) or self.lines[end].startswith(FINDINGS_GATE)):
+            end += 1
+        while end > start and not self.lines[end - 1].strip():
+            end -= 1
+        return start, end
+
+    def replace_finding(self, num, old_hash, finding):
+        """
+        Replace a generated finding if it was not edited by hand.
+
+        Returns:
+            True if replaced
+        """
+        bounds = self._finding_bounds(num)
+        if bounds is None:
+            return False
+        start, end = bounds
+        if text_hash('\n'.join(self.lines[start:end])) != old_hash:
+            return False
+        self.lines[start:end] = finding.rstrip().split('\n')
+        return True
+
+    def append_finding(self, finding):
+        """Insert a finding before the Findings quality gate. Returns False if no gate."""
+        for gate, line in enumerate(self.lines):
+            if line.startswith(FINDINGS_GATE):
+                break
+        else:
+            return False
+        end = gate
+        while end > 0 and not self.lines[end - 1].strip():
+            end -= 1
+        self.lines[end:end] = [''] + finding.rstrip().split('\n')
+        return True
+
+    def replace_line(self, key, old_value, new_value):
+        """
+        Replace managed lines that still hold the generated value.
+
+        Returns:
+            True if at least one line was replaced
+        """
+        replaced = False
+        for line_format in MANAGED_LINES[key]:
+            old_end = line_format.format(old_value)
+            for i, line in enumerate(self.lines):
+                if line.endswith(old_end):
+                    self.lines[i] = line[:len(line) - len(old_end)] + line_format.format(new_value)
+                    replaced = True
+                    break
+        return replaced
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Results Index - Figure/table index of results/exp## directories
+
+Builds one index per report run from a single os.scandir walk over each
+experiment's results directory: file names, sizes, mtimes, and image
+dimensions read from file headers only (PNG, JPEG, GIF, SVG). Dimensions
+are cached by path + size + mtime, so later runs only open new or changed
+images.
+
+Usage:
+    results_index.py <results_dir> [results_dir ...] [--cache <index.json>]
+
+Examples:
+    results_index.py results/exp01 results/exp02
+    results_index.py results/exp01 --cache notebook/report/.cache/results_index.json
+"""
+
+import json
+import os
+import re
+import struct
+import sys
+from pathlib import Path
+
+from atomic_write import write_atomic
+
+
+FIGURE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.pdf', '.tif', '.tiff')
+TABLE_SUFFIXES = ('.csv', '.tsv', '.xlsx', '.xls', '.parquet', '.feather')
+
+# Bump when the cached entry format changes
+INDEX_VERSION = 1
+
+_SVG_SIZE_BYTES = 4096
+_SVG_ATTR = re.compile(rb'\b(width|height|viewBox)\s*=\s*["\']([^"\']+)["\']')
+_SVG_LENGTH = re.compile(rb'^\s*([0-9.]+)\s*(px)?\s*$')
+
+
+def _png_size(f):
+    header = f.read(24)
+    if len(header) == 24 and header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    return None
+
+
+def _gif_size(f):
+    header = f.read(10)
+    if len(header) == 10 and header[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', header[6:10])
+    return None
+
+
+def _jpeg_size(f):
+    if f.read(2) != b'\xff\xd8':
+        return None
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue  # standalone markers carry no length
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        # SOF0-SOF15 except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack('>HH', data[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _svg_length(value):
+    match = _SVG_LENGTH.match(value)
+    return round(float(match.group(1))) if match else None
+
+
+def _svg_size(f):
+    attrs = {}
+    for name, value in _SVG_ATTR.findall(f.read(_SVG_SIZE_BYTES)):
+        attrs.setdefault(name, value)
+    width = _svg_length(attrs.get(b'width', b''))
+    height = _svg_length(attrs.get(b'height', b''))
+    if width and height:
+        return width, height
+    box = attrs.get(b'viewBox', b'').replace(b',', b' ').split()
+    if len(box) == 4:
+        try:
+            return round(float(box[2])), round(float(box[3]))
+        except ValueError:
+            return None
+    return None
+
+
+_SIZE_READERS = {
+    '.png': _png_size,
+    '.gif': _gif_size,
+    '.jpg': _jpeg_size,
+    '.jpeg': _jpeg_size,
+    '.svg': _svg_size,
+}
+
+
+def image_size(path):
+    """
+    Read image dimensions from the file header without decoding the image.
+
+    Args:
+        path: Image file path
+
+    Returns:
+        (width, height) in pixels, or None if unknown/unsupported
+    """
+    reader = _SIZE_READERS.get(Path(path).suffix.lower())
+    if reader is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            size = reader(f)
+    except (OSError, struct.error, ValueError):
+        return None
+    return tuple(size) if size else None
+
+
+def _walk(root):
+    """Yield (relative_path, DirEntry) for files under root in one scandir pass per directory."""
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, relative_dir)) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    relative = f'{relative_dir}/{entry.name}' if relative_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(relative)
+                    elif entry.is_file():
+                        yield relative, entry
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+
+class ResultsIndex:
+    """
+    Figure/table index over results directories with a dimensions cache.
+
+    Args:
+        cache_path: Optional JSON file to persist the index between runs
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.headers_read = 0
+        self._cache = {}
+        if self.cache_path is not None:
+            try:
+                data = json.loads(self.cache_path.read_text())
+                if data.get('version') == INDEX_VERSION:
+                    self._cache = data.get('files', {})
+            except (OSError, ValueError):
+                pass
+        self._seen = {}
+        self._roots = []
+
+    def scan(self, results_dir):
+        """
+        Index one results directory.
+
+        Args:
+            results_dir: Path to results/exp## directory
+
+        Returns:
+            dict with 'figures' and 'tables': lists of dicts with 'path'
+            (relative to results_dir), 'size', 'mtime', 'width', 'height'
+        """
+        root = Path(results_dir).resolve()
+        self._roots.append(f'{root}/')
+        figures = []
+        tables = []
+
+        for relative, entry in _walk(root):
+            suffix = '.' + entry.name.rpartition('.')[2].lower()
+            if suffix in FIGURE_SUFFIXES:
+                kind = figures
+            elif suffix in TABLE_SUFFIXES:
+                kind = tables
+            else:
+                continue
+
+            stat = entry.stat()
+            key = f'{root}/{relative}'
+            cached = self._cache.get(key)
+            if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                width, height = cached[2], cached[3]
+            elif kind is figures:
+                size = image_size(entry.path)
+                self.headers_read += 1 if suffix in _SIZE_READERS else 0
+                width, height = size if size else (None, None)
+            else:
+                width, height = None, None
+            self._seen[key] = [stat.st_size, stat.st_mtime_ns, width, height]
+
+            kind.append({
+                'path': relative,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'width': width,
+                'height': height,
+            })
+
+        # Plain string order: results follow the zero-padded fig01_* convention
+        figures.sort(key=lambda item: item['path'])
+        tables.sort(key=lambda item: item['path'])
+        return {'figures': figures, 'tables': tables}
+
+    def save(self):
+        """Persist the index; files that disappeared from scanned directories are dropped."""
+        if self.cache_path is None:
+            return
+        roots = tuple(self._roots)
+        files = {key: value for key, value in self._cache.items() if not key.startswith(roots)}
+        files.update(self._seen)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.cache_path, json.dumps({'version': INDEX_VERSION, 'files': files}))
+
+
+def format_file_details(item):
+    """
+    Human-readable size/dimension summary for a table cell.
+
+    Args:
+        item: Figure or table dict from ResultsIndex.scan
+
+    Returns:
+        String such as "1200×800 px, 240 KB"
+    """
+    size = item['size']
+    if size >= 1024 * 1024:
+        size_text = f'{size / (1024 * 1024):.1f} MB'
+    elif size >= 1024:
+        size_text = f'{size / 1024:.0f} KB'
+    else:
+        size_text = f'{size} B'
+    if item.get('width') and item.get('height'):
+        return f"{item['width']}×{item['height']} px, {size_text}"
+    return size_text
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0].startswith('--'):
+        print("Usage: results_index.py <results_dir> [results_dir ...] [--cache <index.json>]")
+        sys.exit(1)
+
+    results_dirs = []
+    cache_path = None
+    i = 0
+    while i < len(args):
+        if args[i] == '--cache' and i + 1 < len(args):
+            cache_path = args[i + 1]
+            i += 2
+        else:
+            results_dirs.append(args[i])
+            i += 1
+
+    index = ResultsIndex(cache_path)
+    result = {results_dir: index.scan(results_dir) for results_dir in results_dirs}
+    index.save()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
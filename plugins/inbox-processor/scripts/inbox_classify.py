@@ -0,0 +1,717 @@
+#!/usr/bin/env python3
+"""
+Inbox Classify - Rule-based first pass over inbox/ files
+
+Compiles the indicators and content patterns of
+references/classification-rules.md into one multi-pattern regex and
+classifies every inbox file as meeting notes, protocol, experiment idea,
+raw data or literature, with a confidence and a suggested destination.
+Only files the rules cannot settle (weak evidence or two close categories)
+are marked ambiguous and left for the agent to read.
+
+Rule sources:
+- Quoted phrases in the rules ("Discussed...", "Materials:", "Idea:") are
+  matched as written; labels also match as **Label**: and as headings
+- Descriptive bullets ("Measurements (10 μL, 37°C, 2 hours)", "DOI or
+  PubMed ID") map to the built-in patterns in SIGNAL_PATTERNS
+- "File extensions:" settles data files from their name alone
+- Bullets neither form covers are listed by --show-rules
+
+Each file is read once, in blocks, and only until its classification is
+settled (at most MAX_READ_BYTES); data files known by extension are not
+opened at all. Files are classified on a thread pool.
+
+Usage:
+    inbox_classify.py [--project <path>] [--json] [--workers N]
+                      [--threshold X] [--rules <classification-rules.md>] [file ...]
+    inbox_classify.py --show-rules
+
+Examples:
+    inbox_classify.py --project .
+    inbox_classify.py --project . --json
+    inbox_classify.py inbox/meeting_notes.txt inbox/counts.csv
+"""
+
+import codecs
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+RULES_PATH = Path(__file__).resolve().parents[1] / 'references' / 'classification-rules.md'
+
+# Category keys for the "### N. <Title>" sections of classification-rules.md
+CATEGORIES = {
+    'Meeting Notes': 'meeting',
+    'Protocols': 'protocol',
+    'Experiment Ideas': 'idea',
+    'Raw Data Files': 'data',
+    'Literature/Reading Notes': 'literature',
+    'Miscellaneous/Unclear': 'misc',
+}
+# Tie-break order, from the Classification Decision Tree
+DECISION_ORDER = ('protocol', 'idea', 'meeting', 'literature', 'data')
+
+DEFAULT_WORKERS = 16
+DEFAULT_THRESHOLD = 0.7  # below this a file is left for the agent
+EARLY_STOP = 0.9  # stop reading once the confidence reaches this
+FIRST_BLOCK_SIZE = 16 << 10  # enough for the title and the data sniff
+BLOCK_SIZE = 64 << 10
+MAX_READ_BYTES = 256 << 10
+LARGE_FILE_BYTES = 10 << 20
+MIN_SCORE = 2  # less evidence than this is "misc"
+CONFIDENCE_SCALE = 6.0  # score at which evidence strength reaches 63%
+MATCH_CAP = 3  # matches counted per signal
+
+QUOTED_WEIGHT = 2
+TITLE_WEIGHT = 4
+EXTENSION_WEIGHT = 15
+
+# Built-in patterns for descriptive bullets, keyed by the bullet's start
+# (lowercase). Values: (regex, weight); patterns are case-insensitive
+# unless they start with (?-i:...).
+_DATE = r'\b\d{4}[-/]\d{1,2}[-/]\d{1,2}\b|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.? \d{1,2}(?:st|nd|rd|th)?\b'
+SIGNAL_PATTERNS = {
+    'meeting': {
+        'contains discussion, decisions, action items':
+            (r'\b(?:discuss(?:ed|ion)|decid(?:ed|e)|decisions?|action items?|agreed)\b', 1),
+        'dated content': (_DATE, 1),
+        'dates and times': (r'\b\d{1,2}:\d{2}\s*(?:am|pm)?\b', 1),
+        'multiple speakers or discussion format':
+            (r'(?-i:\b[A-Z][a-z]+ (?:said|suggested|agreed|asked|proposed|mentioned|will|to)\b)', 2),
+        'names with attributions':
+            (r'(?-i:^[ \t]*[-*][ \t]+(?:\[[ xX]\][ \t]+)?[A-Z][a-z]+(?: [A-Z][a-z]+)?:[ \t]+\S)', 2),
+        'agenda or topics listed': (r'^[ \t]*#*[ \t]*(?:agenda|attendees|participants|topics)\b', 2),
+        'todo lists': (r'^[ \t]*[-*][ \t]+\[[ xX]\]|\bTODO\b', 1),
+    },
+    'protocol': {
+        'step-by-step procedures': (r'^[ \t]*(?:step[ \t]*)?\d{1,2}[.):][ \t]+\S', 1),
+        'numbered steps': (r'^[ \t]*(?:step[ \t]*)?\d{1,2}[.):][ \t]+\S', 1),
+        'materials/reagents lists': (r'^[ \t]*#+[ \t]*(?:materials|reagents|equipment|buffers?)\b', 2),
+        'specific concentrations, volumes, times':
+            (r'\b\d+(?:\.\d+)?[ \t]?(?:[µμu][lLgM]|m[lLgM]|n[gM]|rpm|[x×][ \t]?g|°C|min(?:utes)?|hours?|hrs?)(?!\w)', 1),
+        'measurements':
+            (r'\b\d+(?:\.\d+)?[ \t]?(?:[µμu][lLgM]|m[lLgM]|n[gM]|rpm|[x×][ \t]?g|°C|min(?:utes)?|hours?|hrs?)(?!\w)', 1),
+        'safety notes or warnings': (r'\b(?:caution|warning|safety|hazard(?:ous)?|fume hood|gloves)\b', 1),
+    },
+    'idea': {
+        'hypothesis or research question': (r'\b(?:hypothes[ie]s|hypothesi[sz]e|research question)\b', 2),
+        'hypothesis statements': (r'\b(?:hypothes[ie]s|hypothesi[sz]e|research question)\b', 2),
+        'proposed experimental approach':
+            (r'^[ \t]*#+[ \t]*(?:approach|experimental design|proposed)\b|\b(?:we (?:could|propose|plan)|propose to)\b', 2),
+        'experimental design sketch': (r'\b(?:knock ?(?:out|down)|compare to|control group|assay)\b', 1),
+        'exploratory or brainstorming tone': (r'\b(?:maybe|perhaps|might|brainstorm(?:ing)?|wonder)\b', 1),
+        'expected outcomes': (r'\bexpected (?:outcomes?|results?)\b|\bwe (?:expect|predict)\b', 2),
+        'questions to answer': (r'\?[ \t]*$', 1),
+    },
+    'literature': {
+        'paper citations': (r'(?-i:\b[A-Z][A-Za-z-]+ et al\.?,? \(?(?:19|20)\d{2}\b)', 2),
+        'author names and years': (r'(?-i:\(\s*[A-Z][A-Za-z-]+(?: (?:and|&) [A-Z][A-Za-z-]+)?,? (?:19|20)\d{2}\s*\))', 2),
+        'journal names':
+            (r'(?-i:\b(?:Nature(?: \w+)?|Science|Cell|PNAS|eLife|PLOS \w+|Genome (?:Biology|Research)|Nucleic Acids Research'
+             r'|Bioinformatics|Molecular Cell|Cancer Cell|Lancet|NEJM|bioRxiv|medRxiv)\b)', 1),
+        'doi or pubmed id': (r'\b10\.\d{4,9}/\S+|\bPMID:?[ \t]*\d{5,9}\b|\bpubmed\b|\bdoi\b', 3),
+        'summary of findings': (r'\b(?:key )?findings?\b', 1),
+        'notes on methods': (r'\bmethods?\b', 1),
+        'relevance to current work': (r'\brelevan(?:t|ce)\b', 1),
+    },
+}
+
+# Data signals computed from the first block rather than matched
+SNIFF_SIGNALS = {
+    'tabular structure': ('tabular', 6),
+    'headers with column names': ('tabular', 6),
+    'numeric content': ('numeric', 4),
+    'rows of measurements': ('numeric', 4),
+    'sequence data': ('sequence', 10),
+    'binary data files': ('binary', 6),
+    'large file size': ('large', 2),
+}
+SNIFF_DELIMITERS = ('\t', ',', ';')
+SNIFF_LINES = 50
+COLLAPSE_AFTER = 5  # files per directory listed individually in the text summary
+
+# Extensions the rules' list stands for ("... .fastq, .bam" covers .fq.gz, .cram, ...)
+EXTENSION_FAMILIES = {
+    '.fastq': ('.fastq', '.fq'),
+    '.bam': ('.bam', '.cram', '.sam', '.bai', '.crai'),
+    '.csv': ('.csv', '.xlsx', '.xls', '.parquet'),
+    '.tsv': ('.tsv', '.mtx', '.h5', '.h5ad', '.loom', '.rds', '.vcf', '.bed', '.gtf', '.gff'),
+}
+COMPRESSION_SUFFIXES = ('.gz', '.bz2', '.xz', '.zst')
+
+_CATEGORY_HEADING = re.compile(r'^###\s+\d+\.\s+(.+?)\s*$')
+_BLOCK_LABEL = re.compile(r'^\*\*(.+?)\*\*:\s*(.*)$')
+_BULLET = re.compile(r'^[-*]\s+(.*)$')
+_QUOTED = re.compile(r'"([^"]*)"')
+_EXTENSION = re.compile(r'(\.\w+)(\s*\((\w+)\))?')
+_BACKTICK = re.compile(r'`([^`]+)`')
+_WORD = re.compile(r'\w')
+_TITLE = re.compile(r'^[ \t]*(?:#+[ \t]+)?(\S.{0,118}?)[ \t]*#*[ \t]*$', re.MULTILINE)
+_ISO_DATE = re.compile(r'\b(\d{4})[-/](\d{1,2})[-/](\d{1,2})\b')
+_NUMBER = re.compile(r'^[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?%?$')
+_FASTQ = re.compile(r'^@\S+\n[ACGTN.]+\n\+', re.MULTILINE)
+_FASTA = re.compile(r'^>\S+.*\n[ACGTUN]{20,}', re.MULTILINE | re.IGNORECASE)
+_TITLE_SUFFIX = re.compile(r'\s+(?:protocol|sop|notes?)$', re.IGNORECASE)
+_TITLE_PREFIX = re.compile(r'^(?:idea|literature(?: notes)?|protocol|sop|notes?|meeting)\s*[:\-–]?\s*', re.IGNORECASE)
+
+
+def _phrase_pattern(phrase):
+    """
+    Regex for a quoted phrase from the rules.
+
+    "Discussed..." matches words starting with the phrase; "Materials:"
+    also matches "**Materials**:" and a "## Materials" heading.
+    """
+    text = phrase.strip()
+    prefix = text.endswith('...')
+    text = text.rstrip('.').strip()
+    label = text.endswith(':')
+    text = text.rstrip(':').strip()
+    if not _WORD.search(text):
+        return None
+    body = r'\s+'.join(re.escape(word) for word in text.split())
+    if label:
+        return rf'^[ \t]*#+[ \t]*{body}\b|\b{body}[*_]*[ \t]*:'
+    return rf'\b{body}' + ('' if prefix else r'\b')
+
+
+class Signal:
+    """One compiled rule: a category, its label in the rules, and its weight."""
+
+    def __init__(self, category, label, weight):
+        self.category = category
+        self.label = label
+        self.weight = weight
+
+
+class RuleSet:
+    """
+    Classification rules compiled from classification-rules.md.
+
+    Args:
+        rules_path: Path to classification-rules.md
+
+    Raises:
+        ValueError: If the rules yield no content patterns (e.g. a --rules
+            file without a "## Classification Categories" section)
+
+    Attributes:
+        destinations: category -> destination text from the rules
+        unchecked: (category, bullet) pairs no pattern covers; left to the agent
+    """
+
+    def __init__(self, rules_path=RULES_PATH):
+        self.rules_path = Path(rules_path)
+        self.titles = {}  # category -> section title
+        self.destinations = {}
+        self.unchecked = []
+        self.signals = []  # group index -> Signal
+        self.title_signals = []
+        self.sniffs = {}  # sniff name -> Signal
+        self.extensions = {}  # suffix -> 'name' (settled by name) or 'content'
+        self._patterns = {}  # (category, pattern) -> signal, to merge duplicates
+        self._title_patterns = []
+
+        self._parse(self.rules_path.read_text(encoding='utf-8'))
+        self.matcher = self._compile([pattern for _, pattern in self._patterns])
+        if self.matcher is None:
+            raise ValueError(f"No classification patterns in {self.rules_path} "
+                             "(expected indicators under '## Classification Categories')")
+        self.signals = list(self._patterns.values())
+        self.title_matcher = self._compile(self._title_patterns)
+
+    @staticmethod
+    def _compile(patterns):
+        if not patterns:
+            return None
+        # Every signal starts at a word boundary, a line start, "(" or "?"; testing
+        # that first skips the alternatives at most positions inside words
+        alternatives = '|'.join(f'(?P<s{i}>{pattern})' for i, pattern in enumerate(patterns))
+        return re.compile(rf'(?:\b|^|(?=[(?]))(?:{alternatives})', re.IGNORECASE | re.MULTILINE)
+
+    def _add(self, category, label, pattern, weight):
+        key = (category, pattern)
+        if key not in self._patterns:
+            self._patterns[key] = Signal(category, label, weight)
+
+    def _parse(self, text):
+        in_categories = False
+        category = None
+        block = None
+        in_fence = False
+        for line in text.splitlines():
+            if line.lstrip().startswith(('```', '~~~')):
+                in_fence = not in_fence
+            if in_fence:
+                continue  # examples
+            if line.startswith('## '):
+                in_categories = line[3:].strip() == 'Classification Categories'
+                category = None
+                continue
+            if not in_categories:
+                continue
+            heading = _CATEGORY_HEADING.match(line)
+            if heading:
+                title = heading.group(1)
+                category = CATEGORIES.get(title, re.sub(r'\W+', '_', title.lower()).strip('_'))
+                self.titles[category] = title
+                block = None
+                continue
+            if category is None:
+                continue
+            label = _BLOCK_LABEL.match(line)
+            if label:
+                block = label.group(1).lower()
+                if block == 'destination':
+                    self.destinations[category] = label.group(2).strip()
+                continue
+            bullet = _BULLET.match(line.strip()) if block in ('indicators', 'content patterns') else None
+            if bullet:
+                self._add_bullet(category, bullet.group(1).strip())
+
+    def _add_bullet(self, category, bullet):
+        lower = bullet.lower()
+        covered = False
+
+        if lower.startswith('file extensions:'):
+            for suffix, _, qualifier in _EXTENSION.findall(bullet.split(':', 1)[1]):
+                # ".txt (data)": text files are data only when the content says so
+                mode = 'content' if qualifier else 'name'
+                for family_suffix in EXTENSION_FAMILIES.get(suffix.lower(), (suffix.lower(),)):
+                    self.extensions[family_suffix] = mode
+            return
+
+        for phrase in _QUOTED.findall(bullet):
+            pattern = _phrase_pattern(phrase)
+            if pattern is None:
+                continue
+            covered = True
+            if 'in title' in lower:
+                self._title_patterns.append(pattern)
+                self.title_signals.append(Signal(category, f'"{phrase}" in title', TITLE_WEIGHT))
+            else:
+                self._add(category, f'"{phrase}"', pattern, QUOTED_WEIGHT)
+
+        for start, (pattern, weight) in SIGNAL_PATTERNS.get(category, {}).items():
+            if lower.startswith(start):
+                self._add(category, bullet.split(' (')[0], pattern, weight)
+                covered = True
+        if category == 'data':
+            for start, (name, weight) in SNIFF_SIGNALS.items():
+                if lower.startswith(start):
+                    self.sniffs.setdefault(name, Signal(category, bullet.split(' (')[0], weight))
+                    covered = True
+
+        if not covered:
+            self.unchecked.append((category, bullet))
+
+    def extension_mode(self, name):
+        """'name' if the file name alone marks data, 'content' if it might, else None."""
+        name = name.lower()
+        for suffix in COMPRESSION_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        return self.extensions.get(os.path.splitext(name)[1])
+
+
+def _sniff(text):
+    """Data signals of the first block: tabular, numeric and sequence layouts."""
+    found = set()
+    if _FASTQ.search(text) or _FASTA.search(text):
+        found.add('sequence')
+    lines = [line for line in text.splitlines()[:SNIFF_LINES + 1] if line.strip()][:SNIFF_LINES]
+    if len(lines) >= 5:
+        for delimiter in SNIFF_DELIMITERS:
+            counts = [line.count(delimiter) for line in lines]
+            common = max(set(counts), key=counts.count)
+            if common >= 1 and counts.count(common) >= 0.8 * len(lines):
+                found.add('tabular')
+                cells = [cell.strip().strip('"') for line in lines[1:] for cell in line.split(delimiter)]
+                if cells and sum(1 for cell in cells if _NUMBER.match(cell)) >= 0.4 * len(cells):
+                    found.add('numeric')
+                break
+    return found
+
+
+def _confidence(ranked):
+    """Confidence of the top category: evidence strength times margin over the runner-up."""
+    if not ranked or ranked[0][1] < MIN_SCORE:
+        return 0.0
+    top = ranked[0][1]
+    second = ranked[1][1] if len(ranked) > 1 else 0
+    strength = 1 - math.exp(-top / CONFIDENCE_SCALE)
+    margin = (top - second) / top
+    return round(strength * (0.5 + 0.5 * margin), 2)
+
+
+def _rank(scores):
+    order = {category: i for i, category in enumerate(DECISION_ORDER)}
+    return sorted(((category, score) for category, score in scores.items() if score > 0),
+                  key=lambda item: (-item[1], order.get(item[0], len(order))))
+
+
+def _slug(text, limit=40):
+    text = _TITLE_SUFFIX.sub('', _TITLE_PREFIX.sub('', text.strip()))
+    slug = re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+    return slug[:limit].rstrip('-')
+
+
+def suggest_destination(rules, category, path, title=None, date=None):
+    """
+    Fill the destination template of a category from classification-rules.md.
+
+    Args:
+        rules: RuleSet
+        category: Category key
+        path: Inbox file
+        title: Document title (first heading or line), if known
+        date: 'YYYY-MM-DD' found in the content, if any
+
+    Returns:
+        Destination path relative to the project, a command such as
+        "/research-exp (Exp##_<name>)", or None for misc
+    """
+    destination = rules.destinations.get(category, '')
+    path = Path(path)
+    name = (title and _slug(title)) or _slug(path.stem.replace('_', ' ')) or 'untitled'
+    templates = _BACKTICK.findall(destination)
+    if not templates or category == 'misc':
+        return None
+    template = templates[0]
+    if template.startswith('/'):
+        return f'{template} (Exp##_{name})'
+    if date is None:
+        date = datetime.fromtimestamp(path.stat().st_mtime).strftime('%Y-%m-%d')
+    return (template.replace('YYYY-MM-DD', date).replace('[filename]', path.name)
+            .replace('[name]', name).replace('[topic]', name))
+
+
+def classify_file(path, rules, threshold=DEFAULT_THRESHOLD):
+    """
+    Classify one inbox file.
+
+    Args:
+        path: File to classify
+        rules: RuleSet
+        threshold: Confidence below which the file is marked ambiguous
+
+    Returns:
+        dict with path, category, confidence, destination, ambiguous,
+        evidence (matched rule labels), alternatives and bytes_read
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    scores = {}
+    hits = {}  # label -> count
+    bytes_read = 0
+    title = None
+    date = None
+    reason = None
+
+    def add(signal, count=1):
+        counted = min(count, MATCH_CAP)
+        scores[signal.category] = scores.get(signal.category, 0) + signal.weight * counted
+        hits[(signal.category, signal.label)] = hits.get((signal.category, signal.label), 0) + count
+
+    # Names settle data files without reading them
+    mode = rules.extension_mode(path.name)
+    if mode == 'name':
+        scores['data'] = EXTENSION_WEIGHT
+        hits[('data', 'file extension')] = 1
+    if 'large' in rules.sniffs and size >= LARGE_FILE_BYTES:
+        add(rules.sniffs['large'])
+
+    if mode != 'name':
+        if rules.title_matcher is not None:
+            stem = path.stem.replace('_', ' ').replace('-', ' ')
+            for match in rules.title_matcher.finditer(stem):
+                add(rules.title_signals[int(match.lastgroup[1:])])
+
+        counts = {}
+        previous_total = None
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        carry = ''
+        with open(path, 'rb') as f:
+            while bytes_read < MAX_READ_BYTES:
+                first = bytes_read == 0
+                raw = f.read(FIRST_BLOCK_SIZE if first else BLOCK_SIZE)
+                if not raw:
+                    text = carry + decoder.decode(b'', final=True)
+                    carry = ''
+                else:
+                    bytes_read += len(raw)
+                    if first and b'\0' in raw:
+                        reason = 'binary content'
+                        if 'binary' in rules.sniffs:
+                            add(rules.sniffs['binary'])
+                        break
+                    # Matchers are line-based: hold back the partial last line
+                    text = carry + decoder.decode(raw)
+                    cut = text.rfind('\n') + 1
+                    text, carry = text[:cut], text[cut:]
+
+                if first:
+                    match = _TITLE.search(text or carry)
+                    title = match.group(1).strip('*_ ') if match else None
+                    if title and rules.title_matcher is not None:
+                        for match in rules.title_matcher.finditer(title):
+                            add(rules.title_signals[int(match.lastgroup[1:])])
+                    sniffed = _sniff(text or carry)
+                    for name in sniffed:
+                        if name in rules.sniffs:
+                            add(rules.sniffs[name])
+                    if sniffed & {'tabular', 'sequence'} and scores.get('data', 0) >= MIN_SCORE:
+                        break  # records, not prose: the prose patterns cannot apply
+                if date is None:
+                    match = _ISO_DATE.search(text)
+                    if match:
+                        date = '{}-{:02d}-{:02d}'.format(*(int(part) for part in match.groups()))
+
+                for match in rules.matcher.finditer(text):
+                    index = int(match.lastgroup[1:])
+                    counts[index] = counts.get(index, 0) + 1
+
+                if not raw:
+                    break
+                # Re-rank with the matches so far; stop once the answer is settled
+                # or a whole block added no evidence (every signal seen is capped)
+                provisional = dict(scores)
+                for index, count in counts.items():
+                    signal = rules.signals[index]
+                    provisional[signal.category] = provisional.get(signal.category, 0) + \
+                        signal.weight * min(count, MATCH_CAP)
+                total = sum(provisional.values())
+                if _confidence(_rank(provisional)) >= EARLY_STOP or total == previous_total:
+                    break
+                previous_total = total
+
+        for index, count in counts.items():
+            add(rules.signals[index], count)
+
+    ranked = _rank(scores)
+    confidence = _confidence(ranked)
+    category = ranked[0][0] if ranked and ranked[0][1] >= MIN_SCORE else 'misc'
+    if category == 'misc':
+        reason = reason or 'no rule matched strongly'
+    elif confidence < threshold and reason is None:
+        if len(ranked) > 1 and ranked[1][1] >= 0.5 * ranked[0][1]:
+            reason = f'close to {ranked[1][0]}'
+        else:
+            reason = 'weak evidence'
+
+    result = {
+        'path': str(path),
+        'category': category,
+        'confidence': confidence,
+        'destination': suggest_destination(rules, category, path, title, date),
+        'ambiguous': category == 'misc' or confidence < threshold,
+        'evidence': [f'{label} ×{count}' if count > 1 else label
+                     for (hit_category, label), count in sorted(hits.items(), key=lambda item: -item[1])
+                     if hit_category == category][:5],
+        'alternatives': [{'category': name, 'score': score} for name, score in ranked[1:3]],
+        'bytes_read': bytes_read,
+        'size': size,
+    }
+    if result['ambiguous']:
+        result['reason'] = reason
+    return result
+
+
+def list_inbox(inbox_dir):
+    """Files under inbox/, recursively, skipping archive/ and hidden entries."""
+    files = []
+    stack = [Path(inbox_dir)]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir():
+                if not (directory == Path(inbox_dir) and entry.name == 'archive'):
+                    stack.append(Path(entry.path))
+            elif entry.is_file():
+                files.append(Path(entry.path))
+    return sorted(files)
+
+
+def classify_inbox(paths, rules=None, workers=DEFAULT_WORKERS, threshold=DEFAULT_THRESHOLD):
+    """
+    Classify files on a thread pool.
+
+    Args:
+        paths: Files to classify
+        rules: RuleSet (default: the plugin's classification-rules.md)
+        workers: Thread count
+        threshold: Confidence below which a file is left for the agent
+
+    Returns:
+        List of classify_file results in path order; unreadable files get
+        category 'misc' with an 'error'
+    """
+    rules = rules or RuleSet()
+
+    def classify(path):
+        try:
+            return classify_file(path, rules, threshold)
+        except OSError as e:
+            return {'path': str(path), 'category': 'misc', 'confidence': 0.0, 'destination': None,
+                    'ambiguous': True, 'reason': 'unreadable', 'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(classify, paths))
+
+
+def print_results(results, rules, elapsed):
+    """Grouped, human-readable summary of classify_inbox results."""
+    by_category = {}
+    for result in results:
+        key = 'ambiguous' if result['ambiguous'] else result['category']
+        by_category.setdefault(key, []).append(result)
+
+    for category in (*DECISION_ORDER, 'ambiguous'):
+        group = by_category.get(category)
+        if not group:
+            continue
+        title = 'Needs review' if category == 'ambiguous' else rules.titles.get(category, category)
+        print(f"\n📋 {title} ({len(group)})")
+        if category == 'ambiguous':
+            for result in group:
+                guess = f"{result['category']} {result['confidence']:.2f}" if result['category'] != 'misc' else 'misc'
+                print(f"   ⚠️  {result['path']}  [{guess}; {result.get('error') or result.get('reason')}]")
+            continue
+        # A sequencing run directory is one line, not hundreds
+        by_directory = {}
+        for result in group:
+            by_directory.setdefault(os.path.dirname(result['path']), []).append(result)
+        for directory, results_in_dir in by_directory.items():
+            if len(results_in_dir) > COLLAPSE_AFTER:
+                destinations = {os.path.dirname(result['destination'] or '') for result in results_in_dir}
+                target = destinations.pop() + '/' if len(destinations) == 1 else 'several destinations'
+                lowest = min(result['confidence'] for result in results_in_dir)
+                print(f"   {directory}/ ({len(results_in_dir)} files) → {target}  (≥{lowest:.2f})")
+                continue
+            for result in results_in_dir:
+                print(f"   {result['path']} → {result['destination']}  ({result['confidence']:.2f})")
+
+    settled = sum(1 for result in results if not result['ambiguous'])
+    read_mb = sum(result.get('bytes_read', 0) for result in results) / 1e6
+    print(f"\n✅ {settled} of {len(results)} file(s) classified, "
+          f"{len(results) - settled} left for review ({read_mb:.1f} MB read, {elapsed:.2f}s)")
+    if settled:
+        print("💡 Nothing was moved; confirm the destinations before moving files")
+
+
+def print_rules(rules):
+    """Show what the rules compiled to and which bullets remain for the agent."""
+    print(f"📋 Rules: {rules.rules_path}")
+    for category, title in rules.titles.items():
+        labels = [signal.label for signal in rules.signals if signal.category == category]
+        labels += [signal.label for signal in rules.title_signals if signal.category == category]
+        labels += [signal.label for signal in rules.sniffs.values() if signal.category == category]
+        print(f"\n{title} → {rules.destinations.get(category, '?')}")
+        for label in labels:
+            print(f"   ✅ {label}")
+        if category == 'data' and rules.extensions:
+            print(f"   ✅ extensions: {', '.join(sorted(rules.extensions))}")
+        for unchecked_category, bullet in rules.unchecked:
+            if unchecked_category == category:
+                print(f"   👀 {bullet} (judged by the agent)")
+
+
+def main():
+    args = sys.argv[1:]
+    project = '.'
+    rules_path = RULES_PATH
+    workers = DEFAULT_WORKERS
+    threshold = DEFAULT_THRESHOLD
+    output = 'text'
+    show_rules = False
+    files = []
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--project' and i + 1 < len(args):
+            project = args[i + 1]
+            i += 2
+        elif args[i] == '--rules' and i + 1 < len(args):
+            rules_path = args[i + 1]
+            i += 2
+        elif args[i] == '--workers' and i + 1 < len(args):
+            try:
+                workers = int(args[i + 1])
+            except ValueError:
+                workers = 0
+            if workers < 1:
+                print(f"❌ Error: --workers must be a positive integer (got {args[i + 1]})")
+                sys.exit(1)
+            i += 2
+        elif args[i] == '--threshold' and i + 1 < len(args):
+            try:
+                threshold = float(args[i + 1])
+            except ValueError:
+                threshold = -1.0
+            if not 0 <= threshold <= 1:
+                print(f"❌ Error: --threshold must be a number from 0 to 1 (got {args[i + 1]})")
+                sys.exit(1)
+            i += 2
+        elif args[i] == '--json':
+            output = 'json'
+            i += 1
+        elif args[i] == '--show-rules':
+            show_rules = True
+            i += 1
+        elif args[i].startswith('--'):
+            print("Usage: inbox_classify.py [--project <path>] [--json] [--workers N] "
+                  "[--threshold X] [--rules <file>] [file ...]")
+            sys.exit(1)
+        else:
+            files.append(Path(args[i]))
+            i += 1
+
+    try:
+        rules = RuleSet(rules_path)
+    except OSError as e:
+        print(f"❌ Error: Cannot read rules: {e}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    if show_rules:
+        print_rules(rules)
+        return
+
+    if not files:
+        inbox_dir = Path(project) / 'inbox'
+        if not inbox_dir.is_dir():
+            print(f"❌ Error: No inbox/ directory in {Path(project).resolve()}")
+            sys.exit(1)
+        files = list_inbox(inbox_dir)
+
+    started = time.perf_counter()
+    results = classify_inbox(files, rules, workers, threshold)
+    elapsed = time.perf_counter() - started
+
+    if output == 'json':
+        print(json.dumps({'files': len(results),
+                          'ambiguous': sum(1 for result in results if result['ambiguous']),
+                          'results': results}, ensure_ascii=False, indent=2))
+    elif not results:
+        print("✅ inbox/ is empty")
+    else:
+        print_results(results, rules, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+ipynb to Markdown - Lightweight notebook → Markdown converter for PDF export
+
+Renders a Jupyter notebook straight from its JSON with the stdlib only,
+following the layout of `jupyter nbconvert --to markdown` so the result
+feeds the same `pandoc -f markdown-grid_tables` invocation:
+
+- markdown cells verbatim (attachments extracted to
+  <name>_files/attachment_<cell>_<name>; Jupyter names every pasted image
+  image.png, so the cell index keeps them apart)
+- code cells as fenced blocks in the kernel language (omitted with --no-input)
+- stream, text/plain and error outputs indented as code blocks (ANSI stripped)
+- text/html, text/markdown and text/latex outputs passed through
+- image/png, image/jpeg and image/svg+xml outputs extracted to
+  <name>_files/output_<cell>_<n>.<ext> and linked relative to the markdown
+
+Avoiding the nbconvert/Jinja import and template load keeps a conversion
+to a few tens of milliseconds including interpreter startup.
+
+Usage:
+    ipynb_to_md.py <notebook.ipynb> [--output-dir <dir>] [--output <name>] [--no-input]
+
+Examples:
+    ipynb_to_md.py notebook/labnote/Exp01_analysis.ipynb
+    ipynb_to_md.py Exp01_analysis.ipynb --no-input --output-dir /tmp/work
+"""
+
+import base64
+import json
+import re
+import sys
+from pathlib import Path
+
+
+# Same order as nbconvert's markdown exporter; the first type present is rendered
+DISPLAY_PRIORITY = ('text/html', 'text/markdown', 'image/svg+xml', 'text/latex',
+                    'image/png', 'image/jpeg', 'text/plain')
+IMAGE_EXTENSIONS = {'image/png': 'png', 'image/jpeg': 'jpg', 'image/svg+xml': 'svg'}
+IMAGE_ALT = {'image/png': 'png', 'image/jpeg': 'jpeg', 'image/svg+xml': 'svg'}
+RAW_MARKDOWN_FORMATS = ('', 'markdown', 'text/markdown', 'pandoc')
+
+_ANSI = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]|\x1b\][^\x07]*\x07')
+_ATTACHMENT = re.compile(r'attachment:([^\s)"\'>]+)')
+
+
+def _text(value):
+    """Notebook strings may be stored as a list of lines."""
+    return ''.join(value) if isinstance(value, list) else (value or '')
+
+
+def _indent(text):
+    return '\n'.join('    ' + line if line.strip() else line for line in text.rstrip('\n').split('\n'))
+
+
+def _write_image(files_dir, name, mime, data, written):
+    files_dir.mkdir(exist_ok=True)
+    path = files_dir / name
+    if mime == 'image/svg+xml':
+        path.write_text(_text(data), encoding='utf-8')
+    else:
+        path.write_bytes(base64.b64decode(_text(data)))
+    written.append(path)
+    return f'{files_dir.name}/{name}'
+
+
+def _render_output(output, cell_index, output_index, files_dir, written):
+    output_type = output.get('output_type')
+    if output_type == 'stream':
+        return _indent(_ANSI.sub('', _text(output.get('text'))))
+    if output_type == 'error':
+        return _indent(_ANSI.sub('', '\n'.join(output.get('traceback') or [])))
+    if output_type not in ('execute_result', 'display_data'):
+        return ''
+
+    data = output.get('data') or {}
+    mime = next((mime for mime in DISPLAY_PRIORITY if mime in data), None)
+    if mime in IMAGE_EXTENSIONS:
+        name = f'output_{cell_index}_{output_index}.{IMAGE_EXTENSIONS[mime]}'
+        return f'![{IMAGE_ALT[mime]}]({_write_image(files_dir, name, mime, data[mime], written)})'
+    if mime == 'text/plain':
+        return _indent(_ANSI.sub('', _text(data[mime])))
+    if mime is not None:
+        return _text(data[mime]).strip('\n')
+    return ''
+
+
+def _render_markdown_cell(cell, cell_index, files_dir, written):
+    source = _text(cell.get('source'))
+    attachments = cell.get('attachments') or {}
+    if not attachments:
+        return source
+
+    links = {}
+    for name, bundle in attachments.items():
+        mime = next((mime for mime in IMAGE_EXTENSIONS if mime in bundle), None)
+        if mime is not None:
+            file_name = f'attachment_{cell_index}_{Path(name).name}'
+            links[name] = _write_image(files_dir, file_name, mime, bundle[mime], written)
+    return _ATTACHMENT.sub(lambda match: links.get(match.group(1), match.group(0)), source)
+
+
+def notebook_to_markdown(notebook_path, output_dir=None, output_name=None, no_input=False):
+    """
+    Convert a notebook to Markdown plus extracted images.
+
+    Args:
+        notebook_path: Path to the .ipynb file
+        output_dir: Directory for the .md and <name>_files/ (default: the notebook's)
+        output_name: Markdown file stem (default: the notebook's stem)
+        no_input: Omit code cell sources (outputs are kept)
+
+    Returns:
+        (markdown_path, image_paths) - the written .md and every extracted image
+    """
+    notebook_path = Path(notebook_path)
+    with open(notebook_path, encoding='utf-8') as f:
+        notebook = json.load(f)
+
+    output_dir = Path(output_dir) if output_dir else notebook_path.parent
+    stem = output_name or notebook_path.stem
+    files_dir = output_dir / f'{stem}_files'
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    metadata = notebook.get('metadata') or {}
+    language = ((metadata.get('language_info') or {}).get('name')
+                or (metadata.get('kernelspec') or {}).get('language') or '')
+
+    written = []
+    blocks = []
+    for cell_index, cell in enumerate(notebook.get('cells') or []):
+        cell_type = cell.get('cell_type')
+        cell_metadata = cell.get('metadata') or {}
+        if cell_type == 'markdown':
+            blocks.append(_render_markdown_cell(cell, cell_index, files_dir, written))
+        elif cell_type == 'raw':
+            raw_format = cell_metadata.get('format') or cell_metadata.get('raw_mimetype') or ''
+            if raw_format in RAW_MARKDOWN_FORMATS:
+                blocks.append(_text(cell.get('source')))
+        elif cell_type == 'code':
+            source = _text(cell.get('source'))
+            if not no_input and source.strip():
+                fence_language = cell_metadata.get('magics_language') or language
+                blocks.append(f'```{fence_language}\n{source}\n```')
+            for output_index, output in enumerate(cell.get('outputs') or []):
+                rendered = _render_output(output, cell_index, output_index, files_dir, written)
+                if rendered.strip():
+                    blocks.append(rendered)
+
+    markdown_path = output_dir / f'{stem}.md'
+    markdown_path.write_text('\n\n'.join(blocks) + '\n', encoding='utf-8')
+    return markdown_path, written
+
+
+def main():
+    args = sys.argv[1:]
+    notebook = None
+    output_dir = None
+    output_name = None
+    no_input = False
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--output-dir' and i + 1 < len(args):
+            output_dir = args[i + 1]
+            i += 2
+        elif args[i] == '--output' and i + 1 < len(args):
+            output_name = Path(args[i + 1]).name.removesuffix('.md')
+            i += 2
+        elif args[i] == '--no-input':
+            no_input = True
+            i += 1
+        elif args[i].startswith('--') or notebook is not None:
+            print(f"❌ Error: Unexpected argument: {args[i]}")
+            sys.exit(1)
+        else:
+            notebook = args[i]
+            i += 1
+
+    if notebook is None:
+        print("Usage: ipynb_to_md.py <notebook.ipynb> [--output-dir <dir>] [--output <name>] [--no-input]")
+        sys.exit(1)
+
+    try:
+        markdown_path, images = notebook_to_markdown(notebook, output_dir, output_name, no_input)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    detail = f" ({len(images)} image(s) in {markdown_path.stem}_files/)" if images else ''
+    print(f"✅ Markdown written: {markdown_path}{detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Notebook PDF Batch - Converts many lab notebooks to PDF in parallel
+
+Runs the notebook_to_pdf.sh pipeline (.ipynb → ipynb_to_md → .md → pandoc +
+typst → .pdf; .md → pandoc + typst → .pdf) for a directory, glob or list of
+notebooks on a bounded worker pool. Each worker converts inside its own
+intermediate directory, so the markdown and `<name>_files/` images of one
+conversion never collide with or get cleaned up by another. A failed
+notebook is reported and the batch continues. The markdown step runs
+in-process (see ipynb_to_md.py) unless --nbconvert is given.
+
+Usage:
+    notebook_pdf_batch.py <dir|glob|notebook> [...] [--jobs N] [--output-dir <dir>]
+                          [--no-input] [--keep-md] [--nbconvert] [--summary <summary.json>]
+
+Examples:
+    notebook_pdf_batch.py notebook/labnote/
+    notebook_pdf_batch.py "notebook/labnote/Exp0*.ipynb" --jobs 4 --output-dir reports/labnotes
+    notebook_pdf_batch.py notebook/labnote/ --no-input --summary labnote_pdfs.json
+"""
+
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from ipynb_to_md import notebook_to_markdown
+
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / 'assets' / 'templates' / 'notebook.typ'
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+NOTEBOOK_SUFFIXES = ('.ipynb', '.md')
+LOG_TAIL_LINES = 10
+
+
+def find_notebooks(patterns):
+    """
+    Expand directories, globs and paths into notebooks to convert.
+
+    A directory contributes its .ipynb and .md files (checkpoints and
+    hidden files excluded). When Exp01.ipynb and Exp01.md sit side by side
+    (e.g. a kept intermediate), only the .ipynb is converted since both
+    would produce Exp01.pdf.
+
+    Args:
+        patterns: Directory, glob or file paths
+
+    Returns:
+        (notebooks, skipped) - sorted Paths, and Paths left out as duplicates
+    """
+    candidates = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            with os.scandir(path) as entries:
+                candidates.extend(path / entry.name for entry in entries
+                                  if entry.is_file() and not entry.name.startswith('.')
+                                  and entry.name.endswith(NOTEBOOK_SUFFIXES))
+        else:
+            # Unmatched paths are kept so they are reported as missing
+            candidates.extend(Path(match) for match in sorted(glob.glob(pattern)) or [pattern])
+
+    by_stem = {}
+    for path in candidates:
+        by_stem.setdefault(path.with_suffix(''), []).append(path)
+    notebooks = []
+    skipped = []
+    for stem, paths in sorted(by_stem.items()):
+        paths = sorted(set(paths), key=lambda p: p.suffix != '.ipynb')
+        notebooks.append(paths[0])
+        skipped.extend(paths[1:])
+    return notebooks, skipped
+
+
+def output_paths(notebooks, output_dir=None):
+    """
+    PDF path for each notebook (next to it, or in output_dir).
+
+    Args:
+        notebooks: Paths from find_notebooks
+        output_dir: Directory for all PDFs (default: next to each notebook)
+
+    Returns:
+        List of PDF Paths in input order
+
+    Raises:
+        ValueError: If several notebooks would write the same PDF (e.g.
+            a/Exp01.ipynb and b/Exp01.ipynb with one output_dir)
+    """
+    outputs = []
+    claimed = {}
+    for notebook in notebooks:
+        notebook = Path(notebook)
+        output = (Path(output_dir) if output_dir else notebook.parent) / f'{notebook.stem}.pdf'
+        claimed.setdefault(output.resolve(), []).append(notebook)
+        outputs.append(output)
+    collisions = [f"{output.name} <- {', '.join(str(path) for path in paths)}"
+                  for output, paths in claimed.items() if len(paths) > 1]
+    if collisions:
+        raise ValueError('Several notebooks would write the same PDF: ' + '; '.join(collisions))
+    return outputs
+
+
+def missing_tools(notebooks, use_nbconvert=False):
+    """Names of required command-line tools that are not on PATH."""
+    missing = []
+    if use_nbconvert and any(path.suffix == '.ipynb' for path in notebooks):
+        if shutil.which('jupyter-nbconvert') is None and shutil.which('jupyter') is None:
+            missing.append('nbconvert (uv pip install nbconvert)')
+    for tool in ('pandoc', 'typst'):
+        if shutil.which(tool) is None:
+            missing.append(tool)
+    return missing
+
+
+def _run(command, cwd, log):
+    log.append('$ ' + ' '.join(command))
+    result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    log.extend(line for line in (result.stdout + result.stderr).splitlines() if line.strip())
+    if result.returncode != 0:
+        raise RuntimeError(f"{Path(command[0]).name} exited with status {result.returncode}")
+
+
+class WorkerDirs:
+    """One intermediate directory per worker thread, emptied between notebooks."""
+
+    def __init__(self, root):
+        self.root = root
+        self.local = threading.local()
+
+    def get(self):
+        work_dir = getattr(self.local, 'work_dir', None)
+        if work_dir is None:
+            work_dir = self.local.work_dir = Path(tempfile.mkdtemp(prefix='worker_', dir=self.root))
+        for entry in os.scandir(work_dir):
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+        return work_dir
+
+
+def convert_notebook(notebook, output_pdf, work_dir, no_input=False, keep_md=False, template=TEMPLATE_PATH,
+                     use_nbconvert=False):
+    """
+    Convert one notebook to PDF inside a private intermediate directory.
+
+    Args:
+        notebook: .ipynb or .md path
+        output_pdf: Destination PDF path
+        work_dir: Empty directory owned by the calling worker
+        no_input: Exclude code cells (.ipynb only)
+        keep_md: Keep the intermediate markdown (and its _files/ images)
+            next to the notebook (.ipynb only)
+        template: Typst template for pandoc (None for the default)
+        use_nbconvert: Convert .ipynb with jupyter nbconvert instead of
+            ipynb_to_md
+
+    Returns:
+        dict with 'notebook', 'output', 'status' ('converted' or 'failed'),
+        'seconds', 'error' and 'log'
+    """
+    start = time.perf_counter()
+    notebook = Path(notebook).resolve()
+    output_pdf = Path(output_pdf).resolve()
+    log = []
+    error = None
+    try:
+        if not notebook.is_file():
+            raise RuntimeError('notebook not found')
+        if notebook.suffix == '.ipynb':
+            md_file = work_dir / f'{notebook.stem}.md'
+            if use_nbconvert:
+                command = ['jupyter-nbconvert'] if shutil.which('jupyter-nbconvert') else ['jupyter', 'nbconvert']
+                command += ['--to', 'markdown', '--output-dir', str(work_dir), '--output', notebook.stem]
+                if no_input:
+                    command.append('--no-input')
+                _run(command + [str(notebook)], work_dir, log)
+            else:
+                _, images = notebook_to_markdown(notebook, work_dir, notebook.stem, no_input)
+                log.append(f'ipynb_to_md: {md_file.name} ({len(images)} image(s))')
+            if not md_file.is_file():
+                raise RuntimeError('markdown conversion failed')
+            # The converters write image links relative to the markdown file
+            pandoc_cwd = work_dir
+        else:
+            md_file = notebook
+            pandoc_cwd = notebook.parent
+
+        tmp_pdf = work_dir / f'{notebook.stem}.pdf'
+        command = ['pandoc', str(md_file), '-f', 'markdown-grid_tables', '-o', str(tmp_pdf), '--pdf-engine=typst']
+        if template is not None:
+            command.append(f'--template={template}')
+        _run(command, pandoc_cwd, log)
+        if not tmp_pdf.is_file():
+            raise RuntimeError('PDF export failed')
+        output_pdf.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(tmp_pdf), str(output_pdf))
+
+        if keep_md and notebook.suffix == '.ipynb':
+            shutil.move(str(md_file), str(notebook.with_suffix('.md')))
+            files_dir = work_dir / f'{notebook.stem}_files'
+            if files_dir.is_dir():
+                kept_dir = notebook.parent / files_dir.name
+                if kept_dir.exists():
+                    shutil.rmtree(kept_dir)
+                shutil.move(str(files_dir), str(kept_dir))
+    except (OSError, RuntimeError, ValueError) as e:
+        error = str(e)
+
+    return {
+        'notebook': str(notebook),
+        'output': str(output_pdf),
+        'status': 'failed' if error else 'converted',
+        'seconds': round(time.perf_counter() - start, 3),
+        'error': error,
+        'log': '\n'.join(log),
+    }
+
+
+def convert_batch(notebooks, workers=DEFAULT_WORKERS, output_dir=None, no_input=False, keep_md=False,
+                  template=TEMPLATE_PATH, use_nbconvert=False):
+    """
+    Convert notebooks on a bounded thread pool (each conversion is external processes).
+
+    Args:
+        notebooks: Paths from find_notebooks
+        workers: Maximum concurrent conversions
+        output_dir: Directory for all PDFs (default: next to each notebook)
+        no_input: Exclude code cells (.ipynb only)
+        keep_md: Keep intermediate markdown next to each .ipynb
+        template: Typst template for pandoc
+        use_nbconvert: Convert .ipynb with jupyter nbconvert
+
+    Returns:
+        List of convert_notebook results in input order
+
+    Raises:
+        ValueError: If two notebooks map to the same PDF (see output_paths)
+    """
+    outputs = output_paths(notebooks, output_dir)
+    results = [None] * len(notebooks)
+    with tempfile.TemporaryDirectory(prefix='notebook_pdf_batch_') as root:
+        dirs = WorkerDirs(root)
+
+        def job(notebook, output_pdf):
+            return convert_notebook(notebook, output_pdf, dirs.get(), no_input, keep_md, template, use_nbconvert)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(job, notebook, output): index
+                       for index, (notebook, output) in enumerate(zip(notebooks, outputs))}
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results[futures[future]] = result
+                icon = '❌' if result['status'] == 'failed' else '✅'
+                detail = f": {result['error']}" if result['error'] else ''
+                print(f"{icon} [{done}/{len(notebooks)}] {Path(result['notebook']).name} "
+                      f"({result['seconds']:.2f}s){detail}", flush=True)
+    return results
+
+
+def print_summary(results, wall_seconds):
+    """Print per-notebook timings, totals and log tails of failed conversions."""
+    print()
+    print("📋 Batch summary")
+    width = max(len(Path(result['notebook']).name) for result in results)
+    for result in results:
+        detail = result['error'] or result['output']
+        print(f"   {result['status']:<9} {result['seconds']:>7.2f}s  {Path(result['notebook']).name:<{width}}  {detail}")
+
+    failed = [result for result in results if result['status'] == 'failed']
+    busy_seconds = sum(result['seconds'] for result in results)
+    print()
+    print(f"   {len(results)} notebook(s): {len(results) - len(failed)} converted, {len(failed)} failed")
+    print(f"   Wall time {wall_seconds:.2f}s (sum of conversion times {busy_seconds:.2f}s)")
+
+    for result in failed:
+        print()
+        print(f"❌ {Path(result['notebook']).name}: {result['error']}")
+        for line in result['log'].splitlines()[-LOG_TAIL_LINES:]:
+            print(f"   {line}")
+
+
+def main():
+    args = sys.argv[1:]
+    patterns = []
+    workers = DEFAULT_WORKERS
+    output_dir = None
+    no_input = False
+    keep_md = False
+    use_nbconvert = False
+    summary_path = None
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--jobs' and i + 1 < len(args):
+            try:
+                workers = int(args[i + 1])
+            except ValueError:
+                workers = 0
+            if workers < 1:
+                print(f"❌ Error: --jobs must be a positive integer (got {args[i + 1]})")
+                sys.exit(1)
+            i += 2
+        elif args[i] == '--output-dir' and i + 1 < len(args):
+            output_dir = args[i + 1]
+            i += 2
+        elif args[i] == '--summary' and i + 1 < len(args):
+            summary_path = args[i + 1]
+            i += 2
+        elif args[i] == '--no-input':
+            no_input = True
+            i += 1
+        elif args[i] == '--keep-md':
+            keep_md = True
+            i += 1
+        elif args[i] == '--nbconvert':
+            use_nbconvert = True
+            i += 1
+        elif args[i].startswith('--'):
+            print(f"❌ Error: Unknown option: {args[i]}")
+            sys.exit(1)
+        else:
+            patterns.append(args[i])
+            i += 1
+
+    if not patterns:
+        print("Usage: notebook_pdf_batch.py <dir|glob|notebook> [...] [--jobs N] [--output-dir <dir>]")
+        print("                             [--no-input] [--keep-md] [--nbconvert] [--summary <summary.json>]")
+        print()
+        print("Examples:")
+        print("  notebook_pdf_batch.py notebook/labnote/")
+        print("  notebook_pdf_batch.py 'notebook/labnote/Exp0*.ipynb' --jobs 4 --output-dir reports/labnotes")
+        sys.exit(1)
+
+    notebooks, skipped = find_notebooks(patterns)
+    for path in skipped:
+        print(f"⏭️  Skipping {path.name} (same PDF name as {path.with_suffix('.ipynb').name})")
+    if not notebooks:
+        print("❌ Error: No .ipynb or .md notebooks found")
+        sys.exit(1)
+    try:
+        output_paths(notebooks, output_dir)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        print("💡 Convert them in separate runs, or without --output-dir")
+        sys.exit(1)
+
+    missing = missing_tools(notebooks, use_nbconvert)
+    if missing:
+        print("❌ Error: Missing required tools:")
+        for tool in missing:
+            print(f"  - {tool}")
+        sys.exit(1)
+
+    template = TEMPLATE_PATH
+    if not template.is_file():
+        print(f"⚠️  Warning: Template not found at {template}")
+        print("Using default pandoc + typst rendering")
+        template = None
+
+    print(f"🚀 Converting {len(notebooks)} notebook(s) with {min(workers, len(notebooks))} worker(s)")
+    start = time.perf_counter()
+    results = convert_batch(notebooks, workers, output_dir, no_input, keep_md, template, use_nbconvert)
+    wall_seconds = time.perf_counter() - start
+    print_summary(results, wall_seconds)
+
+    if summary_path:
+        Path(summary_path).write_text(json.dumps({
+            'wall_seconds': round(wall_seconds, 3),
+            'notebooks': results,
+        }, indent=2, ensure_ascii=False))
+        print()
+        print(f"💾 Summary written: {summary_path}")
+
+    sys.exit(1 if any(result['status'] == 'failed' for result in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,31 @@
 # notebook_to_pdf.sh - Export Jupyter notebook or Markdown to PDF using pandoc + typst
 #
 # Workflow:
-#   .ipynb → (nbconvert) → .md → (pandoc) → .pdf
+#   .ipynb → (ipynb_to_md.py) → .md → (pandoc) → .pdf
 #   .md → (pandoc) → .pdf
 #
+#   ipynb_to_md.py renders the notebook JSON with the stdlib only and
+#   produces the same markdown layout as `jupyter nbconvert --to markdown`;
+#   pass --nbconvert to use nbconvert instead.
+#
 # Usage:
 #   notebook_to_pdf.sh <input.ipynb|input.md> [output.pdf]
+#   notebook_to_pdf.sh <dir|notebook ...> [--jobs N] [--output-dir <dir>]   (batch, see notebook_pdf_batch.py)
 #
 # Examples:
 #   notebook_to_pdf.sh Exp01_analysis.ipynb
 #   notebook_to_pdf.sh Exp01_analysis.md
 #   notebook_to_pdf.sh Exp01_analysis.ipynb custom_output.pdf
+#   notebook_to_pdf.sh notebook/labnote/ --jobs 4
 #
 # Prerequisites:
-#   - jupyter/nbconvert (pip install nbconvert) - only for .ipynb files
+#   - python3 - only for .ipynb files
+#   - jupyter/nbconvert (pip install nbconvert) - only with --nbconvert
 #   - pandoc (https://pandoc.org/)
 #   - typst (https://typst.app/)
 #
 # Installation:
-#   uv pip install nbconvert  # only needed for .ipynb files
+#   uv pip install nbconvert  # only needed with --nbconvert
 #   brew install pandoc typst
 
 set -euo pipefail
@@ -52,24 +59,35 @@ usage() {
     echo "Options:"
     echo "  --keep-md    Keep intermediate markdown file (for .ipynb only)"
     echo "  --no-input   Exclude code cells from output (for .ipynb only)"
+    echo "  --nbconvert  Use jupyter nbconvert instead of ipynb_to_md.py (for .ipynb only)"
+    echo ""
+    echo "Batch mode (a directory, several notebooks, --jobs or --output-dir):"
+    echo "  --jobs N            Parallel conversions (default: CPU count, max 8)"
+    echo "  --output-dir DIR    Write all PDFs to DIR"
     echo ""
     echo "Examples:"
     echo "  $(basename "$0") Exp01_analysis.ipynb"
     echo "  $(basename "$0") Exp01_labnote.md"
     echo "  $(basename "$0") Exp01_analysis.ipynb report.pdf"
     echo "  $(basename "$0") --no-input Exp01_analysis.ipynb"
+    echo "  $(basename "$0") notebook/labnote/ --jobs 4"
     exit 1
 }
 
 # Check prerequisites
 check_prerequisites() {
     local input_file="$1"
+    local use_nbconvert="$2"
     local missing=()
 
-    # nbconvert is only needed for .ipynb files
+    # nbconvert is only needed for .ipynb files converted with --nbconvert
     if [[ "$input_file" =~ \.ipynb$ ]]; then
-        if ! command -v jupyter &> /dev/null && ! command -v jupyter-nbconvert &> /dev/null; then
-            missing+=("nbconvert (uv pip install nbconvert)")
+        if $use_nbconvert; then
+            if ! command -v jupyter &> /dev/null && ! command -v jupyter-nbconvert &> /dev/null; then
+                missing+=("nbconvert (uv pip install nbconvert)")
+            fi
+        elif ! command -v python3 &> /dev/null; then
+            missing+=("python3")
         fi
     fi
 
@@ -88,7 +106,7 @@ check_prerequisites() {
         done
         echo ""
         echo "Install with:"
-        if [[ "$input_file" =~ \.ipynb$ ]]; then
+        if [[ "$input_file" =~ \.ipynb$ ]] && $use_nbconvert; then
             echo "  uv pip install nbconvert"
         fi
         echo "  brew install pandoc typst"
@@ -98,8 +116,21 @@ check_prerequisites() {
 
 # Main function
 main() {
+    # Batch mode: hand over to the parallel converter
+    local positional=()
+    local arg
+    for arg in "$@"; do
+        [[ "$arg" == -* ]] || positional+=("$arg")
+    done
+    if [[ " $* " == *" --jobs "* || " $* " == *" --output-dir "* ]] \
+        || { [ ${#positional[@]} -ge 1 ] && [ -d "${positional[0]}" ]; } \
+        || { [ ${#positional[@]} -ge 2 ] && [[ ! "${positional[1]}" =~ \.pdf$ ]]; }; then
+        exec python3 "${SCRIPT_DIR}/notebook_pdf_batch.py" "$@"
+    fi
+
     local keep_md=false
     local no_input=false
+    local use_nbconvert=false
     local input_file=""
     local output_file=""
 
@@ -114,6 +145,10 @@ main() {
                 no_input=true
                 shift
                 ;;
+            --nbconvert)
+                use_nbconvert=true
+                shift
+                ;;
             -h|--help)
                 usage
                 ;;
@@ -181,7 +216,7 @@ main() {
     fi
 
     # Check prerequisites
-    check_prerequisites "$input_file"
+    check_prerequisites "$input_file" "$use_nbconvert"
 
     echo -e "${GREEN}Converting to PDF...${NC}"
     echo "  Input:  ${input_file}"
@@ -192,15 +227,23 @@ main() {
     if $is_notebook; then
         echo -e "${BLUE}Step 1/2: Converting notebook to markdown...${NC}"
 
-        local nbconvert_opts=("--to" "markdown" "--output" "$(basename "$md_file" .md)")
-        if $no_input; then
-            nbconvert_opts+=("--no-input")
-        fi
+        if $use_nbconvert; then
+            local nbconvert_opts=("--to" "markdown" "--output" "$(basename "$md_file" .md)")
+            if $no_input; then
+                nbconvert_opts+=("--no-input")
+            fi
 
-        if command -v jupyter-nbconvert &> /dev/null; then
-            jupyter-nbconvert "${nbconvert_opts[@]}" "$input_file"
+            if command -v jupyter-nbconvert &> /dev/null; then
+                jupyter-nbconvert "${nbconvert_opts[@]}" "$input_file"
+            else
+                jupyter nbconvert "${nbconvert_opts[@]}" "$input_file"
+            fi
         else
-            jupyter nbconvert "${nbconvert_opts[@]}" "$input_file"
+            local converter_opts=()
+            if $no_input; then
+                converter_opts+=("--no-input")
+            fi
+            python3 "${SCRIPT_DIR}/ipynb_to_md.py" "${converter_opts[@]+"${converter_opts[@]}"}" "$input_file"
         fi
 
         if [ ! -f "$md_file" ]; then
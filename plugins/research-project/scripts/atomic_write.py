@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Atomic Write - Replace files without exposing partial content
+
+Every cache, index and generated report is written through write_atomic:
+the content goes to a uniquely named temporary file (tempfile.mkstemp) in
+the destination directory, which is then renamed over the destination.
+Readers see either the old or the new file, and concurrent writers (the
+threads of batch_report.py, or several processes sharing one cache) never
+share a temporary file; the last rename wins.
+
+The research-project plugin ships an identical copy of this module, as
+each plugin must work when installed on its own.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+# mkstemp creates 0600 files; give renamed files the usual umask-based mode.
+# Read once at import, as querying the umask briefly changes it.
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def write_atomic(path, data):
+    """
+    Atomically replace path with data.
+
+    Args:
+        path: Destination file (its directory must exist)
+        data: str (written as UTF-8) or bytes
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), FILE_MODE)
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
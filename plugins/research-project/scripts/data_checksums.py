@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Data Checksums - Parallel checksum manifest for data/raw and data/processed
+
+data/raw/ is gitignored, so nothing else records whether the inputs behind
+an experiment changed or were corrupted. This tool keeps a manifest
+(data/checksums.tsv: path, size, mtime, digest; small enough to commit)
+and checks the files against it.
+
+- update: hash new files and files whose size or mtime changed, drop
+  entries for deleted files, and write the manifest
+- verify: re-hash only files whose size or mtime changed and report
+  modified, missing and new files (exit status 1 on modified or missing);
+  files found unchanged after a touch get their new mtime recorded.
+  --full re-hashes everything to catch silent corruption (bit rot)
+
+Files are hashed on a thread pool (hashlib releases the GIL), each thread
+streaming its file through one reusable buffer; large files are hashed
+straight from an mmap with sequential read-ahead, and dropped from the
+page cache afterwards so a multi-hundred-GB pass does not evict
+everything else. Memory stays at about one buffer per worker whatever
+the data size. An interrupted update keeps everything hashed so far.
+
+Usage:
+    data_checksums.py --project <path> update [--full] [options]
+    data_checksums.py --project <path> verify [--full] [options]
+
+Options:
+    --workers N         Hashing threads (default: CPU count, at most 32)
+    --algorithm NAME    sha256 (default), blake2b, sha1 or md5 (new manifests only)
+    --dirs A,B          Directories to cover (default: data/raw,data/processed)
+    --no-mmap           Read large files instead of mapping them (files that
+                        may shrink while being hashed, some network filesystems)
+
+Examples:
+    data_checksums.py --project . update
+    data_checksums.py --project . verify
+    data_checksums.py --project . verify --full --workers 8
+"""
+
+import hashlib
+import mmap
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from atomic_write import write_atomic
+
+
+MANIFEST_PATH = Path('data') / 'checksums.tsv'
+DEFAULT_DIRS = ('data/raw', 'data/processed')
+ALGORITHMS = ('sha256', 'blake2b', 'sha1', 'md5')
+DEFAULT_ALGORITHM = 'sha256'
+
+READ_SIZE = 4 * 1024 * 1024  # per-worker buffer and mmap slice
+MMAP_THRESHOLD = 64 * 1024 * 1024
+MAX_WORKERS = 32
+PENDING_PER_WORKER = 4  # files queued ahead of the pool
+PROGRESS_INTERVAL = 10.0
+SAVE_INTERVAL = 300.0  # an update also saves partial progress this often
+
+_buffers = threading.local()
+
+
+def default_workers():
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    return max(1, min(MAX_WORKERS, cores))
+
+
+def walk_files(project_dir, dirs=DEFAULT_DIRS):
+    """
+    Stat every non-hidden file below the given directories.
+
+    Symlinked files and directories are followed (each directory once).
+
+    Returns:
+        Dict of project-relative POSIX path -> (size, mtime_ns)
+    """
+    project_dir = Path(project_dir)
+    files = {}
+    seen = set()
+    stack = [Path(d).as_posix() for d in reversed(dirs)]
+    while stack:
+        rel = stack.pop()
+        try:
+            with os.scandir(project_dir / rel) as entries:
+                stat = os.stat(project_dir / rel)
+                if (stat.st_dev, stat.st_ino) in seen:
+                    continue
+                seen.add((stat.st_dev, stat.st_ino))
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    path = f'{rel}/{entry.name}'
+                    if entry.is_dir():
+                        stack.append(path)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files[path] = (stat.st_size, stat.st_mtime_ns)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+    return files
+
+
+def read_manifest(manifest_path):
+    """
+    Load a checksum manifest.
+
+    Returns:
+        (algorithm, entries) - entries maps path -> (size, mtime_ns, digest);
+        (None, {}) if the manifest does not exist
+
+    Raises:
+        ValueError: If a line is malformed
+    """
+    algorithm = None
+    entries = {}
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                line = line.rstrip('\n')
+                if line.startswith('# algorithm:'):
+                    algorithm = line.split(':', 1)[1].strip()
+                    continue
+                if not line or line.startswith('#') or line.startswith('path\t'):
+                    continue
+                fields = line.split('\t')
+                if len(fields) != 4:
+                    raise ValueError(f"{manifest_path}:{number}: expected 4 tab-separated fields")
+                path, size, mtime_ns, digest = fields
+                entries[path] = (int(size), int(mtime_ns), digest)
+    except FileNotFoundError:
+        return None, {}
+    return algorithm or DEFAULT_ALGORITHM, entries
+
+
+def write_manifest(manifest_path, algorithm, entries):
+    """Atomically write the manifest, sorted by path (diff-friendly)."""
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [f'# Checksums of data/ files, written by data_checksums.py\n# algorithm: {algorithm}\n',
+             'path\tsize\tmtime_ns\tdigest\n']
+    for path in sorted(entries):
+        size, mtime_ns, digest = entries[path]
+        lines.append(f'{path}\t{size}\t{mtime_ns}\t{digest}\n')
+    write_atomic(manifest_path, ''.join(lines))
+
+
+def hash_file(path, algorithm=DEFAULT_ALGORITHM, use_mmap=True):
+    """
+    Digest one file with bounded memory.
+
+    Files of MMAP_THRESHOLD bytes or more are hashed from an mmap in
+    READ_SIZE slices (no copy into Python); smaller ones are read into a
+    per-thread buffer. Either way the pages are dropped from the page
+    cache afterwards.
+
+    Returns:
+        (hex digest, bytes hashed)
+    """
+    digest = hashlib.new(algorithm)
+    size = 0
+    with open(path, 'rb', buffering=0) as f:
+        fd = f.fileno()
+        length = os.fstat(fd).st_size
+        if use_mmap and length >= MMAP_THRESHOLD:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, 'madvise'):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, len(mapped), READ_SIZE):
+                        digest.update(view[offset:offset + READ_SIZE])
+                finally:
+                    view.release()
+                size = len(mapped)
+        else:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            buffer = getattr(_buffers, 'buffer', None)
+            if buffer is None:
+                buffer = _buffers.buffer = bytearray(READ_SIZE)
+            view = memoryview(buffer)
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+                size += count
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    return digest.hexdigest(), size
+
+
+def hash_files(project_dir, paths, algorithm, workers, use_mmap=True, on_progress=None):
+    """
+    Hash files on a thread pool, yielding results as they complete.
+
+    At most workers * PENDING_PER_WORKER files are queued at a time, so
+    memory does not grow with the number of files.
+
+    Args:
+        project_dir: Project root the paths are relative to
+        paths: Relative paths, e.g. largest first for a balanced finish
+        algorithm: hashlib algorithm name
+        workers: Threads
+        use_mmap: See hash_file
+        on_progress: Optional callable(bytes_done, files_done)
+
+    Yields:
+        (path, digest, bytes) - digest is None and bytes the OSError if
+        the file could not be read
+    """
+    project_dir = Path(project_dir)
+    paths = iter(paths)
+    bytes_done = files_done = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+
+        def refill():
+            while len(running) < workers * PENDING_PER_WORKER:
+                path = next(paths, None)
+                if path is None:
+                    return
+                running[executor.submit(hash_file, project_dir / path, algorithm, use_mmap)] = path
+
+        refill()
+        try:
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = running.pop(future)
+                    try:
+                        digest, size = future.result()
+                    except OSError as e:
+                        yield path, None, e
+                        continue
+                    bytes_done += size
+                    files_done += 1
+                    if on_progress:
+                        on_progress(bytes_done, files_done)
+                    yield path, digest, size
+                refill()
+        finally:
+            for future in running:
+                future.cancel()
+
+
+def _gb(size):
+    return size / 1e9
+
+
+class _Progress:
+    """Prints a throughput line every PROGRESS_INTERVAL seconds."""
+
+    def __init__(self, total_bytes, total_files):
+        self.total_bytes = total_bytes
+        self.total_files = total_files
+        self.start = time.perf_counter()
+        self.last = self.start
+
+    def __call__(self, bytes_done, files_done):
+        now = time.perf_counter()
+        if now - self.last < PROGRESS_INTERVAL:
+            return
+        self.last = now
+        rate = _gb(bytes_done) / (now - self.start)
+        print(f"🔄 {_gb(bytes_done):.1f}/{_gb(self.total_bytes):.1f} GB, "
+              f"{files_done}/{self.total_files} file(s), {rate:.2f} GB/s", flush=True)
+
+
+def run(project_dir, mode, full=False, workers=None, algorithm=None, dirs=DEFAULT_DIRS, use_mmap=True):
+    """
+    Update or verify the checksum manifest.
+
+    Args:
+        project_dir: Project root
+        mode: 'update' or 'verify'
+        full: Re-hash files whose size and mtime are unchanged too
+        workers: Hashing threads (default: default_workers())
+        algorithm: Digest for a new manifest (an existing one keeps its own)
+        dirs: Directories to cover, relative to the project
+        use_mmap: See hash_file
+
+    Returns:
+        Dict with 'algorithm', 'files' (on disk), 'hashed', 'bytes',
+        'seconds', 'skipped' (trusted by size/mtime) and per-outcome path
+        lists 'new', 'changed', 'touched', 'modified', 'corrupted',
+        'missing', 'unreadable'
+
+    Raises:
+        ValueError: On an unknown algorithm or a malformed manifest
+    """
+    project_dir = Path(project_dir).resolve()
+    manifest_path = project_dir / MANIFEST_PATH
+    stored_algorithm, entries = read_manifest(manifest_path)
+    if stored_algorithm and algorithm and algorithm != stored_algorithm:
+        raise ValueError(f"{MANIFEST_PATH} uses {stored_algorithm}; delete it to switch to {algorithm}")
+    algorithm = stored_algorithm or algorithm or DEFAULT_ALGORITHM
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm} (choose from {', '.join(ALGORITHMS)})")
+    if stored_algorithm is None and mode == 'verify':
+        raise ValueError(f"No manifest at {MANIFEST_PATH}; run update first")
+
+    files = walk_files(project_dir, dirs)
+    covered = tuple(f'{Path(d).as_posix()}/' for d in dirs)
+    report = {key: [] for key in ('new', 'changed', 'touched', 'modified', 'corrupted', 'missing', 'unreadable')}
+    report['missing'] = sorted(path for path in entries if path not in files and path.startswith(covered))
+
+    to_hash = []
+    for path, (size, mtime_ns) in files.items():
+        entry = entries.get(path)
+        if entry is None:
+            if mode == 'verify':
+                report['new'].append(path)
+            else:
+                to_hash.append(path)
+        elif full or entry[:2] != (size, mtime_ns):
+            to_hash.append(path)
+    # Largest first, so one big file does not run alone at the end
+    to_hash.sort(key=lambda path: files[path][0], reverse=True)
+
+    workers = workers or default_workers()
+    progress = _Progress(sum(files[path][0] for path in to_hash), len(to_hash))
+    hashed = 0
+    hashed_bytes = 0
+    last_save = time.perf_counter()
+    try:
+        for path, digest, size in hash_files(project_dir, to_hash, algorithm, workers, use_mmap, progress):
+            if digest is None:
+                report['unreadable'].append(f'{path}: {size}')
+                continue
+            hashed += 1
+            hashed_bytes += size
+            entry = entries.get(path)
+            record = (*files[path], digest)
+            if entry is None:
+                report['new'].append(path)
+                entries[path] = record
+            elif entry[2] == digest:
+                if entry[:2] != files[path]:
+                    report['touched'].append(path)
+                    entries[path] = record
+            elif mode == 'update':
+                report['changed'].append(path)
+                entries[path] = record
+            elif entry[:2] == files[path]:
+                report['corrupted'].append(path)
+            else:
+                report['modified'].append(path)
+            if mode == 'update' and time.perf_counter() - last_save > SAVE_INTERVAL:
+                write_manifest(manifest_path, algorithm, entries)
+                last_save = time.perf_counter()
+    finally:
+        # Also on Ctrl-C: keep what was hashed (verify only records touched mtimes)
+        if mode == 'update':
+            for path in report['missing']:
+                entries.pop(path, None)
+        if mode == 'update' or report['touched']:
+            write_manifest(manifest_path, algorithm, entries)
+
+    for key in report:
+        report[key].sort()
+    report.update({
+        'algorithm': algorithm,
+        'files': len(files),
+        'hashed': hashed,
+        'bytes': hashed_bytes,
+        'skipped': len(files) - len(to_hash) - (len(report['new']) if mode == 'verify' else 0),
+        'seconds': time.perf_counter() - progress.start,
+        'workers': workers,
+    })
+    return report
+
+
+def _print_paths(icon, label, paths, limit=20):
+    if not paths:
+        return
+    print(f"{icon} {len(paths)} {label}:")
+    for path in paths[:limit]:
+        print(f"   {path}")
+    if len(paths) > limit:
+        print(f"   ... {len(paths) - limit} more")
+
+
+def main():
+    args = sys.argv[1:]
+    project = None
+    mode = None
+    full = False
+    workers = None
+    algorithm = None
+    dirs = DEFAULT_DIRS
+    use_mmap = True
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--project' and i + 1 < len(args):
+            project = args[i + 1]
+            i += 2
+        elif args[i] == '--workers' and i + 1 < len(args):
+            try:
+                workers = int(args[i + 1])
+            except ValueError:
+                workers = 0
+            if workers < 1:
+                print(f"❌ Error: --workers must be a positive integer (got {args[i + 1]})")
+                sys.exit(1)
+            i += 2
+        elif args[i] == '--algorithm' and i + 1 < len(args):
+            algorithm = args[i + 1]
+            i += 2
+        elif args[i] == '--dirs' and i + 1 < len(args):
+            dirs = tuple(d for d in args[i + 1].split(',') if d)
+            i += 2
+        elif args[i] == '--full':
+            full = True
+            i += 1
+        elif args[i] == '--no-mmap':
+            use_mmap = False
+            i += 1
+        elif args[i] in ('update', 'verify') and mode is None:
+            mode = args[i]
+            i += 1
+        else:
+            print(f"❌ Error: Unknown option: {args[i]}")
+            sys.exit(1)
+
+    if project is None or mode is None:
+        print("Usage: data_checksums.py --project <path> update|verify [--full] [--workers N] "
+              "[--algorithm NAME] [--dirs A,B] [--no-mmap]")
+        sys.exit(1)
+
+    try:
+        report = run(project, mode, full, workers, algorithm, dirs, use_mmap)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print()
+        print("⏹️  Interrupted" + (f"; progress saved to {MANIFEST_PATH}" if mode == 'update' else ''))
+        sys.exit(130)
+
+    seconds = report['seconds']
+    rate = _gb(report['bytes']) / seconds if seconds > 0 else 0.0
+    print(f"📋 {report['files']} file(s) under {', '.join(dirs)}; {report['skipped']} unchanged by size/mtime")
+    print(f"✅ Hashed {report['hashed']} file(s), {_gb(report['bytes']):.2f} GB in {seconds:.1f}s "
+          f"({rate:.2f} GB/s, {report['workers']} worker(s), {report['algorithm']})")
+
+    if mode == 'update':
+        _print_paths('➕', 'new file(s) recorded', report['new'])
+        _print_paths('🔄', 'changed file(s) re-recorded', report['changed'])
+        _print_paths('➖', 'deleted file(s) dropped', report['missing'])
+        _print_paths('❌', 'unreadable file(s)', report['unreadable'])
+        print(f"💾 Manifest: {MANIFEST_PATH}")
+        sys.exit(1 if report['unreadable'] else 0)
+
+    _print_paths('❌', 'modified file(s) (content differs from the manifest)', report['modified'])
+    _print_paths('❌', 'corrupted file(s) (same size and mtime, different content)', report['corrupted'])
+    _print_paths('❌', 'missing file(s)', report['missing'])
+    _print_paths('❌', 'unreadable file(s)', report['unreadable'])
+    _print_paths('⚠️ ', 'new file(s) not in the manifest (run update to record)', report['new'])
+    if report['touched']:
+        print(f"💡 {len(report['touched'])} file(s) had a new mtime but unchanged content; mtimes updated")
+    failed = report['modified'] or report['corrupted'] or report['missing'] or report['unreadable']
+    if not failed:
+        print("✅ All recorded files verified")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
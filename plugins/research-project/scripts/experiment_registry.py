@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Experiment Registry - Indexed experiment ID → labnote/results mapping
+
+Keeps a SQLite index (`.experiments.sqlite` in the project root) of every
+experiment: ID, labnote path, results directory, status and hypothesis.
+Next-ID allocation runs in an exclusive transaction, so parallel notebook
+creation cannot hand out the same number twice.
+
+The registry is rebuilt incrementally from the filesystem: notebook/labnote/
+and results/ are only listed again when their directory mtime changed, and
+registered labnotes are checked with one stat each.
+
+What the filesystem cannot tell - reserved numbers without a labnote yet
+and statuses set by hand (complete, abandoned) - is also written to
+notebook/experiments.tsv, which is committed with the project. The SQLite
+file is a local cache: a fresh clone rebuilds it from the labnotes, the
+results tree and that file. Hypotheses are re-extracted from the labnotes
+by init_report.py.
+
+Usage:
+    experiment_registry.py --project <path> sync
+    experiment_registry.py --project <path> next-id [--description <text>]
+    experiment_registry.py --project <path> list
+    experiment_registry.py --project <path> show <Exp##>
+    experiment_registry.py --project <path> set-status <Exp##> <status>
+
+Examples:
+    experiment_registry.py --project . next-id --description "rnaseq-de"
+    experiment_registry.py --project . set-status Exp03 complete
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from atomic_write import write_atomic
+
+
+REGISTRY_FILENAME = '.experiments.sqlite'
+
+STATUSES = ('allocated', 'active', 'complete', 'abandoned', 'missing')
+
+# Statuses the filesystem cannot tell, kept in a committed file
+STATUS_FILENAME = Path('notebook') / 'experiments.tsv'
+STATUS_COLUMNS = ('exp_id', 'status', 'description')
+RECORDED_STATUSES = ('allocated', 'complete', 'abandoned')
+
+LABNOTE_SUFFIXES = ('.ipynb', '.md')
+
+# Tolerates common mis-namings: exp3_x, Exp-03-x, EXP03 x, Exp03.ipynb
+_LABNOTE_NAME = re.compile(r'^exp[-_ ]?(\d+)(?:[-_ ]+(.*))?$', re.IGNORECASE)
+_RESULTS_NAME = re.compile(r'^exp[-_ ]?(\d+)', re.IGNORECASE)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS experiments (
+    number INTEGER PRIMARY KEY,
+    exp_id TEXT NOT NULL UNIQUE,
+    description TEXT,
+    labnote_path TEXT UNIQUE,
+    labnote_size INTEGER,
+    labnote_mtime_ns INTEGER,
+    results_dir TEXT,
+    status TEXT NOT NULL DEFAULT 'active',
+    hypothesis TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scan_state (
+    directory TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+'''
+
+
+def format_exp_id(number):
+    """Canonical experiment ID (Exp01, Exp02, ..., Exp100)."""
+    return f'Exp{number:02d}'
+
+
+def parse_labnote_name(filename):
+    """
+    Parse a labnote filename into (number, description).
+
+    Args:
+        filename: File name such as "Exp03_rnaseq-de.ipynb"
+
+    Returns:
+        (int, str) or None if the name carries no experiment number
+    """
+    path = Path(filename)
+    if path.suffix not in LABNOTE_SUFFIXES:
+        return None
+    match = _LABNOTE_NAME.match(path.stem)
+    if not match:
+        return None
+    description = (match.group(2) or '').replace('-', ' ').replace('_', ' ').strip()
+    return int(match.group(1)), description
+
+
+def find_project_root(start):
+    """
+    Walk up from start to the directory holding STEERING.md.
+
+    Args:
+        start: Path inside the project
+
+    Returns:
+        Path of project root, or None
+    """
+    path = Path(start).resolve()
+    for candidate in (path, *path.parents):
+        if (candidate / 'STEERING.md').exists():
+            return candidate
+    return None
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def read_status_file(path):
+    """
+    Read recorded experiment statuses.
+
+    Args:
+        path: notebook/experiments.tsv
+
+    Returns:
+        dict of experiment number -> (status, description); empty if the
+        file does not exist. Rows with an unknown ID or status are skipped.
+    """
+    recorded = {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return recorded
+    for line in lines[1:]:
+        fields = line.split('\t')
+        match = _RESULTS_NAME.match(fields[0])
+        if match and len(fields) >= 2 and fields[1] in RECORDED_STATUSES:
+            recorded[int(match.group(1))] = (fields[1], fields[2] if len(fields) > 2 else '')
+    return recorded
+
+
+class ExperimentRegistry:
+    """
+    SQLite-backed experiment index for one project.
+
+    Args:
+        project_dir: Project root (where STEERING.md lives)
+    """
+
+    def __init__(self, project_dir):
+        self.project_dir = Path(project_dir).resolve()
+        self.db_path = self.project_dir / REGISTRY_FILENAME
+        self.status_path = self.project_dir / STATUS_FILENAME
+        # isolation_level=None: transactions are managed explicitly below
+        self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _relative(self, path):
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.project_dir).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _dir_changed(self, directory):
+        """Return the directory's (or file's) mtime if it changed since the last scan, else None."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        row = self._conn.execute(
+            'SELECT mtime_ns FROM scan_state WHERE directory = ?', (self._relative(directory),)
+        ).fetchone()
+        if row is not None and row['mtime_ns'] == mtime_ns:
+            return None
+        return mtime_ns
+
+    def _mark_scanned(self, directory, mtime_ns):
+        self._conn.execute(
+            'INSERT OR REPLACE INTO scan_state (directory, mtime_ns) VALUES (?, ?)',
+            (self._relative(directory), mtime_ns),
+        )
+
+    def sync(self):
+        """
+        Incrementally update the registry from notebook/labnote/ and results/.
+
+        Returns:
+            Number of experiments added or changed
+        """
+        labnote_dir = self.project_dir / 'notebook' / 'labnote'
+        results_dir = self.project_dir / 'results'
+        changed = 0
+        touched = []  # experiments whose labnote was added or edited
+
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Recorded statuses first: labnotes found below turn reservations active
+            changed += self._refresh_statuses()
+
+            mtime_ns = self._dir_changed(labnote_dir)
+            if mtime_ns is not None:
+                changed += self._scan_labnotes(labnote_dir, touched)
+                self._mark_scanned(labnote_dir, mtime_ns)
+            else:
+                changed += self._restat_labnotes(touched)
+
+            mtime_ns = self._dir_changed(results_dir)
+            if mtime_ns is not None:
+                changed += self._scan_results(results_dir)
+                self._mark_scanned(results_dir, mtime_ns)
+            elif touched:
+                # results/ is unchanged, but a labnote may be newer than its
+                # results/exp## directory
+                changed += self._link_results(results_dir, touched)
+
+            # Also drops reservations whose labnote now exists
+            self._save_statuses()
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return changed
+
+    def _refresh_statuses(self):
+        """
+        Apply notebook/experiments.tsv to the index if it changed (a fresh
+        clone, a pull). The file wins: a recorded status missing from it
+        falls back to what the filesystem tells.
+
+        Returns:
+            Number of experiments added or changed
+        """
+        mtime_ns = self._dir_changed(self.status_path)
+        if mtime_ns is None:
+            return 0
+        recorded = read_status_file(self.status_path)
+        changed = 0
+        rows = {row['number']: row for row in self._conn.execute('SELECT * FROM experiments')}
+        for number, row in rows.items():
+            if row['status'] in RECORDED_STATUSES and number not in recorded:
+                self._conn.execute(
+                    'UPDATE experiments SET status = ?, updated_at = ? WHERE number = ?',
+                    ('active' if row['labnote_path'] else 'missing', _now(), number),
+                )
+                changed += 1
+        for number, (status, description) in recorded.items():
+            row = rows.get(number)
+            if row is None:
+                self._conn.execute(
+                    'INSERT INTO experiments (number, exp_id, description, status, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (number, format_exp_id(number), description, status, _now()),
+                )
+                changed += 1
+            elif row['status'] != status and not (status == 'allocated' and row['labnote_path']):
+                self._conn.execute(
+                    'UPDATE experiments SET status = ?, updated_at = ? WHERE number = ?',
+                    (status, _now(), number),
+                )
+                changed += 1
+        self._mark_scanned(self.status_path, mtime_ns)
+        return changed
+
+    def _save_statuses(self):
+        """Write the statuses the filesystem cannot tell to notebook/experiments.tsv."""
+        rows = self._conn.execute(
+            'SELECT exp_id, status, description FROM experiments WHERE status IN (?, ?, ?) '
+            "AND NOT (status = 'allocated' AND labnote_path IS NOT NULL) ORDER BY number",
+            RECORDED_STATUSES,
+        ).fetchall()
+        lines = ['\t'.join(STATUS_COLUMNS)]
+        lines.extend(f"{row['exp_id']}\t{row['status']}\t{' '.join((row['description'] or '').split())}"
+                     for row in rows)
+        content = '\n'.join(lines) + '\n'
+        try:
+            if self.status_path.read_text(encoding='utf-8') == content:
+                return
+        except FileNotFoundError:
+            if not rows:
+                return
+        self.status_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.status_path, content)
+        # Our own write: nothing to load back on the next sync
+        self._mark_scanned(self.status_path, os.stat(self.status_path).st_mtime_ns)
+
+    def _scan_labnotes(self, labnote_dir, touched):
+        found = {}
+        with os.scandir(labnote_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                parsed = parse_labnote_name(entry.name)
+                if parsed is None or parsed[0] == 0:  # Exp00 is the template
+                    continue
+                number, description = parsed
+                # Prefer .ipynb when both formats exist for one experiment
+                if number in found and found[number][0].name.endswith('.ipynb'):
+                    continue
+                found[number] = (entry, description)
+
+        changed = 0
+        rows = {row['number']: row for row in self._conn.execute('SELECT * FROM experiments')}
+        for number, (entry, description) in found.items():
+            stat = entry.stat()
+            labnote_path = self._relative(entry.path)
+            row = rows.get(number)
+            if row is None:
+                self._conn.execute(
+                    'INSERT INTO experiments (number, exp_id, description, labnote_path, labnote_size, '
+                    'labnote_mtime_ns, status, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (number, format_exp_id(number), description, labnote_path,
+                     stat.st_size, stat.st_mtime_ns, 'active', _now()),
+                )
+                touched.append(number)
+                changed += 1
+            elif (row['labnote_path'], row['labnote_size'], row['labnote_mtime_ns']) != (
+                    labnote_path, stat.st_size, stat.st_mtime_ns):
+                status = 'active' if row['status'] in ('allocated', 'missing') else row['status']
+                self._conn.execute(
+                    'UPDATE experiments SET description = ?, labnote_path = ?, labnote_size = ?, '
+                    'labnote_mtime_ns = ?, status = ?, updated_at = ? WHERE number = ?',
+                    (description or row['description'], labnote_path, stat.st_size,
+                     stat.st_mtime_ns, status, _now(), number),
+                )
+                touched.append(number)
+                changed += 1
+
+        for number, row in rows.items():
+            if number not in found and row['labnote_path'] is not None:
+                self._conn.execute(
+                    "UPDATE experiments SET labnote_path = NULL, status = 'missing', updated_at = ? "
+                    'WHERE number = ?',
+                    (_now(), number),
+                )
+                changed += 1
+        return changed
+
+    def _restat_labnotes(self, touched):
+        """Directory unchanged: only check registered labnotes for edits."""
+        changed = 0
+        rows = self._conn.execute(
+            'SELECT number, labnote_path, labnote_size, labnote_mtime_ns FROM experiments '
+            'WHERE labnote_path IS NOT NULL'
+        ).fetchall()
+        for row in rows:
+            try:
+                stat = os.stat(self.project_dir / row['labnote_path'])
+            except FileNotFoundError:
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (row['labnote_size'], row['labnote_mtime_ns']):
+                self._conn.execute(
+                    'UPDATE experiments SET labnote_size = ?, labnote_mtime_ns = ?, updated_at = ? '
+                    'WHERE number = ?',
+                    (stat.st_size, stat.st_mtime_ns, _now(), row['number']),
+                )
+                touched.append(row['number'])
+                changed += 1
+        return changed
+
+    def _scan_results(self, results_dir):
+        found = {}
+        with os.scandir(results_dir) as entries:
+            for entry in entries:
+                match = _RESULTS_NAME.match(entry.name)
+                if match and entry.is_dir():
+                    found.setdefault(int(match.group(1)), self._relative(entry.path))
+
+        changed = 0
+        for row in self._conn.execute('SELECT number, results_dir FROM experiments').fetchall():
+            results = found.get(row['number'])
+            if results != row['results_dir']:
+                self._conn.execute(
+                    'UPDATE experiments SET results_dir = ?, updated_at = ? WHERE number = ?',
+                    (results, _now(), row['number']),
+                )
+                changed += 1
+        return changed
+
+    def _link_results(self, results_dir, numbers):
+        """Stat results/exp## directly for experiments that still have no results directory."""
+        changed = 0
+        for number in numbers:
+            row = self._conn.execute('SELECT results_dir FROM experiments WHERE number = ?', (number,)).fetchone()
+            path = results_dir / format_exp_id(number).lower()
+            if row['results_dir'] is None and path.is_dir():
+                self._conn.execute(
+                    'UPDATE experiments SET results_dir = ?, updated_at = ? WHERE number = ?',
+                    (self._relative(path), _now(), number),
+                )
+                changed += 1
+        return changed
+
+    def allocate(self, description=''):
+        """
+        Atomically reserve the next experiment number.
+
+        Args:
+            description: Short experiment description
+
+        Returns:
+            Allocated experiment ID (e.g. "Exp04")
+        """
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Numbers reserved in other clones count too
+            self._refresh_statuses()
+            row = self._conn.execute('SELECT COALESCE(MAX(number), 0) AS last FROM experiments').fetchone()
+            number = row['last'] + 1
+            exp_id = format_exp_id(number)
+            self._conn.execute(
+                'INSERT INTO experiments (number, exp_id, description, status, updated_at) '
+                "VALUES (?, ?, ?, 'allocated', ?)",
+                (number, exp_id, description, _now()),
+            )
+            # Inside the transaction, so concurrent allocations write in turn
+            self._save_statuses()
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return exp_id
+
+    def get(self, exp_id):
+        """Return the experiment row as a dict, or None."""
+        match = _RESULTS_NAME.match(exp_id)
+        if not match:
+            return None
+        row = self._conn.execute('SELECT * FROM experiments WHERE number = ?', (int(match.group(1)),)).fetchone()
+        return dict(row) if row else None
+
+    def find_labnote(self, labnote_path):
+        """Return the experiment registered for a labnote path, or None."""
+        row = self._conn.execute(
+            'SELECT * FROM experiments WHERE labnote_path = ?', (self._relative(labnote_path),)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def list(self):
+        """Return all experiments ordered by number."""
+        return [dict(row) for row in self._conn.execute('SELECT * FROM experiments ORDER BY number')]
+
+    def set_status(self, exp_id, status):
+        """
+        Set an experiment's status (recorded in notebook/experiments.tsv).
+
+        Returns:
+            True if the experiment exists
+        """
+        if status not in STATUSES:
+            raise ValueError(f'Unknown status {status!r} (expected one of: {", ".join(STATUSES)})')
+        experiment = self.get(exp_id)
+        if experiment is None:
+            return False
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._refresh_statuses()
+            self._conn.execute(
+                'UPDATE experiments SET status = ?, updated_at = ? WHERE number = ?',
+                (status, _now(), experiment['number']),
+            )
+            self._save_statuses()
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        return True
+
+    def set_hypothesis(self, exp_id, hypothesis):
+        """Record the hypothesis statement extracted from an experiment's labnote."""
+        experiment = self.get(exp_id)
+        if experiment is None or experiment['hypothesis'] == hypothesis:
+            return
+        self._conn.execute(
+            'UPDATE experiments SET hypothesis = ?, updated_at = ? WHERE number = ?',
+            (hypothesis, _now(), experiment['number']),
+        )
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 3 or args[0] != '--project':
+        print("Usage: experiment_registry.py --project <path> <command>")
+        print()
+        print("Commands:")
+        print("  sync                          Update registry from notebook/labnote/ and results/")
+        print("  next-id [--description TEXT]  Atomically allocate the next experiment ID")
+        print("  list                          List registered experiments")
+        print("  show <Exp##>                  Show one experiment as JSON")
+        print("  set-status <Exp##> <status>   Set status (" + ", ".join(STATUSES) + ")")
+        sys.exit(1)
+
+    project_dir = Path(args[1])
+    command = args[2]
+    rest = args[3:]
+
+    if not (project_dir / 'STEERING.md').exists():
+        print(f"❌ Error: Not a research project (no STEERING.md): {project_dir.resolve()}")
+        sys.exit(1)
+
+    with ExperimentRegistry(project_dir) as registry:
+        if command == 'sync':
+            changed = registry.sync()
+            print(f"✅ Registry synced: {changed} experiment(s) updated")
+        elif command == 'next-id':
+            description = rest[1] if len(rest) > 1 and rest[0] == '--description' else ''
+            registry.sync()
+            print(registry.allocate(description))
+        elif command == 'list':
+            registry.sync()
+            for experiment in registry.list():
+                print(f"{experiment['exp_id']:<7} {experiment['status']:<10} "
+                      f"{experiment['labnote_path'] or '-':<50} {experiment['results_dir'] or '-'}")
+        elif command == 'show' and rest:
+            registry.sync()
+            experiment = registry.get(rest[0])
+            if experiment is None:
+                print(f"❌ Error: Unknown experiment: {rest[0]}")
+                sys.exit(1)
+            print(json.dumps(experiment, indent=2, ensure_ascii=False))
+        elif command == 'set-status' and len(rest) == 2:
+            try:
+                found = registry.set_status(rest[0], rest[1])
+            except ValueError as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
+            if not found:
+                print(f"❌ Error: Unknown experiment: {rest[0]}")
+                sys.exit(1)
+            print(f"✅ {rest[0]}: {rest[1]}")
+        else:
+            print(f"❌ Error: Unknown command: {' '.join(args[2:])}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
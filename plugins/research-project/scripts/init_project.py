@@ -3,16 +3,56 @@
 Research Project Initializer - Creates standardized bioinformatics project structure
 
 Usage:
-    init_project.py --path <path>
+    init_project.py --path <path> [--upgrade] [--profile [trace.json]] [--chrome-trace <events.json>]
+    init_project.py --manifest <projects.yaml|projects.json> [--upgrade] [--workers N] [--quiet] [--summary <summary.json>]
+
+A new project is built in a staging directory and moved into place in
+one rename. Each project records its template variables and template
+hashes in .scaffold.json, so re-runs read that one file instead of
+probing every path. --upgrade rewrites files whose template changed
+since they were written, unless they were edited locally.
+
+Manifest (paths are relative to the manifest file):
+    defaults:                          # template variables for every project (optional)
+      description: Per-cohort RNA-seq analysis
+    projects:
+      - path: cohorts/cohortA
+        research_question: Does treatment X change expression in cohort A?
+        samples: [A01, A02, A03]
+      - path: cohorts/cohortB
+        project_name: cohortB-rnaseq   # default: directory name
+
+Template variables: project_name, description, research_question, samples,
+cores, mem_mb (default: this machine; Snakemake threads, memory, scatter
+chunks and the local profile are derived from them).
+A bare list of paths is accepted too. JSON manifests use the same keys;
+YAML manifests need PyYAML. Existing files are never overwritten
+(except unedited outdated templates with --upgrade).
 
 Examples:
     init_project.py --path .
     init_project.py --path /path/to/new/project
+    init_project.py --path /shared/fs/project --profile trace.json
+    init_project.py --path . --upgrade
+    init_project.py --manifest cohorts.yaml --workers 32 --summary scaffold_summary.json
 """
 
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
 from pathlib import Path
 
+from atomic_write import write_atomic
+from experiment_registry import REGISTRY_FILENAME, ExperimentRegistry
+from phase_trace import configure_profiling, tracer
+from sample_sheet import SHEET_PATH, discover_samples, samples_yaml, write_sample_sheet
+
 
 STEERING_TEMPLATE = """# Project Steering
 
@@ -23,7 +63,7 @@ STEERING_TEMPLATE = """# Project Steering
 
 ## Research Question
 
-[TODO: Define your main research question]
+{research_question}
 
 ## Current Priorities
 
@@ -365,6 +405,24 @@ env/
 # Data (exclude raw data to avoid large files)
 data/raw/
 
+# Report generation cache
+notebook/report/.cache/
+
+# Experiment registry cache (rebuilt from notebook/labnote/, results/ and notebook/experiments.tsv)
+.experiments.sqlite
+
+# Sample discovery cache (data/raw/ listings)
+.sample_scan.json
+
+# Status summary cache (project_status.py)
+.status_cache.json
+
+# Full-text search index (search_index.py)
+.search_index.sqlite
+
+# Files being scaffolded by init_project.py (present only while it runs)
+.scaffold-staging/
+
 # IDE
 .vscode/
 .idea/
@@ -374,11 +432,11 @@ README_TEMPLATE = """# {project_name}
 
 ## Overview
 
-[TODO: Describe your research project]
+{description}
 
 ## Research Question
 
-[TODO: Define your main research question]
+{research_question}
 
 ## Structure
 
@@ -423,7 +481,7 @@ uv sync
 PYPROJECT_TEMPLATE = """[project]
 name = "{project_name}"
 version = "0.1.0"
-description = "[TODO: Project description]"
+description = {description_toml}
 readme = "README.md"
 requires-python = ">=3.10"
 dependencies = [
@@ -443,42 +501,203 @@ dev-dependencies = [
 
 SNAKEFILE_TEMPLATE = """# Snakemake workflow for {project_name}
 #
+# Scatter-gather skeleton: every sample is split into scatter.chunks pieces
+# that run in parallel and are gathered per sample, and per-region steps fan
+# out over config["regions"] and are gathered into one table. Threads and
+# memory come from config.yaml (derived from {cores} cores / {mem_gb} GB RAM);
+# profiles/default caps the whole run at this machine's cores and memory.
+#
 # Usage:
-#   snakemake --cores 4
-#   snakemake --cores 4 --dry-run
+#   snakemake                              # Snakemake 8+ loads profiles/default
+#   snakemake --profile profiles/default   # Snakemake 7
+#   snakemake --dry-run
 #
 # Configuration:
-#   Edit config.yaml to set parameters
+#   Edit config.yaml to set samples, regions, chunk count and resources.
+#   New rules: threads: RES["heavy"]["threads"] plus the matching resources.
+#   Run from src/workflow; rule paths (data/raw, results/, tmp/) are relative
+#   to the project root, as are the FASTQ/BAM paths in the sample sheet.
+
+import csv
+import os
 
 configfile: "config.yaml"
 
+SAMPLES = config["samples"]
+REGIONS = config["regions"]
+CHUNKS = ["%03d" % i for i in range(config["scatter"]["chunks"])]
+RES = config["resources"]
+
+# Sample units (lanes / runs) from the sheet written by sample_sheet.py
+UNITS = {{}}
+if os.path.exists(config.get("sample_sheet", "")):
+    with open(config["sample_sheet"], newline="") as f:
+        for row in csv.DictReader(f, delimiter="\\t"):
+            UNITS.setdefault(row["sample"], []).append(row)
+
+workdir: "../.."
+
+
+def sample_files(wildcards):
+    \"\"\"Every unit's fq1, fq2 and bam for a sample; data/raw/<sample>.fastq if the sheet has none.\"\"\"
+    units = UNITS.get(wildcards.sample)
+    if not units:
+        return [f"data/raw/{{wildcards.sample}}.fastq"]
+    return [unit[column] for unit in units for column in ("fq1", "fq2", "bam") if unit.get(column)]
+
+
+wildcard_constraints:
+    sample=r"[^/]+",
+    region=r"[^/]+",
+    chunk=r"\\d+",
+
 
 rule all:
     input:
-        # Define final outputs here
-        expand("results/{{sample}}_result.txt", sample=config["samples"])
+        expand("results/{{sample}}_result.txt", sample=SAMPLES),
+        "results/regions_summary.tsv",
+
 
+# Per-sample scatter-gather -------------------------------------------------
 
-rule example_rule:
+rule split_sample:
     input:
-        "data/raw/{{sample}}.fastq"
+        sample_files
     output:
-        "results/{{sample}}_result.txt"
+        temp(expand("tmp/{{{{sample}}}}/chunk_{{chunk}}.fastq", chunk=CHUNKS))
+    params:
+        chunks=len(CHUNKS),
+        lines_per_record=config["scatter"]["lines_per_record"],
+        prefix="tmp/{{sample}}/chunk_",
+    threads: 1
+    resources:
+        mem_mb=RES["light"]["mem_mb"],
+        runtime=RES["light"]["runtime"],
+    shell:
+        # Units are concatenated (gzip or plain FASTQ, BAM/CRAM via samtools);
+        # whole records go round-robin into the chunks; empty chunks still exist
+        \"\"\"
+        touch {{output}}
+        for f in {{input}}; do
+            case "$f" in
+                *.bam|*.cram) samtools fastq "$f" ;;
+                *) gzip -cdf "$f" ;;
+            esac
+        done | awk -v n={{params.chunks}} -v r={{params.lines_per_record}} -v prefix={{params.prefix}} \\\\
+            '{{{{ f = sprintf("%s%03d.fastq", prefix, int((NR - 1) / r) % n); print > f }}}}'
+        \"\"\"
+
+
+rule process_chunk:
+    input:
+        "tmp/{{sample}}/chunk_{{chunk}}.fastq"
+    output:
+        temp("tmp/{{sample}}/chunk_{{chunk}}.result.txt")
     params:
         param1=config.get("param1", "default")
-    threads: 4
+    threads: RES["chunk"]["threads"]
+    resources:
+        mem_mb=RES["chunk"]["mem_mb"],
+        runtime=RES["chunk"]["runtime"],
+    shell:
+        \"\"\"
+        echo "{{wildcards.sample}} chunk {{wildcards.chunk}}: $(wc -l < {{input}}) lines ({{threads}} threads)" > {{output}}
+        \"\"\"
+
+
+rule gather_sample:
+    input:
+        expand("tmp/{{{{sample}}}}/chunk_{{chunk}}.result.txt", chunk=CHUNKS)
+    output:
+        "results/{{sample}}_result.txt"
+    threads: 1
+    resources:
+        mem_mb=RES["light"]["mem_mb"],
+        runtime=RES["light"]["runtime"],
+    shell:
+        "cat {{input}} > {{output}}"
+
+
+# Per-region scatter-gather -------------------------------------------------
+# e.g. per-chromosome calling; pipe() streams each region's producer into its
+# consumer (both run at once) without an intermediate file on disk.
+
+rule scan_region:
+    input:
+        expand("results/{{sample}}_result.txt", sample=SAMPLES)
+    output:
+        pipe("tmp/regions/{{region}}.pipe")
+    threads: 1
+    resources:
+        mem_mb=RES["light"]["mem_mb"],
+        runtime=RES["light"]["runtime"],
     shell:
         \"\"\"
-        echo "Processing {{wildcards.sample}}" > {{output}}
+        for f in {{input}}; do printf '%s\\\\t%s\\\\n' {{wildcards.region}} "$f"; done > {{output}}
         \"\"\"
+
+
+rule summarize_region:
+    input:
+        "tmp/regions/{{region}}.pipe"
+    output:
+        temp("tmp/regions/{{region}}.tsv")
+    threads: 1
+    resources:
+        mem_mb=RES["light"]["mem_mb"],
+        runtime=RES["light"]["runtime"],
+    shell:
+        "sort {{input}} > {{output}}"
+
+
+rule gather_regions:
+    input:
+        expand("tmp/regions/{{region}}.tsv", region=REGIONS)
+    output:
+        "results/regions_summary.tsv"
+    threads: 1
+    resources:
+        mem_mb=RES["light"]["mem_mb"],
+        runtime=RES["light"]["runtime"],
+    shell:
+        "cat {{input}} > {{output}}"
 """
 
 SNAKEMAKE_CONFIG_TEMPLATE = """# Snakemake configuration for {project_name}
 
-# Sample list
+# Sample list. sample_sheet.py fills it from data/raw/ and writes the per-unit
+# FASTQ/BAM paths to the sample sheet; samples without sheet rows are read
+# from data/raw/<sample>.fastq.
 samples:
-  - sample1
-  - sample2
+{samples_yaml}
+sample_sheet: "samples.tsv"
+
+# Regions for per-region steps (e.g. chromosomes)
+regions:
+  - region1
+  - region2
+
+# Scatter-gather: each sample is split into `chunks` pieces of whole records.
+# {chunks} chunks x {chunk_threads} thread(s) keep all {cores} cores busy even for a single sample.
+scatter:
+  chunks: {chunks}
+  lines_per_record: 4  # FASTQ
+
+# Per-job threads, memory (mem_mb) and runtime (minutes), derived from
+# {cores} cores and {mem_gb} GB RAM ({mem_per_core_mb} MB per core)
+resources:
+  light:   # split / gather / streaming steps
+    threads: 1
+    mem_mb: {light_mem_mb}
+    runtime: 30
+  chunk:   # one scatter chunk
+    threads: {chunk_threads}
+    mem_mb: {chunk_mem_mb}
+    runtime: 60
+  heavy:   # whole-sample steps (alignment, assembly, ...)
+    threads: {heavy_threads}
+    mem_mb: {heavy_mem_mb}
+    runtime: 240
 
 # Parameters
 param1: "default_value"
@@ -488,26 +707,150 @@ data_dir: "data/raw"
 results_dir: "results"
 """
 
+SNAKEMAKE_PROFILE_TEMPLATE = """# Local execution profile for {project_name}
+# Derived from {cores} cores and {mem_gb} GB RAM. Snakemake 8+ loads
+# profiles/default next to the Snakefile automatically; with Snakemake 7
+# pass --profile profiles/default.
+cores: {cores}
+resources:
+  - mem_mb={mem_budget_mb}
+default-resources:
+  - mem_mb={light_mem_mb}
+  - runtime=60
+keep-going: true
+rerun-incomplete: true
+printshellcmds: true
+latency-wait: 5
+"""
+
+
+# Per-project template variables (manifest keys) and their defaults
+TEMPLATE_VARIABLES = {
+    'project_name': None,  # default: the directory name
+    'description': None,  # default: TODO placeholders
+    'research_question': '[TODO: Define your main research question]',
+    'samples': ['sample1', 'sample2'],
+    'cores': None,  # default: this machine's (workflow resources are derived from these)
+    'mem_mb': None,
+}
+
+DEFAULT_WORKERS = 16
 
-def init_project(path):
+# Scaffold manifest in each project root (see Scaffold)
+SCAFFOLD_MANIFEST = '.scaffold.json'
+SCAFFOLD_VERSION = 1
+STAGING_DIRNAME = '.scaffold-staging'
+
+# Workflow resource derivation (see workflow_resources)
+MEMORY_FRACTION = 0.85  # of RAM given to Snakemake jobs; the rest for the OS and page cache
+MAX_CHUNK_THREADS = 4
+MAX_HEAVY_THREADS = 16
+MAX_CHUNKS = 64
+DEFAULT_MEM_MB = 8192  # when RAM cannot be detected
+
+
+def detect_resources():
     """
-    Initialize research project directory structure.
+    Cores and memory available to this process.
+
+    Returns:
+        {'cores': CPUs in the affinity mask, 'mem_mb': physical RAM,
+        lowered to the cgroup v2 memory limit inside a container}
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    try:
+        mem_mb = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        mem_mb = DEFAULT_MEM_MB
+    try:
+        limit = Path('/sys/fs/cgroup/memory.max').read_text().strip()
+        if limit.isdigit():
+            mem_mb = min(mem_mb, int(limit) // (1024 * 1024))
+    except OSError:
+        pass
+    return {'cores': cores, 'mem_mb': mem_mb}
+
+
+def workflow_resources(cores, mem_mb):
+    """
+    Snakemake thread, memory and chunk defaults for a machine.
+
+    Scatter chunks get a few threads each and enough chunks that one
+    sample alone fills every core; memory is MEMORY_FRACTION of RAM split
+    evenly per core.
 
     Args:
-        path: Path where the project should be initialized
+        cores: CPU cores
+        mem_mb: RAM in MB
 
     Returns:
-        True if successful, False otherwise
+        Dict of template fields for the Snakefile, config and profile
     """
-    project_dir = Path(path).resolve()
+    budget = int(mem_mb * MEMORY_FRACTION)
+    per_core = max(256, budget // cores)
+    chunk_threads = max(1, min(MAX_CHUNK_THREADS, cores // 8))
+    heavy_threads = max(1, min(MAX_HEAVY_THREADS, cores))
+    return {
+        'cores': cores,
+        'mem_gb': round(mem_mb / 1024, 1),
+        'mem_budget_mb': budget,
+        'mem_per_core_mb': per_core,
+        'chunks': max(2, min(MAX_CHUNKS, cores // chunk_threads)),
+        'chunk_threads': chunk_threads,
+        'chunk_mem_mb': per_core * chunk_threads,
+        'light_mem_mb': min(per_core, 2048),
+        'heavy_threads': heavy_threads,
+        'heavy_mem_mb': max(per_core, min(budget, per_core * heavy_threads)),
+    }
 
-    print(f"🚀 Initializing research project at: {project_dir}")
-    print()
 
-    # Get project name from directory
-    project_name = project_dir.name
+def project_layout(project_dir, variables=None):
+    """
+    Directories and files of a research project.
+
+    Args:
+        project_dir: Resolved project directory
+        variables: Optional overrides of TEMPLATE_VARIABLES
+
+    Returns:
+        (directories, files) - directories parents-first; files maps
+        path -> content
+
+    Raises:
+        ValueError: On an unknown variable or a malformed value
+    """
+    variables = dict(variables or {})
+    unknown = sorted(set(variables) - set(TEMPLATE_VARIABLES))
+    if unknown:
+        raise ValueError(f"Unknown template variable(s): {', '.join(unknown)} "
+                         f"(known: {', '.join(TEMPLATE_VARIABLES)})")
+    values = {**TEMPLATE_VARIABLES, **{key: value for key, value in variables.items() if value is not None}}
+    samples = values['samples']
+    if isinstance(samples, str) or not isinstance(samples, (list, tuple)) or not samples:
+        raise ValueError("samples must be a non-empty list")
+
+    machine = detect_resources() if values['cores'] is None or values['mem_mb'] is None else {}
+    try:
+        cores = int(values['cores'] or machine['cores'])
+        mem_mb = int(values['mem_mb'] or machine['mem_mb'])
+    except (TypeError, ValueError):
+        raise ValueError("cores and mem_mb must be integers")
+    if cores < 1 or mem_mb < 1:
+        raise ValueError("cores and mem_mb must be positive")
+
+    description = values['description']
+    context = {
+        **workflow_resources(cores, mem_mb),
+        'project_name': values['project_name'] or project_dir.name,
+        'description': description or '[TODO: Describe your research project]',
+        'description_toml': json.dumps(description or '[TODO: Project description]', ensure_ascii=False),
+        'research_question': values['research_question'],
+        'samples_yaml': samples_yaml(samples),
+    }
 
-    # Create directory structure
     directories = [
         project_dir,
         project_dir / "notebook" / "analysis",
@@ -523,22 +866,13 @@ def init_project(path):
         project_dir / "reports",
         project_dir / "src" / "workflow" / "rules",
         project_dir / "src" / "workflow" / "scripts",
+        project_dir / "src" / "workflow" / "profiles" / "default",
     ]
 
-    for directory in directories:
-        if not directory.exists():
-            directory.mkdir(parents=True, exist_ok=True)
-            print(f"✅ Created directory: {directory.relative_to(project_dir.parent)}")
-        else:
-            print(f"⏭️  Directory exists: {directory.relative_to(project_dir.parent)}")
-
-    print()
-
-    # Create files
     files = {
-        project_dir / "STEERING.md": STEERING_TEMPLATE,
-        project_dir / "README.md": README_TEMPLATE.format(project_name=project_name),
-        project_dir / "pyproject.toml": PYPROJECT_TEMPLATE.format(project_name=project_name),
+        project_dir / "STEERING.md": STEERING_TEMPLATE.format(**context),
+        project_dir / "README.md": README_TEMPLATE.format(**context),
+        project_dir / "pyproject.toml": PYPROJECT_TEMPLATE.format(**context),
         project_dir / ".gitignore": GITIGNORE_TEMPLATE,
         project_dir / "notebook" / "tasks.md": TASKS_TEMPLATE,
         project_dir / "notebook" / "labnote" / "Exp00_TEMPLATE_labnote.ipynb": LABNOTE_JUPYTER_TEMPLATE,
@@ -548,19 +882,420 @@ def init_project(path):
         project_dir / "reports" / ".gitkeep": "",
         project_dir / "data" / "processed" / ".gitkeep": "",
         project_dir / "data" / "experimental" / ".gitkeep": "",
-        project_dir / "src" / "workflow" / "Snakefile": SNAKEFILE_TEMPLATE.format(project_name=project_name),
-        project_dir / "src" / "workflow" / "config.yaml": SNAKEMAKE_CONFIG_TEMPLATE.format(project_name=project_name),
+        project_dir / "src" / "workflow" / "Snakefile": SNAKEFILE_TEMPLATE.format(**context),
+        project_dir / "src" / "workflow" / "config.yaml": SNAKEMAKE_CONFIG_TEMPLATE.format(**context),
+        project_dir / "src" / "workflow" / "profiles" / "default" / "config.yaml":
+            SNAKEMAKE_PROFILE_TEMPLATE.format(**context),
         project_dir / "src" / "workflow" / "rules" / ".gitkeep": "",
         project_dir / "src" / "workflow" / "scripts" / ".gitkeep": "",
         project_dir / "src" / ".gitkeep": "",  # For future {exp_no}/ directories
     }
+    return directories, files
+
+
+def create_directory(directory):
+    """
+    Create a directory unless it exists (one mkdir call in the common case).
+
+    Returns:
+        True if created, False if it already existed
+    """
+    try:
+        os.mkdir(directory)
+    except FileExistsError:
+        if not os.path.isdir(directory):
+            raise
+        return False
+    except FileNotFoundError:
+        os.makedirs(directory, exist_ok=True)
+    return True
+
+
+def create_file(file_path, content):
+    """
+    Create a file unless it exists, without a separate exists() check.
+
+    Returns:
+        True if created, False if it already existed (left untouched)
+    """
+    try:
+        with open(file_path, 'x', encoding='utf-8') as f:
+            f.write(content)
+    except FileExistsError:
+        return False
+    return True
+
+
+def _sha256(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
 
-    for file_path, content in files.items():
-        if not file_path.exists():
-            file_path.write_text(content)
-            print(f"✅ Created file: {file_path.relative_to(project_dir.parent)}")
-        else:
-            print(f"⏭️  File exists: {file_path.relative_to(project_dir.parent)}")
+
+def read_scaffold_manifest(project_dir):
+    """
+    Load a project's scaffold manifest.
+
+    Returns:
+        Manifest dict, or None if missing, unreadable or from another
+        SCAFFOLD_VERSION (the project is then probed and adopted again)
+    """
+    try:
+        with open(Path(project_dir) / SCAFFOLD_MANIFEST, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, NotADirectoryError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if (not isinstance(manifest, dict) or manifest.get('version') != SCAFFOLD_VERSION
+            or not isinstance(manifest.get('files'), dict) or not isinstance(manifest.get('directories'), list)):
+        return None
+    return manifest
+
+
+def write_scaffold_manifest(project_dir, manifest):
+    """Atomically write a scaffold manifest into project_dir."""
+    write_atomic(Path(project_dir) / SCAFFOLD_MANIFEST, json.dumps(manifest, indent=2, ensure_ascii=False) + '\n')
+
+
+def record_samples(project_dir, samples, previous_content):
+    """
+    Update the scaffold manifest after sample_sheet rewrote config.yaml.
+
+    The samples become the project's template variable, and if config.yaml
+    was unedited before (previous_content matches the recorded hash) and
+    still equals the rendered template, it stays managed by --upgrade.
+
+    Args:
+        project_dir: Project root
+        samples: Discovered sample names
+        previous_content: config.yaml before the rewrite (None if absent)
+    """
+    project_dir = Path(project_dir).resolve()
+    manifest = read_scaffold_manifest(project_dir)
+    if manifest is None:
+        return
+    manifest['variables'] = {**(manifest.get('variables') or {}), 'samples': list(samples)}
+    rel = (Path('src') / 'workflow' / 'config.yaml').as_posix()
+    entry = manifest['files'].get(rel)
+    if entry and previous_content is not None and entry.get('sha256') == _sha256(previous_content):
+        rendered = project_layout(project_dir, manifest['variables'])[1][project_dir / rel]
+        with open(project_dir / rel, 'rb') as f:
+            digest = _sha256(f.read())
+        manifest['files'][rel] = {'template': _sha256(rendered) if digest == _sha256(rendered) else entry['template'],
+                                  'sha256': digest}
+    manifest['updated'] = datetime.now().isoformat(timespec='seconds')
+    write_scaffold_manifest(project_dir, manifest)
+
+
+class Scaffold:
+    """
+    Staged, manifest-tracked scaffolding of one project.
+
+    A new project is built completely in a hidden sibling directory
+    (.<name>.scaffold-staging), including its manifest, and renamed into
+    place in one step, so an interrupted run never leaves a half-built
+    project. In an existing project, missing files (and, with upgrade,
+    changed templates) are staged in .scaffold-staging/ and moved into
+    place one by one with link (never clobbers) or replace, and the
+    manifest is rewritten last.
+
+    The manifest (SCAFFOLD_MANIFEST) records the template variables, the
+    directories and, per file, the hash of the rendered template it was
+    written from and of the content written. A re-run reads it instead
+    of probing every path, listing each scaffold directory once to
+    re-create recorded files and directories deleted since; a project
+    without one is probed once and adopted. Files that differ from the template at adoption are treated
+    as user-owned and never upgraded.
+
+    Call plan(), stage(), write() for each path in `writes`, then
+    commit(); abort() removes the staging directory after an error.
+
+    Args:
+        project_dir: Project directory
+        variables: Template variables (override those stored in the manifest)
+        upgrade: Rewrite files whose template changed since they were
+            written, unless they were edited locally
+    """
+
+    def __init__(self, project_dir, variables=None, upgrade=False):
+        self.project_dir = Path(project_dir).resolve()
+        self.variables = dict(variables or {})
+        self.upgrade = upgrade
+        self.fresh = False
+        self.adopted = False
+        self.writes = {}  # relative path -> content, to stage and move into place
+        self.created_dirs = []
+        self.existing_dirs = 0
+        self.created = []
+        self.existing_files = 0
+        self.upgraded = []
+        self.outdated = []  # template changed; not upgraded (run with upgrade)
+        self.modified = []  # template changed but edited locally; left alone
+        self.restored = []  # recorded in the manifest but deleted since; re-created
+        self.discovery = None  # sample_sheet result when data/raw/ already held samples
+        self.staging = None
+        self._manifest = None
+        self._directories = []
+        self._templates = {}
+        self._entries = {}
+        self._replace = set()
+        self._missing_dirs = set()
+
+    def _rel(self, path):
+        return path.relative_to(self.project_dir).as_posix()
+
+    def _present(self, rels):
+        """Subset of rels that exist, from one os.scandir per parent directory."""
+        listings = {}
+        present = set()
+        for rel in rels:
+            parent, _, name = rel.rpartition('/')
+            if parent not in listings:
+                try:
+                    with os.scandir(self.project_dir / parent) as entries:
+                        listings[parent] = {entry.name for entry in entries}
+                except (FileNotFoundError, NotADirectoryError):
+                    listings[parent] = set()
+            if name in listings[parent]:
+                present.add(rel)
+        return present
+
+    def plan(self):
+        """Decide what to write, from the manifest (or by probing once)."""
+        self._manifest = read_scaffold_manifest(self.project_dir)
+        stored = (self._manifest or {}).get('variables') or {}
+        self.variables = {**stored, **{key: value for key, value in self.variables.items() if value is not None}}
+        # Pin the machine the workflow defaults were derived from, so re-runs
+        # elsewhere do not report config.yaml as outdated
+        for key, value in detect_resources().items():
+            self.variables.setdefault(key, value)
+        self.fresh = self._manifest is None and not self.project_dir.exists()
+        if not self.fresh and 'samples' not in self.variables:
+            # Existing data: list its samples instead of the placeholders
+            discovery = discover_samples(self.project_dir)
+            if discovery and discovery['samples']:
+                self.discovery = discovery
+                self.variables['samples'] = discovery['samples']
+        directories, files = project_layout(self.project_dir, self.variables)
+        self._directories = [self._rel(d) for d in directories if d != self.project_dir]
+        self._templates = {self._rel(path): content for path, content in files.items()}
+        if self.fresh:
+            self.writes = dict(self._templates)
+            return
+
+        if self._manifest is None:
+            # One-time adoption: read what is there instead of trusting a manifest
+            self.adopted = True
+            for rel, content in self._templates.items():
+                try:
+                    with open(self.project_dir / rel, 'rb') as f:
+                        digest = _sha256(f.read())
+                except FileNotFoundError:
+                    self.writes[rel] = content
+                    continue
+                self._entries[rel] = {'template': digest if digest == _sha256(content) else None, 'sha256': digest}
+                self.existing_files += 1
+            return
+
+        self._entries = dict(self._manifest['files'])
+        recorded = set(self._manifest['directories'])
+        known = [rel for rel in self._directories if rel in recorded]
+        present = self._present(known + list(self._templates))
+        self._missing_dirs = set(known) - present
+        for rel, content in self._templates.items():
+            entry = self._entries.get(rel)
+            if entry is None:
+                # Template added since the project was scaffolded
+                self.writes[rel] = content
+                continue
+            if rel not in present:
+                # Deleted since it was scaffolded: the manifest alone would skip it
+                self.writes[rel] = content
+                self.restored.append(rel)
+                continue
+            self.existing_files += 1
+            if entry.get('template') is None or entry['template'] == _sha256(content):
+                continue
+            if not self.upgrade:
+                self.outdated.append(rel)
+                continue
+            try:
+                with open(self.project_dir / rel, 'rb') as f:
+                    digest = _sha256(f.read())
+            except FileNotFoundError:
+                digest = None
+            if digest is not None and digest != entry.get('sha256'):
+                self.modified.append(rel)
+                continue
+            self.writes[rel] = content
+            self._replace.add(rel)
+            self.existing_files -= 1
+
+    def _staged(self, rel):
+        return self.staging / (rel if self.fresh else rel.replace('/', '__'))
+
+    def stage(self):
+        """Create the staging directory and the directory tree."""
+        if self.fresh:
+            self.project_dir.parent.mkdir(parents=True, exist_ok=True)
+            self.staging = self.project_dir.parent / f'.{self.project_dir.name}.scaffold-staging'
+            shutil.rmtree(self.staging, ignore_errors=True)  # left over from an interrupted run
+            self.staging.mkdir()
+            for rel in self._directories:
+                (self.staging / rel).mkdir(parents=True, exist_ok=True)
+            self.created_dirs = list(self._directories)
+            return
+
+        known = set(self._manifest['directories']) if self._manifest else set()
+        for rel in self._directories:
+            if (rel in known and rel not in self._missing_dirs) or not create_directory(self.project_dir / rel):
+                self.existing_dirs += 1
+            else:
+                self.created_dirs.append(rel)
+        if self.writes:
+            self.staging = self.project_dir / STAGING_DIRNAME
+            shutil.rmtree(self.staging, ignore_errors=True)
+            self.staging.mkdir()
+
+    def write(self, rel):
+        """Write one staged file (safe to call from several threads)."""
+        with open(self._staged(rel), 'w', encoding='utf-8') as f:
+            f.write(self.writes[rel])
+
+    def _manifest_data(self):
+        now = datetime.now().isoformat(timespec='seconds')
+        return {
+            'version': SCAFFOLD_VERSION,
+            'created': (self._manifest or {}).get('created', now),
+            'updated': now,
+            'variables': self.variables,
+            'directories': sorted(self._directories),
+            'files': dict(sorted(self._entries.items())),
+        }
+
+    def _write_manifest(self, directory):
+        write_scaffold_manifest(directory, self._manifest_data())
+
+    def commit(self):
+        """Move staged files into place and write the manifest."""
+        for rel, content in self.writes.items():
+            digest = _sha256(content)
+            self._entries[rel] = {'template': digest, 'sha256': digest}
+
+        if self.fresh:
+            self._write_manifest(self.staging)
+            # Fails (and leaves nothing behind) if the directory appeared meanwhile
+            os.rename(self.staging, self.project_dir)
+            self.staging = None
+            self.created = list(self.writes)
+            return
+
+        for rel, content in self.writes.items():
+            staged, destination = self._staged(rel), self.project_dir / rel
+            if rel in self._replace:
+                os.replace(staged, destination)
+                self.upgraded.append(rel)
+                continue
+            try:
+                os.link(staged, destination)
+                self.created.append(rel)
+            except FileExistsError:
+                # Created by someone else since plan(): adopt, do not overwrite
+                with open(destination, 'rb') as f:
+                    found = _sha256(f.read())
+                self._entries[rel] = {'template': found if found == digest else None, 'sha256': found}
+                self.existing_files += 1
+            except OSError:
+                # No hard links on this filesystem
+                if create_file(destination, content):
+                    self.created.append(rel)
+                else:
+                    self.existing_files += 1
+        self.abort()
+
+        if self.discovery:
+            write_sample_sheet(self.project_dir / SHEET_PATH, self.discovery['rows'])
+        if self.created or self.upgraded or self.created_dirs or self.adopted or self.discovery:
+            self._write_manifest(self.project_dir)
+
+    def abort(self):
+        """Remove the staging directory, if any."""
+        if self.staging is not None:
+            shutil.rmtree(self.staging, ignore_errors=True)
+            self.staging = None
+
+
+def sync_registry(project_dir):
+    """Index existing experiments; returns the experiment count (0 for a fresh project)."""
+    with ExperimentRegistry(project_dir) as registry:
+        registry.sync()
+        return len(registry.list())
+
+
+def init_project(path, variables=None, upgrade=False):
+    """
+    Initialize research project directory structure.
+
+    Args:
+        path: Path where the project should be initialized
+        variables: Optional template variables (see TEMPLATE_VARIABLES)
+        upgrade: Also rewrite files whose template changed (see Scaffold)
+
+    Returns:
+        True if successful, False otherwise
+    """
+    project_dir = Path(path).resolve()
+
+    print(f"🚀 Initializing research project at: {project_dir}")
+    print()
+
+    scaffold = Scaffold(project_dir, variables, upgrade)
+    try:
+        with tracer.phase('plan'):
+            scaffold.plan()
+        with tracer.phase('directories'):
+            scaffold.stage()
+        with tracer.phase('files', count=len(scaffold.writes)):
+            for rel in scaffold.writes:
+                scaffold.write(rel)
+        with tracer.phase('commit'):
+            scaffold.commit()
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
+    except OSError as e:
+        scaffold.abort()
+        print(f"❌ Error: Scaffolding failed ({e}); {SCAFFOLD_MANIFEST} was not updated")
+        return False
+
+    for rel in scaffold.created_dirs:
+        print(f"✅ Created directory: {project_dir.name}/{rel}")
+    for rel in scaffold.created:
+        label = 'Re-created missing file' if rel in scaffold.restored else 'Created file'
+        print(f"✅ {label}: {project_dir.name}/{rel}")
+    for rel in scaffold.upgraded:
+        print(f"🔄 Upgraded: {project_dir.name}/{rel}")
+    if scaffold.discovery:
+        print(f"📋 Samples from data/raw: {len(scaffold.discovery['samples'])} sample(s), "
+              f"{len(scaffold.discovery['rows'])} unit(s) in {SHEET_PATH.as_posix()}")
+    if scaffold.existing_dirs or scaffold.existing_files:
+        source = 'probed and recorded in' if scaffold.adopted else 'per'
+        print(f"⏭️  {scaffold.existing_dirs} director(ies) and {scaffold.existing_files} file(s) already present "
+              f"({source} {SCAFFOLD_MANIFEST})")
+    for rel in scaffold.modified:
+        print(f"⚠️  Not upgraded (edited since it was scaffolded): {rel}")
+    if scaffold.outdated:
+        print(f"💡 {len(scaffold.outdated)} template(s) changed since this project was scaffolded: "
+              f"{', '.join(scaffold.outdated)} (run with --upgrade)")
+
+    print()
+
+    # Index existing experiments (no-op for a fresh project)
+    try:
+        with tracer.phase('registry_sync'):
+            num_experiments = sync_registry(project_dir)
+        print(f"✅ Experiment registry: {REGISTRY_FILENAME} ({num_experiments} experiment(s))")
+    except sqlite3.Error as e:
+        print(f"⚠️  Warning: Could not create experiment registry: {e}")
 
     print()
     print("✅ Project initialization complete!")
@@ -573,20 +1308,255 @@ def init_project(path):
     return True
 
 
+def load_manifest(manifest_path):
+    """
+    Load and normalize a bulk scaffolding manifest.
+
+    Args:
+        manifest_path: Path to .yaml/.yml or .json manifest
+
+    Returns:
+        List of dicts with 'path' (resolved against the manifest's
+        directory) and 'variables' (defaults merged with per-project keys)
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    manifest_path = Path(manifest_path)
+    text = manifest_path.read_text(encoding='utf-8')
+    if manifest_path.suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests need PyYAML (pip install pyyaml); or use a .json manifest")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    defaults = {}
+    if isinstance(data, dict):
+        defaults = data.get('defaults') or {}
+        data = data.get('projects')
+    if not isinstance(data, list) or not data or not isinstance(defaults, dict):
+        raise ValueError("Manifest must contain a non-empty list of projects")
+
+    projects = []
+    seen = set()
+    for number, entry in enumerate(data, 1):
+        if isinstance(entry, str):
+            entry = {'path': entry}
+        if not isinstance(entry, dict) or not entry.get('path'):
+            raise ValueError(f"Project {number} needs a 'path'")
+        path = (manifest_path.parent / entry['path']).resolve()
+        if path in seen:
+            raise ValueError(f"Project {number}: {entry['path']} is listed twice")
+        seen.add(path)
+        variables = {**defaults, **{key: value for key, value in entry.items() if key != 'path'}}
+        # Validate early so a typo fails before anything is created
+        project_layout(path, variables)
+        projects.append({'path': path, 'variables': variables})
+    return projects
+
+
+def init_projects(projects, workers=DEFAULT_WORKERS, quiet=False, upgrade=False):
+    """
+    Scaffold many projects in one process on a shared thread pool.
+
+    Each project is planned and its directories created by one task, its
+    staged files are then written by one task each, and the commit
+    (rename or move into place, manifest) and registry sync run last, so
+    the pool overlaps many small filesystem calls (which dominate on
+    network storage). Output is one line per finished project.
+
+    Args:
+        projects: Entries from load_manifest
+        workers: Threads for filesystem work
+        quiet: Print nothing per project
+        upgrade: Rewrite templates changed since scaffolding (see Scaffold)
+
+    Returns:
+        List of dicts with 'path', 'status' ('created', 'updated', 'existing'
+        or 'failed'), 'directories' and 'files' ([created, existing] each),
+        'upgraded', 'outdated' and 'modified' (relative paths),
+        'experiments', 'seconds' (summed task time) and 'error', in
+        manifest order
+    """
+    scaffolds = [Scaffold(project['path'], project['variables'], upgrade) for project in projects]
+    results = [{'path': str(scaffold.project_dir), 'status': None, 'directories': [0, 0], 'files': [0, 0],
+                'upgraded': [], 'outdated': [], 'modified': [], 'experiments': None, 'seconds': 0.0, 'error': None}
+               for scaffold in scaffolds]
+    pending_files = [0] * len(scaffolds)
+
+    def timed(index, work, *args):
+        start = time.perf_counter()
+        try:
+            return work(*args)
+        finally:
+            results[index]['seconds'] += time.perf_counter() - start
+
+    def prepare(scaffold):
+        scaffold.plan()
+        scaffold.stage()
+
+    def finish(index):
+        scaffold, result = scaffolds[index], results[index]
+        scaffold.abort()
+        result['directories'] = [len(scaffold.created_dirs), scaffold.existing_dirs]
+        result['files'] = [len(scaffold.created), scaffold.existing_files]
+        result['upgraded'], result['outdated'], result['modified'] = \
+            scaffold.upgraded, scaffold.outdated, scaffold.modified
+        changed = result['directories'][0] + result['files'][0] + len(scaffold.upgraded)
+        if result['error']:
+            result['status'] = 'failed'
+        elif scaffold.fresh:
+            result['status'] = 'created'
+        else:
+            result['status'] = 'updated' if changed else 'existing'
+        result['seconds'] = round(result['seconds'], 3)
+        done = sum(1 for r in results if r['status'] is not None)
+        if not quiet:
+            icon = '❌' if result['error'] else '⏭️ ' if result['status'] == 'existing' else '✅'
+            detail = result['error'] or (f"{result['directories'][0]} dir(s), {result['files'][0]} file(s) created, "
+                                         f"{result['directories'][1] + result['files'][1]} existing")
+            for label, paths in (('re-created', scaffold.restored), ('upgraded', scaffold.upgraded),
+                                 ('outdated', scaffold.outdated), ('edited locally', scaffold.modified)):
+                if paths and not result['error']:
+                    detail += f", {len(paths)} {label}"
+            print(f"{icon} [{done}/{len(results)}] {scaffold.project_dir.name}: {result['status']} - {detail} "
+                  f"({result['seconds']:.2f}s)", flush=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        running = {executor.submit(timed, index, prepare, scaffold): ('prepare', index)
+                   for index, scaffold in enumerate(scaffolds)}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, index = running.pop(future)
+                scaffold, result = scaffolds[index], results[index]
+                try:
+                    outcome = future.result()
+                except (OSError, ValueError, sqlite3.Error) as e:
+                    if result['error'] is None:
+                        result['error'] = f"{kind}: {e}"
+                    outcome = None
+
+                if kind == 'file':
+                    pending_files[index] -= 1
+                    if pending_files[index]:
+                        continue
+                if result['error'] or kind == 'registry':
+                    if kind == 'registry':
+                        result['experiments'] = outcome
+                    finish(index)
+                elif kind == 'prepare' and scaffold.writes:
+                    pending_files[index] = len(scaffold.writes)
+                    for rel in scaffold.writes:
+                        running[executor.submit(timed, index, scaffold.write, rel)] = ('file', index)
+                elif kind in ('prepare', 'file'):
+                    running[executor.submit(timed, index, scaffold.commit)] = ('commit', index)
+                else:
+                    running[executor.submit(timed, index, sync_registry, scaffold.project_dir)] = ('registry', index)
+    return results
+
+
+def print_summary(results, wall_seconds):
+    """Print created/skipped counts per status, totals and timing."""
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    dirs = [sum(result['directories'][i] for result in results) for i in (0, 1)]
+    files = [sum(result['files'][i] for result in results) for i in (0, 1)]
+    upgraded = sum(len(result['upgraded']) for result in results)
+    outdated = sum(len(result['outdated']) for result in results)
+    modified = sum(len(result['modified']) for result in results)
+    busy_seconds = sum(result['seconds'] for result in results)
+
+    print()
+    print("📋 Bulk scaffolding summary")
+    print(f"   {len(results)} project(s): {', '.join(f'{n} {status}' for status, n in sorted(counts.items()))}")
+    print(f"   Directories: {dirs[0]} created, {dirs[1]} existing")
+    print(f"   Files:       {files[0]} created, {files[1]} existing")
+    if upgraded or outdated or modified:
+        print(f"   Templates:   {upgraded} upgraded, {outdated} outdated, {modified} edited locally (kept)")
+    print(f"   Wall time {wall_seconds:.2f}s (sum of filesystem task times {busy_seconds:.2f}s)")
+    if outdated:
+        print("💡 Run with --upgrade to rewrite outdated templates (locally edited files are kept)")
+    for result in results:
+        if result['error']:
+            print(f"❌ {result['path']}: {result['error']}")
+
+
 def main():
-    if len(sys.argv) < 3 or sys.argv[1] != '--path':
-        print("Usage: init_project.py --path <path>")
+    args = configure_profiling(sys.argv[1:], 'init_project')
+    upgrade = '--upgrade' in args
+    args = [arg for arg in args if arg != '--upgrade']
+    if len(args) < 2 or args[0] not in ('--path', '--manifest'):
+        print("Usage: init_project.py --path <path> [--upgrade] [--profile [trace.json]] [--chrome-trace <events.json>]")
+        print("       init_project.py --manifest <projects.yaml|projects.json> [--upgrade] [--workers N] [--quiet] "
+              "[--summary <summary.json>]")
         print()
         print("Examples:")
         print("  init_project.py --path .")
         print("  init_project.py --path /path/to/new/project")
+        print("  init_project.py --path /shared/fs/project --profile trace.json")
+        print("  init_project.py --path . --upgrade")
+        print("  init_project.py --manifest cohorts.yaml --workers 32")
         sys.exit(1)
 
-    path = sys.argv[2]
+    if args[0] == '--path':
+        path = args[1]
+        with tracer.phase('init_project', path=path):
+            success = init_project(path, upgrade=upgrade)
+        sys.exit(0 if success else 1)
+
+    manifest_path = args[1]
+    workers = DEFAULT_WORKERS
+    quiet = False
+    summary_path = None
+    i = 2
+    while i < len(args):
+        if args[i] == '--workers' and i + 1 < len(args):
+            try:
+                workers = int(args[i + 1])
+            except ValueError:
+                workers = 0
+            if workers < 1:
+                print(f"❌ Error: --workers must be a positive integer (got {args[i + 1]})")
+                sys.exit(1)
+            i += 2
+        elif args[i] == '--summary' and i + 1 < len(args):
+            summary_path = args[i + 1]
+            i += 2
+        elif args[i] == '--quiet':
+            quiet = True
+            i += 1
+        else:
+            print(f"❌ Error: Unknown option: {args[i]}")
+            sys.exit(1)
+
+    try:
+        projects = load_manifest(manifest_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: Could not load manifest {manifest_path}: {e}")
+        sys.exit(1)
 
-    success = init_project(path)
+    print(f"🚀 Scaffolding {len(projects)} project(s) with {workers} worker thread(s)")
+    start = time.perf_counter()
+    with tracer.phase('init_projects', projects=len(projects)):
+        results = init_projects(projects, workers, quiet, upgrade)
+    wall_seconds = time.perf_counter() - start
+    print_summary(results, wall_seconds)
+
+    if summary_path:
+        Path(summary_path).write_text(json.dumps({
+            'manifest': str(Path(manifest_path).resolve()),
+            'wall_seconds': round(wall_seconds, 3),
+            'projects': results,
+        }, indent=2, ensure_ascii=False))
+        print()
+        print(f"💾 Summary written: {summary_path}")
 
-    sys.exit(0 if success else 1)
+    sys.exit(1 if any(result['status'] == 'failed' for result in results) else 0)
 
 
 if __name__ == "__main__":
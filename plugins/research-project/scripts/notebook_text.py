@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Notebook Text - Markdown sections and notebook cells for research-project scripts
+
+Shared by project_status.py and search_index.py:
+
+- markdown_sections: split markdown lines into sections at one heading level
+- notebook_cells: markdown/code cell sources of an .ipynb
+- labnote_sections: named sections of an .ipynb or .md labnote
+
+Notebooks are streamed with experiment-report's notebook_reader when that
+plugin is installed next to this one, so outputs (embedded images) are
+never loaded. Without it, the notebook JSON is loaded whole.
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+REPORT_SCRIPTS = Path(__file__).resolve().parents[2] / 'experiment-report' / 'scripts'
+if REPORT_SCRIPTS.is_dir() and str(REPORT_SCRIPTS) not in sys.path:
+    sys.path.append(str(REPORT_SCRIPTS))
+
+try:
+    from notebook_reader import extract_sections, iter_cells
+except ImportError:
+    extract_sections = iter_cells = None
+
+
+HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+
+
+def markdown_sections(lines, level=2):
+    """
+    Split markdown lines into sections at one heading level.
+
+    Headings inside ``` or ~~~ fences are text. A heading above the level
+    ends the current section without starting one.
+
+    Args:
+        lines: Markdown lines
+        level: Heading level that starts a section (2 for ##)
+
+    Returns:
+        dict of heading text -> list of body lines
+    """
+    sections = {}
+    current = None
+    in_fence = False
+    for line in lines:
+        if line.lstrip().startswith(('```', '~~~')):
+            in_fence = not in_fence
+        heading = None if in_fence else HEADING.match(line)
+        if heading and len(heading.group(1)) <= level:
+            current = heading.group(2).strip() if len(heading.group(1)) == level else None
+            if current is not None:
+                sections.setdefault(current, [])
+            continue
+        if current is not None:
+            sections[current].append(line)
+    return sections
+
+
+def notebook_cells(path, cell_types=('markdown', 'code')):
+    """
+    Cell sources of a notebook, outputs skipped.
+
+    Args:
+        path: .ipynb file
+        cell_types: Cell types to yield
+
+    Yields:
+        dict with 'index', 'cell_type' and 'source' (str)
+    """
+    if iter_cells is not None:
+        yield from iter_cells(path, cell_types=set(cell_types))
+        return
+    with open(path, encoding='utf-8') as f:
+        notebook = json.load(f)
+    for index, cell in enumerate(notebook.get('cells') or []):
+        if cell.get('cell_type') in cell_types:
+            source = cell.get('source') or ''
+            yield {'index': index, 'cell_type': cell['cell_type'],
+                   'source': ''.join(source) if isinstance(source, list) else source}
+
+
+def labnote_sections(path, names):
+    """
+    Text of the named ## or ### sections of a labnote.
+
+    Args:
+        path: .ipynb or .md labnote
+        names: Section headings to return
+
+    Returns:
+        dict of heading -> stripped section text, for the names found
+    """
+    path = Path(path)
+    if extract_sections is not None:
+        return extract_sections(path, names)
+    if path.suffix == '.ipynb':
+        text = '\n'.join(cell['source'] for cell in notebook_cells(path, ('markdown',)))
+    else:
+        text = path.read_text(encoding='utf-8')
+    found = {}
+    for level in (2, 3):
+        for heading, lines in markdown_sections(text.splitlines(), level).items():
+            if heading in names:
+                found.setdefault(heading, '\n'.join(lines).strip())
+    return found
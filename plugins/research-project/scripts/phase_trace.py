@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Phase Trace - Per-phase profiling for the plugin scripts
+
+Records, for each named phase of a run (nested phases allowed):
+  - wall time and CPU time (this process plus waited-for worker processes)
+  - filesystem call counts: stat/lstat, mkdir, open, scandir/listdir,
+    replace, unlink (counted in this process; parse workers are not)
+  - read/write syscalls and bytes from /proc/self/io (Linux)
+  - peak RSS within the phase (Linux resets the high-water mark via
+    /proc/self/clear_refs; elsewhere the process-wide peak is reported)
+
+Tracing is off unless a script is run with --profile or the environment
+sets RESEARCH_PROFILE. When off, `tracer.phase()` returns a shared no-op
+context manager and no filesystem function is wrapped.
+
+Activation:
+    <script> ... --profile [trace.json] [--chrome-trace <trace_events.json>]
+    RESEARCH_PROFILE=trace.json RESEARCH_PROFILE_CHROME=events.json <script> ...
+    RESEARCH_PROFILE=1 <script> ...      (trace written to <script>_profile_<time>.json)
+
+The JSON trace lists phases in start order. The Chrome trace-event file
+loads in chrome://tracing or ui.perfetto.dev.
+
+Usage (in a script):
+    from phase_trace import configure_profiling, tracer
+
+    def main():
+        args = configure_profiling(sys.argv[1:], 'init_project')
+        with tracer.phase('init_project'):
+            with tracer.phase('directories'):
+                ...
+"""
+
+import atexit
+import builtins
+import io
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+TRACE_VERSION = 1
+TRACE_ENV = 'RESEARCH_PROFILE'
+CHROME_ENV = 'RESEARCH_PROFILE_CHROME'
+
+# (counter name, module, function name) wrapped while tracing is enabled
+COUNTED_CALLS = (
+    ('stat', os, 'stat'),
+    ('stat', os, 'lstat'),
+    ('mkdir', os, 'mkdir'),
+    ('open', builtins, 'open'),
+    ('open', io, 'open'),
+    ('open', os, 'open'),
+    ('scandir', os, 'scandir'),
+    ('scandir', os, 'listdir'),
+    ('replace', os, 'replace'),
+    ('unlink', os, 'unlink'),
+)
+
+_IO_FIELDS = {'syscr': 'read_calls', 'syscw': 'write_calls', 'rchar': 'read_bytes', 'wchar': 'write_bytes'}
+
+
+class _NullPhase:
+    """Context manager used for every phase while tracing is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ('tracer', 'name', 'args', 'record')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.record = None
+
+    def __enter__(self):
+        self.record = self.tracer._begin(self.name, self.args)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer._end(self.record, exc_type)
+        return False
+
+
+class PhaseTracer:
+    """
+    Collects phase records for one process.
+
+    Use the module-level `tracer` instance; call enable() (or
+    configure_profiling) before the phases to be traced.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.script = None
+        self.trace_path = None
+        self.chrome_path = None
+        self.phases = []
+        self.counts = {}
+        self._local = threading.local()
+        self._originals = []
+        self._origin = None
+        self._started = None
+        self._open = os.open
+        self._peak_scope = 'process'
+        self._io_available = False
+
+    def phase(self, name, **args):
+        """
+        Context manager timing one named phase.
+
+        Args:
+            name: Phase name (e.g. 'parse_notebooks')
+            **args: JSON-serializable details recorded with the phase
+
+        Returns:
+            Context manager (a shared no-op when tracing is off)
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name, args)
+
+    def enable(self, script, trace_path, chrome_path=None):
+        """
+        Start tracing and write the trace(s) when the process exits.
+
+        Args:
+            script: Script name recorded in the trace
+            trace_path: JSON trace output path
+            chrome_path: Optional Chrome trace-event output path
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        self.script = script
+        self.trace_path = trace_path
+        self.chrome_path = chrome_path
+        self._origin = time.perf_counter()
+        self._started = datetime.now().isoformat(timespec='seconds')
+        self._io_available = self._read_io() is not None
+        if self._reset_peak():
+            self._peak_scope = 'phase'
+        for counter, module, name in COUNTED_CALLS:
+            self._wrap(counter, module, name)
+        atexit.register(self.finish)
+
+    def _wrap(self, counter, module, name):
+        original = getattr(module, name)
+        counts = self.counts
+        counts.setdefault(counter, 0)
+
+        def counted(*args, **kwargs):
+            counts[counter] += 1
+            return original(*args, **kwargs)
+
+        counted.__wrapped__ = original
+        setattr(module, name, counted)
+        self._originals.append((module, name, original))
+
+    def _unwrap(self):
+        for module, name, original in reversed(self._originals):
+            setattr(module, name, original)
+        self._originals = []
+
+    def _read_proc(self, path):
+        try:
+            fd = self._open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            return os.read(fd, 8192).decode('ascii', 'replace')
+        finally:
+            os.close(fd)
+
+    def _read_io(self):
+        text = self._read_proc('/proc/self/io')
+        if text is None:
+            return None
+        values = {}
+        for line in text.splitlines():
+            key, _, value = line.partition(':')
+            if key in _IO_FIELDS:
+                values[_IO_FIELDS[key]] = int(value)
+        return values
+
+    def _read_peak_mb(self):
+        if self._peak_scope == 'phase':
+            text = self._read_proc('/proc/self/status')
+            for line in (text or '').splitlines():
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+    def _reset_peak(self):
+        """Reset the RSS high-water mark (Linux 4.0+). Returns True on success."""
+        try:
+            fd = self._open('/proc/self/clear_refs', os.O_WRONLY)
+        except OSError:
+            return False
+        try:
+            os.write(fd, b'5')
+            return True
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _cpu():
+        if resource is None:
+            return time.process_time()
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _begin(self, name, args):
+        stack = self._stack()
+        if self._peak_scope == 'phase':
+            # Fold the peak so far into the enclosing phases before resetting it
+            peak = self._read_peak_mb()
+            for record in stack:
+                record['_peak'] = max(record['_peak'], peak)
+            self._reset_peak()
+        record = {
+            'name': name,
+            'parent': stack[-1]['name'] if stack else None,
+            'depth': len(stack),
+            'thread': threading.current_thread().name,
+            'args': args,
+            '_peak': 0.0,
+            '_counts': dict(self.counts),
+            '_io': self._read_io() if self._io_available else None,
+            '_cpu': self._cpu(),
+            '_start': time.perf_counter(),
+        }
+        stack.append(record)
+        self.phases.append(record)
+        return record
+
+    def _end(self, record, exc_type):
+        end = time.perf_counter()
+        cpu = self._cpu()
+        io_after = self._read_io() if self._io_available else None
+        peak = self._read_peak_mb()
+        stack = self._stack()
+        if stack and stack[-1] is record:
+            stack.pop()
+
+        record['start_s'] = round(record['_start'] - self._origin, 6)
+        record['wall_s'] = round(end - record['_start'], 6)
+        record['cpu_s'] = round(cpu - record['_cpu'], 6)
+        record['peak_rss_mb'] = round(max(record['_peak'], peak or 0.0), 1)
+        record['fs'] = {key: count - record['_counts'].get(key, 0) for key, count in self.counts.items()}
+        if io_after is not None and record['_io'] is not None:
+            record['io'] = {key: value - record['_io'].get(key, 0) for key, value in io_after.items()}
+        if exc_type is not None and not issubclass(exc_type, SystemExit):
+            record['error'] = exc_type.__name__
+        for key in ('_peak', '_counts', '_io', '_cpu', '_start'):
+            del record[key]
+
+    def trace(self):
+        """Return the trace as a JSON-serializable dict (finished phases only)."""
+        return {
+            'version': TRACE_VERSION,
+            'script': self.script,
+            'argv': sys.argv,
+            'pid': os.getpid(),
+            'started': self._started,
+            'total_s': round(time.perf_counter() - self._origin, 6),
+            'peak_rss_scope': self._peak_scope,
+            'phases': [record for record in self.phases if 'wall_s' in record],
+        }
+
+    def chrome_trace(self, trace):
+        """Convert a trace to Chrome trace-event format (complete 'X' events)."""
+        threads = {}
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': trace['pid'], 'tid': 0,
+                   'args': {'name': trace['script']}}]
+        for record in trace['phases']:
+            tid = threads.setdefault(record['thread'], len(threads) + 1)
+            details = {key: record[key] for key in ('cpu_s', 'peak_rss_mb', 'fs', 'io', 'error') if key in record}
+            events.append({
+                'name': record['name'],
+                'cat': trace['script'],
+                'ph': 'X',
+                'ts': round(record['start_s'] * 1e6, 1),
+                'dur': round(record['wall_s'] * 1e6, 1),
+                'pid': trace['pid'],
+                'tid': tid,
+                'args': {**record['args'], **details},
+            })
+        for name, tid in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': trace['pid'], 'tid': tid, 'args': {'name': name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def finish(self):
+        """Stop counting, write the trace file(s) and print a phase summary to stderr."""
+        if not self.enabled:
+            return
+        self._unwrap()
+        self.enabled = False
+        trace = self.trace()
+        outputs = [(self.trace_path, trace)]
+        if self.chrome_path:
+            outputs.append((self.chrome_path, self.chrome_trace(trace)))
+        for path, data in outputs:
+            try:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=1, ensure_ascii=False)
+            except OSError as e:
+                print(f"⚠️  Warning: Could not write profile {path}: {e}", file=sys.stderr)
+        print_summary(trace, sys.stderr)
+        print(f"💾 Profile written: {', '.join(str(path) for path, _ in outputs)}", file=sys.stderr)
+
+
+def print_summary(trace, stream=sys.stdout):
+    """Print one line per phase: wall, CPU, peak RSS and filesystem counts."""
+    print(file=stream)
+    print(f"📋 Profile: {trace['script']} ({trace['total_s']:.3f}s, peak RSS per {trace['peak_rss_scope']})", file=stream)
+    print(f"   {'Phase':<32} {'Wall':>9} {'CPU':>9} {'Peak MB':>8}  {'stat':>6} {'open':>6} {'mkdir':>5} {'write':>6}",
+          file=stream)
+    for record in trace['phases']:
+        name = '  ' * record['depth'] + record['name']
+        fs = record['fs']
+        writes = record.get('io', {}).get('write_calls', '-')
+        print(f"   {name:<32} {record['wall_s']:>8.3f}s {record['cpu_s']:>8.3f}s {record['peak_rss_mb']:>8.1f}  "
+              f"{fs.get('stat', 0):>6} {fs.get('open', 0):>6} {fs.get('mkdir', 0):>5} {writes:>6}", file=stream)
+
+
+tracer = PhaseTracer()
+
+
+def _default_trace_path(script):
+    return f"{script}_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+
+def configure_profiling(args, script):
+    """
+    Enable tracing from command-line flags or the environment.
+
+    Removes `--profile [trace.json]` and `--chrome-trace <file>` from args.
+    RESEARCH_PROFILE (trace path, or 1) and RESEARCH_PROFILE_CHROME enable
+    tracing without flags.
+
+    Args:
+        args: Command-line arguments (without the program name)
+        script: Script name used in the trace and the default file name
+
+    Returns:
+        args without the profiling flags
+    """
+    trace_path = os.environ.get(TRACE_ENV) or None
+    if trace_path in ('1', 'true', 'yes'):
+        trace_path = _default_trace_path(script)
+    chrome_path = os.environ.get(CHROME_ENV) or None
+
+    remaining = []
+    i = 0
+    while i < len(args):
+        if args[i] == '--profile':
+            if i + 1 < len(args) and args[i + 1].endswith('.json'):
+                trace_path = args[i + 1]
+                i += 1
+            else:
+                trace_path = trace_path or _default_trace_path(script)
+        elif args[i] == '--chrome-trace' and i + 1 < len(args):
+            chrome_path = args[i + 1]
+            i += 1
+        else:
+            remaining.append(args[i])
+        i += 1
+
+    if trace_path or chrome_path:
+        tracer.enable(script, trace_path or _default_trace_path(script), chrome_path)
+    return remaining
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Project Status - Cached status summary for /research-status
+
+Condenses a research project into one compact JSON document instead of
+having STEERING.md, notebook/tasks.md and every labnote re-read:
+
+- STEERING.md: phase, last update, research question, priorities, active
+  experiments, milestones, next actions and phase history
+- notebook/tasks.md: checkbox counts and open items per section
+- labnotes (via the experiment registry): hypothesis statement and the
+  checked Hypothesis Evaluation box (supported / rejected / inconclusive)
+- results/<Exp##>/: total size and file count
+
+Parsed results are cached in .status_cache.json keyed by size and mtime,
+so only files edited since the last run are parsed again; results trees
+are re-listed only in directories whose mtime changed. Labnotes are read
+with experiment-report's streaming notebook reader when that plugin is
+installed, so embedded images are never loaded.
+
+Usage:
+    project_status.py [--project <path>] [--all] [--pretty | --text]
+
+Options:
+    --all       List every experiment (default: the MAX_ITEMS newest open ones)
+    --pretty    Indented JSON
+    --text      Human-readable summary instead of JSON
+
+Examples:
+    project_status.py --project .
+    project_status.py --project . --text
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from atomic_write import write_atomic
+from experiment_registry import ExperimentRegistry, find_project_root
+from notebook_text import labnote_sections, markdown_sections
+
+
+CACHE_FILENAME = '.status_cache.json'
+CACHE_VERSION = 1
+FINAL_STATUSES = ('complete', 'abandoned')
+EVALUATIONS = ('partially supported', 'supported', 'rejected', 'inconclusive')
+MAX_TEXT = 200  # characters kept of hypotheses and list items
+MAX_OPEN_TASKS = 10  # open task texts listed per tasks.md section
+MAX_ITEMS = 25  # experiments listed without --all (newest open ones)
+
+_FIELD = re.compile(r'^\*\*(.+?)\*\*:\s*(.*)$')
+_LIST_ITEM = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+(.*)$')
+_CHECKBOX = re.compile(r'^\s*[-*+]\s+\[([ xX])\]\s+(.*)$')
+_PLACEHOLDER = re.compile(r'\[TODO\b')
+
+
+def _clip(text, limit=MAX_TEXT):
+    text = ' '.join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + '…'
+
+
+def _list_items(lines):
+    items = []
+    for line in lines:
+        match = _LIST_ITEM.match(line)
+        if match:
+            text = match.group(1).strip().lstrip('✅').strip()
+            if text and text.lower() not in ('none', 'none yet'):
+                items.append(_clip(text))
+    return items
+
+
+def _first_paragraph(text):
+    """First paragraph of a section, or None if it is empty or a TODO placeholder."""
+    for paragraph in re.split(r'\n\s*\n', text or ''):
+        paragraph = paragraph.strip()
+        if paragraph and not paragraph.startswith('#'):
+            return None if _PLACEHOLDER.match(paragraph) else _clip(paragraph)
+    return None
+
+
+def parse_steering(path):
+    """Phase, question, priorities, milestones, next actions and phase history of STEERING.md."""
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    fields = {}
+    for line in lines:
+        match = _FIELD.match(line.strip())
+        if match:
+            fields.setdefault(match.group(1).strip().lower(), match.group(2).strip())
+    sections = markdown_sections(lines)
+
+    history = []
+    header = None
+    for line in sections.get('Phase History', []):
+        if not line.strip().startswith('|'):
+            continue
+        cells = [cell.strip() for cell in line.strip().strip('|').split('|')]
+        if header is None:
+            header = [cell.lower().replace(' ', '_') for cell in cells]
+        elif not all(set(cell) <= set('-: ') for cell in cells):
+            history.append(dict(zip(header, cells)))
+
+    return {
+        'phase': fields.get('phase'),
+        'last_updated': fields.get('last updated'),
+        'research_question': _first_paragraph('\n'.join(sections.get('Research Question', []))),
+        'priorities': _list_items(sections.get('Current Priorities', [])),
+        'active_experiments': _list_items(sections.get('Active Experiments', [])),
+        'milestones': _list_items(sections.get('Completed Milestones', [])),
+        'next_actions': _list_items(sections.get('Next Actions', [])),
+        'phase_history': history,
+        'placeholders': sum(len(_PLACEHOLDER.findall(line)) for line in lines),
+    }
+
+
+def parse_tasks(path):
+    """Checkbox counts and open items per tasks.md section."""
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    sections = {}
+    for name, section_lines in markdown_sections(lines).items():
+        done = 0
+        open_items = []
+        for line in section_lines:
+            match = _CHECKBOX.match(line)
+            if not match:
+                continue
+            if match.group(1) == ' ':
+                open_items.append(_clip(match.group(2)))
+            else:
+                done += 1
+        if done or open_items:
+            sections[name] = {'done': done, 'open': len(open_items), 'open_items': open_items[:MAX_OPEN_TASKS]}
+    return {
+        'sections': sections,
+        'placeholders': sum(len(_PLACEHOLDER.findall(line)) for line in lines),
+    }
+
+
+def parse_labnote(path):
+    """Hypothesis statement and evaluation outcome of one labnote."""
+    sections = labnote_sections(path, ('Hypothesis', 'Hypothesis Evaluation'))
+    evaluation = None
+    if 'Hypothesis Evaluation' in sections:
+        evaluation = 'pending'
+        for line in sections['Hypothesis Evaluation'].splitlines():
+            match = _CHECKBOX.match(line)
+            if match and match.group(1) != ' ':
+                checked = match.group(2).lower()
+                evaluation = next((name for name in EVALUATIONS if name in checked), _clip(checked, 40))
+                break
+    return {'hypothesis': _first_paragraph(sections.get('Hypothesis')), 'evaluation': evaluation}
+
+
+class StatusIndex:
+    """
+    Parse results of STEERING.md, tasks.md and labnotes plus results
+    directory listings, cached by size/mtime in CACHE_FILENAME.
+
+    Args:
+        project_dir: Project root
+    """
+
+    def __init__(self, project_dir):
+        self.project_dir = Path(project_dir)
+        self.cache_path = self.project_dir / CACHE_FILENAME
+        self.parsed = 0
+        self.reused = 0
+        self._dirty = False
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') != CACHE_VERSION:
+                raise ValueError
+            self._files, self._dirs = cache['files'], cache['dirs']
+        except (OSError, ValueError, KeyError, AttributeError):
+            self._files, self._dirs = {}, {}
+        self._seen_files = set()
+        self._seen_dirs = set()
+
+    def parsed_file(self, rel, parse, stat=None):
+        """
+        Parse result for a project file, re-parsed only when its size or mtime changed.
+
+        Args:
+            rel: Project-relative path
+            parse: Parser taking the absolute path
+            stat: Known (size, mtime_ns), e.g. from the registry
+
+        Returns:
+            Parser result, or None if the file is missing or unreadable
+        """
+        path = self.project_dir / rel
+        if stat is None:
+            try:
+                result = os.stat(path)
+            except OSError:
+                return None
+            stat = (result.st_size, result.st_mtime_ns)
+        self._seen_files.add(rel)
+        entry = self._files.get(rel)
+        if entry is not None and (entry['size'], entry['mtime_ns']) == tuple(stat):
+            self.reused += 1
+            return entry['data']
+        try:
+            data = parse(path)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            data = {'error': str(e)}
+        self._files[rel] = {'size': stat[0], 'mtime_ns': stat[1], 'data': data}
+        self.parsed += 1
+        self._dirty = True
+        return data
+
+    def tree_size(self, rel):
+        """
+        (bytes, files) below a directory, re-listing only directories whose mtime changed.
+
+        Hidden entries (.images, .cache, ...) are skipped.
+        """
+        total_bytes = total_files = 0
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            try:
+                mtime_ns = os.stat(self.project_dir / current).st_mtime_ns
+            except OSError:
+                continue
+            self._seen_dirs.add(current)
+            entry = self._dirs.get(current)
+            if entry is None or entry['mtime_ns'] != mtime_ns:
+                size = count = 0
+                subdirs = []
+                try:
+                    with os.scandir(self.project_dir / current) as entries:
+                        for item in entries:
+                            if item.name.startswith('.'):
+                                continue
+                            if item.is_dir(follow_symlinks=False):
+                                subdirs.append(item.name)
+                            elif item.is_file():
+                                size += item.stat().st_size
+                                count += 1
+                except OSError:
+                    continue
+                entry = self._dirs[current] = {'mtime_ns': mtime_ns, 'bytes': size, 'files': count,
+                                               'dirs': subdirs}
+                self._dirty = True
+            total_bytes += entry['bytes']
+            total_files += entry['files']
+            stack.extend(f'{current}/{name}' for name in entry['dirs'])
+        return total_bytes, total_files
+
+    def save(self):
+        """Write the cache if anything changed, dropping entries not seen this run."""
+        if not self._dirty and self._seen_files >= self._files.keys() and self._seen_dirs >= self._dirs.keys():
+            return
+        files = {rel: entry for rel, entry in self._files.items() if rel in self._seen_files}
+        dirs = {rel: entry for rel, entry in self._dirs.items() if rel in self._seen_dirs}
+        try:
+            write_atomic(self.cache_path, json.dumps({'version': CACHE_VERSION, 'files': files, 'dirs': dirs},
+                                                     ensure_ascii=False, separators=(',', ':')))
+        except OSError:
+            pass  # read-only project: the summary is still correct, just not cached
+
+
+def _compact(value):
+    """Drop None values and empty lists/dicts to keep the JSON small."""
+    if isinstance(value, dict):
+        return {key: _compact(item) for key, item in value.items() if item not in (None, [], {})}
+    if isinstance(value, list):
+        return [_compact(item) for item in value]
+    return value
+
+
+def project_status(project_dir, all_experiments=False):
+    """
+    Build the status summary.
+
+    Args:
+        project_dir: Project root
+        all_experiments: List every experiment, not just the MAX_ITEMS
+            newest that are not complete or abandoned
+
+    Returns:
+        Summary dict (see module docstring)
+    """
+    start = time.perf_counter()
+    project_dir = Path(project_dir).resolve()
+    index = StatusIndex(project_dir)
+
+    steering = index.parsed_file('STEERING.md', parse_steering) or {}
+    tasks = index.parsed_file('notebook/tasks.md', parse_tasks) or {}
+
+    with ExperimentRegistry(project_dir) as registry:
+        registry.sync()
+        experiments = registry.list()
+
+    by_status = {}
+    by_evaluation = {}
+    items = []
+    results_bytes = results_files = 0
+    for experiment in experiments:
+        labnote = None
+        if experiment['labnote_path']:
+            labnote = index.parsed_file(experiment['labnote_path'], parse_labnote,
+                                        (experiment['labnote_size'], experiment['labnote_mtime_ns']))
+        labnote = labnote or {}
+        size = files = 0
+        if experiment['results_dir']:
+            size, files = index.tree_size(experiment['results_dir'])
+            results_bytes += size
+            results_files += files
+
+        status = experiment['status']
+        evaluation = labnote.get('evaluation')
+        by_status[status] = by_status.get(status, 0) + 1
+        if evaluation:
+            by_evaluation[evaluation] = by_evaluation.get(evaluation, 0) + 1
+        if all_experiments or status not in FINAL_STATUSES:
+            items.append({
+                'id': experiment['exp_id'],
+                'description': experiment['description'] or None,
+                'status': status,
+                'evaluation': evaluation,
+                'hypothesis': labnote.get('hypothesis') or experiment['hypothesis'],
+                'labnote': experiment['labnote_path'],
+                'results_mb': round(size / 1e6, 1) if experiment['results_dir'] else None,
+                'results_files': files or None,
+                'error': labnote.get('error'),
+            })
+    index.save()
+    omitted = 0
+    if not all_experiments and len(items) > MAX_ITEMS:
+        omitted = len(items) - MAX_ITEMS
+        items = items[-MAX_ITEMS:]
+
+    task_sections = tasks.get('sections', {})
+    summary = {
+        'project': project_dir.name,
+        'phase': steering.get('phase'),
+        'last_updated': steering.get('last_updated'),
+        'research_question': steering.get('research_question'),
+        'priorities': steering.get('priorities'),
+        'steering_active_experiments': steering.get('active_experiments'),
+        'milestones': steering.get('milestones'),
+        'next_actions': steering.get('next_actions'),
+        'phase_history': steering.get('phase_history'),
+        'todo_placeholders': (steering.get('placeholders') or 0) + (tasks.get('placeholders') or 0) or None,
+        'tasks': {
+            'done': sum(section['done'] for section in task_sections.values()),
+            'open': sum(section['open'] for section in task_sections.values()),
+            'sections': task_sections,
+        } if task_sections else None,
+        'experiments': {
+            'total': len(experiments),
+            'by_status': by_status,
+            'by_evaluation': by_evaluation,
+            'items': items,
+            'items_omitted': omitted or None,
+        },
+        'results': {'mb': round(results_bytes / 1e6, 1), 'files': results_files},
+        'index': {'parsed': index.parsed, 'cached': index.reused,
+                  'ms': round((time.perf_counter() - start) * 1000, 1)},
+    }
+    return _compact(summary)
+
+
+def print_text(summary):
+    """Human-readable rendering of a status summary."""
+    print(f"📋 {summary['project']}: phase {summary.get('phase', '?')} "
+          f"(updated {summary.get('last_updated', '?')})")
+    if summary.get('research_question'):
+        print(f"   Question: {summary['research_question']}")
+    experiments = summary['experiments']
+    statuses = ', '.join(f'{n} {status}' for status, n in sorted(experiments.get('by_status', {}).items()))
+    print(f"🧪 {experiments['total']} experiment(s){': ' + statuses if statuses else ''}")
+    evaluations = ', '.join(f'{n} {name}' for name, n in sorted(experiments.get('by_evaluation', {}).items()))
+    if evaluations:
+        print(f"   Hypotheses: {evaluations}")
+    for item in experiments.get('items', []):
+        detail = ', '.join(part for part in (item['status'], item.get('evaluation'),
+                                             f"{item['results_mb']} MB" if 'results_mb' in item else None) if part)
+        print(f"   {item['id']} {item.get('description', '')} [{detail}]")
+        if item.get('hypothesis'):
+            print(f"      H: {item['hypothesis']}")
+    if experiments.get('items_omitted'):
+        print(f"   ... {experiments['items_omitted']} more open experiment(s) (--all to list)")
+    if 'tasks' in summary:
+        print(f"✅ Tasks: {summary['tasks']['done']} done, {summary['tasks']['open']} open")
+    for label, key in (('Priorities', 'priorities'), ('Next actions', 'next_actions')):
+        if summary.get(key):
+            print(f"💡 {label}:")
+            for item in summary[key]:
+                print(f"   - {item}")
+    if summary.get('todo_placeholders'):
+        print(f"⚠️  {summary['todo_placeholders']} [TODO] placeholder(s) left in STEERING.md / tasks.md")
+    index = summary['index']
+    print(f"   (parsed {index.get('parsed', 0)}, cached {index.get('cached', 0)}, {index['ms']} ms)")
+
+
+def main():
+    args = sys.argv[1:]
+    project = None
+    all_experiments = False
+    output = 'json'
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--project' and i + 1 < len(args):
+            project = args[i + 1]
+            i += 2
+        elif args[i] == '--all':
+            all_experiments = True
+            i += 1
+        elif args[i] in ('--pretty', '--text'):
+            output = args[i][2:]
+            i += 1
+        else:
+            print("Usage: project_status.py [--project <path>] [--all] [--pretty | --text]")
+            sys.exit(1)
+
+    project_dir = find_project_root(project or '.')
+    if project_dir is None:
+        print(f"❌ Error: No STEERING.md found at or above {Path(project or '.').resolve()}")
+        sys.exit(1)
+
+    summary = project_status(project_dir, all_experiments)
+    if output == 'text':
+        print_text(summary)
+    elif output == 'pretty':
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps(summary, ensure_ascii=False, separators=(',', ':')))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Sample Sheet - Discover sequencing samples in data/raw for the Snakemake config
+
+Walks data/raw/ once with os.scandir, matches file names against
+configurable patterns and groups the files into samples and units
+(sequencing lanes and runs), with R1/R2 mates paired. Writes:
+
+- src/workflow/config.yaml: the `samples:` list (the rest of the file,
+  comments included, is left as is)
+- src/workflow/samples.tsv: one row per sample unit with the columns
+  sample, unit, fq1, fq2 and bam (paths relative to the project root)
+
+The listing of every directory is cached in .sample_scan.json together
+with its mtime, so a refresh only re-lists directories that gained, lost
+or renamed entries; unchanged directories cost one stat each.
+
+Patterns are regular expressions matched against file names, with the
+named groups `sample` (required), `lane` and `read` (1, 2, R1 or R2).
+The first matching pattern wins. Patterns given with --pattern replace
+the defaults and are remembered in the cache for later refreshes.
+
+Usage:
+    sample_sheet.py --project <path> [--pattern <regex> ...] [--no-cache] [--dry-run]
+
+Examples:
+    sample_sheet.py --project .
+    sample_sheet.py --project . --dry-run
+    sample_sheet.py --project . --pattern '^(?P<sample>[A-Z]+\\d+)_(?P<read>R[12])\\.fq\\.gz$'
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from atomic_write import write_atomic
+
+
+SCAN_CACHE_FILENAME = '.sample_scan.json'
+SCAN_CACHE_VERSION = 1
+RAW_DIR = Path('data') / 'raw'
+SHEET_PATH = Path('src') / 'workflow' / 'samples.tsv'
+CONFIG_PATH = Path('src') / 'workflow' / 'config.yaml'
+SHEET_COLUMNS = ('sample', 'unit', 'fq1', 'fq2', 'bam')
+
+# Directory mtimes this close to the scan may still change within the same
+# timestamp tick; such directories are re-listed on the next refresh
+MTIME_SETTLE_SECONDS = 2.0
+
+_FASTQ = r'\.f(?:ast)?q(?:\.gz|\.bz2|\.zst)?'
+DEFAULT_PATTERNS = (
+    # Illumina bcl2fastq / BCL Convert: Tumor-1_S3_L002_R1_001.fastq.gz
+    rf'^(?P<sample>.+?)_S\d+(?:_L(?P<lane>\d{{3}}))?_(?P<read>R[12])_001{_FASTQ}$',
+    # Tumor-1_L002_R1.fq.gz, Tumor-1_R2.fastq, Tumor-1.1.fq.gz, Tumor-1_2.fastq.gz
+    rf'^(?P<sample>.+?)(?:_L(?P<lane>\d{{3}}))?[._](?P<read>R?[12]){_FASTQ}$',
+    # Single-end FASTQ
+    rf'^(?P<sample>.+?)(?:_L(?P<lane>\d{{3}}))?{_FASTQ}$',
+    # Aligned reads
+    r'^(?P<sample>.+?)\.(?:bam|cram)$',
+)
+
+
+def _yaml_scalar(value):
+    text = str(value)
+    return text if re.fullmatch(r'[A-Za-z0-9_.-]+', text) else json.dumps(text, ensure_ascii=False)
+
+
+def samples_yaml(samples):
+    """The items of a YAML `samples:` list, one `  - name` line each."""
+    return '\n'.join(f'  - {_yaml_scalar(sample)}' for sample in samples)
+
+
+def compile_patterns(patterns):
+    """
+    Compile file name patterns.
+
+    Raises:
+        ValueError: If a pattern is invalid or has no `sample` group
+    """
+    compiled = []
+    for pattern in patterns:
+        try:
+            regex = re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern {pattern!r}: {e}")
+        if 'sample' not in regex.groupindex:
+            raise ValueError(f"Pattern {pattern!r} needs a (?P<sample>...) group")
+        compiled.append(regex)
+    return compiled
+
+
+def load_scan_cache(project_dir):
+    """Cached {'patterns', 'dirs'} or None if missing, unreadable or outdated."""
+    try:
+        with open(Path(project_dir) / SCAN_CACHE_FILENAME, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if not isinstance(cache, dict) or cache.get('version') != SCAN_CACHE_VERSION:
+        return None
+    return cache
+
+
+def save_scan_cache(project_dir, dirs, patterns):
+    path = Path(project_dir) / SCAN_CACHE_FILENAME
+    write_atomic(path, json.dumps({'version': SCAN_CACHE_VERSION, 'patterns': list(patterns), 'dirs': dirs}))
+
+
+def scan_raw(raw_dir, cached_dirs=None):
+    """
+    List every directory below raw_dir, reusing unchanged cached listings.
+
+    Args:
+        raw_dir: data/raw directory
+        cached_dirs: 'dirs' from a previous scan
+
+    Returns:
+        (dirs, listed) - dirs maps each directory relative to raw_dir ('' for
+        raw_dir itself) to {'mtime_ns', 'files', 'dirs'}; listed is the
+        number of directories actually re-listed
+    """
+    cached_dirs = cached_dirs or {}
+    settle_ns = time.time_ns() - int(MTIME_SETTLE_SECONDS * 1e9)
+    dirs = {}
+    listed = 0
+    seen = set()
+    stack = ['']
+    while stack:
+        rel = stack.pop()
+        path = os.path.join(raw_dir, rel)
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        # Symlinked run directories are followed, but each directory only once
+        if (stat.st_dev, stat.st_ino) in seen:
+            continue
+        seen.add((stat.st_dev, stat.st_ino))
+
+        entry = cached_dirs.get(rel)
+        if entry is None or entry.get('mtime_ns') != stat.st_mtime_ns:
+            files, subdirs = [], []
+            try:
+                with os.scandir(path) as entries:
+                    for item in entries:
+                        if item.name.startswith('.'):
+                            continue
+                        if item.is_dir():
+                            subdirs.append(item.name)
+                        elif item.is_file():
+                            files.append(item.name)
+            except PermissionError:
+                continue
+            listed += 1
+            mtime_ns = stat.st_mtime_ns if stat.st_mtime_ns < settle_ns else None
+            entry = {'mtime_ns': mtime_ns, 'files': sorted(files), 'dirs': sorted(subdirs)}
+        dirs[rel] = entry
+        stack.extend(os.path.join(rel, name) if rel else name for name in entry['dirs'])
+    return dirs, listed
+
+
+def _read_number(read):
+    return 2 if read.upper().lstrip('R') == '2' else 1
+
+
+def group_samples(dirs, patterns, raw_prefix=RAW_DIR.as_posix()):
+    """
+    Match listed files against patterns and pair them into sample units.
+
+    A unit is one lane of one run directory; a sample with files in
+    several directories gets the directory in its unit names.
+
+    Args:
+        dirs: Directory listings from scan_raw
+        patterns: Compiled patterns (first match wins)
+        raw_prefix: Prefix for the paths in the sheet
+
+    Returns:
+        (rows, samples, unmatched, warnings) - sheet rows (dicts keyed by
+        SHEET_COLUMNS), sorted sample names, unmatched file paths and
+        warning messages
+    """
+    units = {}
+    unmatched = []
+    warnings = []
+    for rel, entry in dirs.items():
+        for name in entry['files']:
+            path = f'{raw_prefix}/{rel}/{name}' if rel else f'{raw_prefix}/{name}'
+            match = next((m for m in (regex.match(name) for regex in patterns) if m), None)
+            if match is None:
+                unmatched.append(path)
+                continue
+            groups = match.groupdict()
+            lane = groups.get('lane') or ''
+            column = 'bam' if name.endswith(('.bam', '.cram')) else f"fq{_read_number(groups.get('read') or '1')}"
+            unit = units.setdefault((groups['sample'], rel, lane), {})
+            if column in unit:
+                warnings.append(f"{groups['sample']}: {unit[column]} and {path} both match {column}; keeping the first")
+                continue
+            unit[column] = path
+
+    dirs_per_sample = {}
+    for sample, rel, _ in units:
+        dirs_per_sample.setdefault(sample, set()).add(rel)
+
+    rows = []
+    for (sample, rel, lane), files in sorted(units.items()):
+        parts = [rel.replace('/', '-') if len(dirs_per_sample[sample]) > 1 else '', f'L{lane}' if lane else '']
+        unit_name = '-'.join(part for part in parts if part) or '1'
+        if 'fq2' in files and 'fq1' not in files:
+            warnings.append(f"{sample} {unit_name}: {files['fq2']} has no R1 mate")
+        rows.append({'sample': sample, 'unit': unit_name, **{column: files.get(column, '')
+                                                               for column in ('fq1', 'fq2', 'bam')}})
+    samples = sorted(dirs_per_sample)
+    return rows, samples, sorted(unmatched), warnings
+
+
+def discover_samples(project_dir, patterns=None, use_cache=True):
+    """
+    Scan the project's data/raw/ and group its files into samples.
+
+    Args:
+        project_dir: Project root
+        patterns: Pattern strings (default: cached ones, else DEFAULT_PATTERNS)
+        use_cache: Reuse unchanged directory listings from .sample_scan.json
+
+    Returns:
+        Dict with 'samples', 'rows', 'unmatched', 'warnings', 'patterns',
+        'dirs' (directories walked), 'listed' (re-listed) and 'files', or
+        None if data/raw/ does not exist
+
+    Raises:
+        ValueError: If a pattern is invalid
+    """
+    project_dir = Path(project_dir)
+    raw_dir = project_dir / RAW_DIR
+    if not raw_dir.is_dir():
+        return None
+    cache = load_scan_cache(project_dir) if use_cache else None
+    if patterns is None:
+        patterns = (cache or {}).get('patterns') or list(DEFAULT_PATTERNS)
+    compiled = compile_patterns(patterns)
+
+    dirs, listed = scan_raw(raw_dir, (cache or {}).get('dirs'))
+    if listed or cache is None or cache.get('patterns') != list(patterns):
+        save_scan_cache(project_dir, dirs, patterns)
+    rows, samples, unmatched, warnings = group_samples(dirs, compiled)
+    return {
+        'samples': samples,
+        'rows': rows,
+        'unmatched': unmatched,
+        'warnings': warnings,
+        'patterns': list(patterns),
+        'dirs': len(dirs),
+        'listed': listed,
+        'files': sum(len(entry['files']) for entry in dirs.values()),
+    }
+
+
+def _write_if_changed(path, content):
+    """Atomically replace path with content unless it already has it (keeps mtimes stable for Snakemake)."""
+    try:
+        if path.read_text(encoding='utf-8') == content:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, content)
+    return True
+
+
+def write_sample_sheet(path, rows):
+    """Write the TSV sample sheet; returns True if it changed."""
+    lines = ['\t'.join(SHEET_COLUMNS)]
+    lines.extend('\t'.join(row[column] for column in SHEET_COLUMNS) for row in rows)
+    return _write_if_changed(Path(path), '\n'.join(lines) + '\n')
+
+
+_SAMPLES_BLOCK = re.compile(r'^samples:[^\n]*\n(?:[ \t]+[^\n]*\n|[ \t]*-[^\n]*\n)*', re.MULTILINE)
+
+
+def update_config_samples(config_path, samples):
+    """
+    Replace the `samples:` list of a Snakemake config.yaml in place.
+
+    Only that block is rewritten, so comments and other settings survive.
+
+    Returns:
+        (changed, previous_content) - previous_content is None if the
+        file did not exist
+    """
+    config_path = Path(config_path)
+    block = f'samples:\n{samples_yaml(samples)}\n'
+    try:
+        content = config_path.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return _write_if_changed(config_path, block), None
+    if _SAMPLES_BLOCK.search(content):
+        updated = _SAMPLES_BLOCK.sub(lambda _: block, content, count=1)
+    else:
+        updated = content.rstrip('\n') + '\n\n# Samples (from sample_sheet.py)\n' + block
+    return _write_if_changed(config_path, updated), content
+
+
+def refresh(project_dir, patterns=None, use_cache=True, dry_run=False):
+    """
+    Discover samples and update config.yaml and samples.tsv.
+
+    Args:
+        project_dir: Project root
+        patterns: Pattern strings (see discover_samples)
+        use_cache: Reuse unchanged directory listings
+        dry_run: Scan and report without writing the config or sheet
+
+    Returns:
+        discover_samples result plus 'config_changed' and 'sheet_changed',
+        or None if data/raw/ does not exist
+    """
+    project_dir = Path(project_dir).resolve()
+    result = discover_samples(project_dir, patterns, use_cache)
+    if result is None:
+        return None
+    result['config_changed'] = result['sheet_changed'] = False
+    if dry_run or not result['samples']:
+        return result
+
+    result['sheet_changed'] = write_sample_sheet(project_dir / SHEET_PATH, result['rows'])
+    changed, previous = update_config_samples(project_dir / CONFIG_PATH, result['samples'])
+    result['config_changed'] = changed
+    if changed:
+        # Keep the scaffold manifest's record of config.yaml current, so
+        # init_project --upgrade still treats it as unedited
+        from init_project import record_samples
+        record_samples(project_dir, result['samples'], previous)
+    return result
+
+
+def main():
+    args = sys.argv[1:]
+    project = None
+    patterns = []
+    use_cache = True
+    dry_run = False
+
+    i = 0
+    while i < len(args):
+        if args[i] == '--project' and i + 1 < len(args):
+            project = args[i + 1]
+            i += 2
+        elif args[i] == '--pattern' and i + 1 < len(args):
+            patterns.append(args[i + 1])
+            i += 2
+        elif args[i] == '--no-cache':
+            use_cache = False
+            i += 1
+        elif args[i] == '--dry-run':
+            dry_run = True
+            i += 1
+        else:
+            print(f"❌ Error: Unknown option: {args[i]}")
+            sys.exit(1)
+
+    if project is None:
+        print("Usage: sample_sheet.py --project <path> [--pattern <regex> ...] [--no-cache] [--dry-run]")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        result = refresh(project, patterns or None, use_cache, dry_run)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    if result is None:
+        print(f"❌ Error: {Path(project) / RAW_DIR} does not exist")
+        sys.exit(1)
+
+    units = result['rows']
+    paired = sum(1 for row in units if row['fq1'] and row['fq2'])
+    print(f"📋 Scanned {result['files']} file(s) in {result['dirs']} director(ies) "
+          f"({result['listed']} re-listed) in {time.perf_counter() - start:.2f}s")
+    print(f"✅ {len(result['samples'])} sample(s), {len(units)} unit(s) ({paired} paired-end)")
+    for warning in result['warnings']:
+        print(f"⚠️  {warning}")
+    if result['unmatched']:
+        shown = ', '.join(result['unmatched'][:5])
+        more = f" (+{len(result['unmatched']) - 5} more)" if len(result['unmatched']) > 5 else ''
+        print(f"⚠️  {len(result['unmatched'])} file(s) matched no pattern: {shown}{more}")
+
+    if dry_run:
+        for row in units[:20]:
+            print(f"   {row['sample']}\t{row['unit']}\t{row['fq1'] or row['bam']}\t{row['fq2']}")
+        if len(units) > 20:
+            print(f"   ... {len(units) - 20} more")
+        return
+    if not result['samples']:
+        print("💡 No samples found; config.yaml left unchanged")
+        return
+    for label, path, changed in (('Sample sheet', SHEET_PATH, result['sheet_changed']),
+                                 ('Config samples', CONFIG_PATH, result['config_changed'])):
+        print(f"{'💾' if changed else '⏭️ '} {label}: {path}{'' if changed else ' (unchanged)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Search Index - Incremental full-text search over notebooks and notes
+
+Keeps a SQLite FTS5 index (`.search_index.sqlite` in the project root) of
+the text in notebook/labnote/, notebook/knowledge/, notebook/report/ and
+inbox/. Notebooks contribute only their markdown and code cell sources;
+outputs (base64 images, tables, logs) are never read. Markdown is split at
+headings, and every chunk carries its heading trail
+("Materials and Methods / Tools") so queries can be limited to a section.
+
+The index is updated incrementally before each query: every source file is
+stat'ed, and only files whose size or mtime changed are parsed again.
+
+Query syntax:
+    word              Term (case- and accent-insensitive); word* matches a prefix
+    "two words"       Phrase (words adjacent, within one cell or section)
+    -word             Exclude files containing the term
+    section:Name      Only chunks under a heading containing Name
+                      (section:"Hypothesis Evaluation" for several words)
+    kind:labnote      labnote, knowledge, report or inbox
+    exp:Exp03         One experiment (exp:3 works too)
+    type:code         markdown, code or text chunks
+    path:archive      Path contains the text
+
+All terms must occur in the same file, each in a chunk that satisfies the
+section: and type: filters. Files are ranked by their best matching chunk
+(BM25, with section titles weighted double).
+
+Usage:
+    search_index.py --project <path> update [--rebuild]
+    search_index.py --project <path> query <query...> [--limit N] [--json] [--no-update]
+    search_index.py --project <path> stats
+
+Examples:
+    search_index.py --project . query DESeq2 '"batch correction"'
+    search_index.py --project . query 'section:Hypothesis' hypoxia kind:labnote
+    search_index.py --project . query 'type:code' combat -path:archive --json
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from experiment_registry import find_project_root, format_exp_id
+from notebook_text import HEADING, notebook_cells
+
+
+INDEX_FILENAME = '.search_index.sqlite'
+INDEX_VERSION = 1
+
+# (kind, directory relative to the project root)
+SOURCES = (
+    ('labnote', 'notebook/labnote'),
+    ('knowledge', 'notebook/knowledge'),
+    ('report', 'notebook/report'),
+    ('inbox', 'inbox'),
+)
+MARKDOWN_SUFFIXES = ('.md', '.markdown')
+TEXT_SUFFIXES = ('.txt', '.rst')
+MAX_TEXT_BYTES = 16 << 20  # larger .md/.txt files are indexed up to this size
+CHUNK_TYPES = ('markdown', 'code', 'text')
+FILTER_FIELDS = ('kind', 'exp', 'type', 'path')
+
+DEFAULT_LIMIT = 20  # files per query
+HITS_PER_FILE = 3  # chunks shown per file
+SNIPPET_TOKENS = 16
+BATCH_FILES = 200  # files parsed per transaction during an update
+OPTIMIZE_AFTER = 100  # merge FTS segments when an update touched this many files
+
+_EXP_NAME = re.compile(r'^exp[-_ ]?(\d+)', re.IGNORECASE)
+_QUERY_TOKEN = re.compile(r'(-?)(?:([a-z]+):)?(?:"([^"]*)"?|(\S+))', re.IGNORECASE)
+_WORD = re.compile(r'\w')
+_SHELL_PHRASE = re.compile(r'^(-?(?:[a-z]+:)?)(\S*\s.*)$', re.IGNORECASE)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    exp_id TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    chunk_type TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    section TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_file ON chunks (file_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunk_text USING fts5 (
+    section, body,
+    content='chunks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS chunks_insert AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunk_text (rowid, section, body) VALUES (new.id, new.section, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_delete AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunk_text (chunk_text, rowid, section, body)
+    VALUES ('delete', old.id, old.section, old.body);
+END;
+'''
+
+
+class _SectionTrail:
+    """Tracks the open markdown headings and splits text into sections."""
+
+    def __init__(self):
+        self._open = []  # stack of (level, title)
+
+    @property
+    def title(self):
+        return ' / '.join(title for _, title in self._open)
+
+    def split(self, text, position=None):
+        """
+        Split markdown text at headings.
+
+        Args:
+            text: Markdown text
+            position: Position reported for every segment (a cell number);
+                None reports the 1-based line number where a segment starts
+
+        Yields:
+            (position, section, text) per segment; a heading without body
+            text still yields an empty segment so its title is searchable
+        """
+        lines = []
+        start = position or 1
+        pending = False
+        in_fence = False
+        for offset, line in enumerate(text.splitlines()):
+            if line.lstrip().startswith(('```', '~~~')):
+                in_fence = not in_fence
+            heading = None if in_fence else HEADING.match(line)
+            if heading is None:
+                lines.append(line)
+                continue
+            body = '\n'.join(lines).strip()
+            if body or pending:
+                yield start, self.title, body
+            lines = []
+            level = len(heading.group(1))
+            while self._open and self._open[-1][0] >= level:
+                self._open.pop()
+            self._open.append((level, re.sub(r'[*`]', '', heading.group(2)).strip()))
+            start = position if position is not None else offset + 1
+            pending = True
+        body = '\n'.join(lines).strip()
+        if body or pending:
+            yield start, self.title, body
+
+
+def iter_chunks(path):
+    """
+    Split a notebook or text file into indexable chunks.
+
+    Notebook markdown cells are split at headings and code cells are one
+    chunk each, filed under the heading above them. Text files are split
+    at markdown headings.
+
+    Args:
+        path: .ipynb, .md or .txt file
+
+    Yields:
+        (chunk_type, position, section, text); position is the 1-based
+        cell number for notebooks and the line number for text files
+    """
+    path = Path(path)
+    trail = _SectionTrail()
+    if path.suffix == '.ipynb':
+        for cell in notebook_cells(path):
+            number = cell['index'] + 1
+            if cell['cell_type'] == 'markdown':
+                for position, section, text in trail.split(cell['source'], number):
+                    yield 'markdown', position, section, text
+            elif cell['source'].strip():
+                yield 'code', number, trail.title, cell['source'].strip()
+        return
+
+    chunk_type = 'markdown' if path.suffix in MARKDOWN_SUFFIXES else 'text'
+    with open(path, encoding='utf-8', errors='replace') as f:
+        text = f.read(MAX_TEXT_BYTES)
+    for position, section, body in trail.split(text):
+        yield chunk_type, position, section, body
+
+
+def _fts_string(text, prefix=False):
+    """Quote text as an FTS5 string (a phrase of its tokens)."""
+    return '"' + text.replace('"', '""') + '"' + ('*' if prefix else '')
+
+
+class SearchQuery:
+    """
+    Parsed query: FTS5 term expressions plus SQL filters.
+
+    Args:
+        text: Query string (see module docstring for the syntax)
+
+    Raises:
+        ValueError: On an unknown filter value or a query without terms
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.terms = []  # FTS expressions that must each match somewhere in a file
+        self.excluded = []  # FTS expressions that must match nowhere in a file
+        self.sections = []  # chunk-level section constraints
+        self.excluded_sections = []
+        self.filters = []  # (sql, param)
+
+        for match in _QUERY_TOKEN.finditer(text):
+            negate, field, phrase, word = match.groups()
+            field = field.lower() if field else None
+            value = phrase if phrase is not None else word
+            if field is not None and field != 'section' and field not in FILTER_FIELDS:
+                # Not a filter (e.g. "http://..."): search the text as typed
+                value = f'{field}:{value}'
+                field = None
+
+            if field in FILTER_FIELDS:
+                self.filters.append(self._filter(field, value, bool(negate)))
+                continue
+
+            prefix = phrase is None and value.endswith('*')
+            value = value.rstrip('*') if prefix else value
+            if not _WORD.search(value):
+                continue
+            expression = _fts_string(value, prefix)
+            if field == 'section':
+                expression = '{section} : ' + expression
+                (self.excluded_sections if negate else self.sections).append(expression)
+            else:
+                (self.excluded if negate else self.terms).append(expression)
+
+        if not self.terms and not self.sections:
+            raise ValueError(f"Query needs at least one search term or section: {text!r}")
+
+    @staticmethod
+    def _filter(field, value, negate):
+        operator = '!=' if negate else '='
+        if field == 'kind':
+            kinds = [kind for kind, _ in SOURCES]
+            if value.lower() not in kinds:
+                raise ValueError(f"Unknown kind '{value}' (use {', '.join(kinds)})")
+            return f'files.kind {operator} ?', value.lower()
+        if field == 'type':
+            if value.lower() not in CHUNK_TYPES:
+                raise ValueError(f"Unknown type '{value}' (use {', '.join(CHUNK_TYPES)})")
+            return f'chunks.chunk_type {operator} ?', value.lower()
+        if field == 'exp':
+            number = re.sub(r'^exp[-_ ]?', '', value, flags=re.IGNORECASE)
+            if not number.isdigit():
+                raise ValueError(f"Invalid experiment '{value}' (use e.g. Exp03 or 3)")
+            return f'files.exp_id IS {"NOT " if negate else ""}?', format_exp_id(int(number))
+        # path: substring, case-insensitive for ASCII
+        return f"files.path {'NOT ' if negate else ''}LIKE ? ESCAPE '\\'", \
+            '%' + re.sub(r'([%_\\])', r'\\\1', value) + '%'
+
+    def scoped(self, expression):
+        """Restrict a term expression to chunks satisfying the section constraints."""
+        expression = ' AND '.join(part for part in (expression, *self.sections) if part)
+        for section in self.excluded_sections:
+            expression = f'({expression}) NOT {section}'
+        return expression
+
+    def any_term(self):
+        """Expression matching chunks that contain any of the query's terms."""
+        return self.scoped('(' + ' OR '.join(self.terms) + ')' if self.terms else None)
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index of one project's notebooks and notes.
+
+    Args:
+        project_dir: Project root (where STEERING.md lives)
+        rebuild: Discard the existing index first
+    """
+
+    def __init__(self, project_dir, rebuild=False):
+        self.project_dir = Path(project_dir).resolve()
+        self.db_path = self.project_dir / INDEX_FILENAME
+        self._conn = self._connect(rebuild)
+
+    def _connect(self, rebuild):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        has_tables = conn.execute("SELECT count(*) FROM sqlite_master WHERE name = 'files'").fetchone()[0]
+        if rebuild or (has_tables and version != INDEX_VERSION):
+            conn.close()
+            self.db_path.unlink()
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_SCHEMA)
+        conn.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+        return conn
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _walk(self, directory, skip_templates):
+        """Yield (path, stat) of indexable files under directory, recursively."""
+        try:
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError):
+            return
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue  # .ipynb_checkpoints, editor swap files
+            if entry.is_dir():
+                yield from self._walk(entry.path, skip_templates)
+                continue
+            suffix = os.path.splitext(entry.name)[1].lower()
+            if suffix != '.ipynb' and suffix not in MARKDOWN_SUFFIXES + TEXT_SUFFIXES:
+                continue
+            if skip_templates:
+                match = _EXP_NAME.match(entry.name)
+                if match and int(match.group(1)) == 0:  # Exp00 is the template
+                    continue
+            try:
+                yield entry.path, entry.stat()
+            except FileNotFoundError:
+                continue
+
+    def update(self):
+        """
+        Bring the index up to date with the source directories.
+
+        Returns:
+            dict with 'indexed', 'removed', 'unchanged' and 'errors'
+            (list of "path: message")
+        """
+        known = {row['path']: row for row in self._conn.execute('SELECT id, path, size, mtime_ns FROM files')}
+        seen = set()
+        stale = []
+        for kind, directory in SOURCES:
+            skip_templates = kind in ('labnote', 'report')
+            for path, stat in self._walk(self.project_dir / directory, skip_templates):
+                rel = Path(path).relative_to(self.project_dir).as_posix()
+                seen.add(rel)
+                row = known.get(rel)
+                if row is None or row['size'] != stat.st_size or row['mtime_ns'] != stat.st_mtime_ns:
+                    stale.append((rel, kind, stat))
+        removed = [row['id'] for path, row in known.items() if path not in seen]
+
+        errors = []
+        if removed:
+            self._write(lambda: [self._remove(file_id) for file_id in removed])
+        for start in range(0, len(stale), BATCH_FILES):
+            batch = stale[start:start + BATCH_FILES]
+            self._write(lambda: [self._index_file(*item, known.get(item[0]), errors) for item in batch])
+        if len(stale) + len(removed) >= OPTIMIZE_AFTER:
+            self._conn.execute("INSERT INTO chunk_text (chunk_text) VALUES ('optimize')")
+
+        return {
+            'indexed': len(stale),
+            'removed': len(removed),
+            'unchanged': len(seen) - len(stale),
+            'errors': errors,
+        }
+
+    def _write(self, operation):
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            operation()
+            self._conn.execute('COMMIT')
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def _remove(self, file_id):
+        self._conn.execute('DELETE FROM chunks WHERE file_id = ?', (file_id,))
+        self._conn.execute('DELETE FROM files WHERE id = ?', (file_id,))
+
+    def _index_file(self, rel, kind, stat, row, errors):
+        if row is not None:
+            self._remove(row['id'])
+        match = _EXP_NAME.match(Path(rel).name)
+        exp_id = format_exp_id(int(match.group(1))) if match else None
+
+        # Parse before writing so a broken file is recorded without partial chunks
+        error = None
+        try:
+            chunks = list(iter_chunks(self.project_dir / rel))
+        except (OSError, ValueError) as e:  # JSONDecodeError and UnicodeDecodeError are ValueErrors
+            chunks = []
+            error = str(e)
+            errors.append(f'{rel}: {e}')
+
+        file_id = self._conn.execute(
+            'INSERT INTO files (path, kind, exp_id, size, mtime_ns, error) VALUES (?, ?, ?, ?, ?, ?)',
+            (rel, kind, exp_id, stat.st_size, stat.st_mtime_ns, error),
+        ).lastrowid
+        self._conn.executemany(
+            'INSERT INTO chunks (file_id, chunk_type, position, section, body) VALUES (?, ?, ?, ?, ?)',
+            [(file_id, *chunk) for chunk in chunks],
+        )
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """
+        Run a query against the index.
+
+        Args:
+            query: Query string or SearchQuery
+            limit: Maximum number of files returned
+
+        Returns:
+            dict with 'files_matched' and 'results': one entry per file
+            (path, kind, exp, hits) in rank order; each hit has type,
+            position, section and a snippet with matches in **bold**
+        """
+        if not isinstance(query, SearchQuery):
+            query = SearchQuery(query)
+        filters = ''.join(f' AND {sql}' for sql, _ in query.filters)
+        params = [param for _, param in query.filters]
+        matching = ('FROM chunk_text JOIN chunks ON chunks.id = chunk_text.rowid '
+                    'JOIN files ON files.id = chunks.file_id WHERE chunk_text MATCH ?' + filters)
+
+        def files_matching(expression):
+            return {row[0] for row in self._conn.execute(
+                'SELECT DISTINCT chunks.file_id ' + matching, (expression, *params))}
+
+        # Every term must occur in the file; a lone section: query matches by itself
+        candidates = None
+        for term in query.terms or [None]:
+            found = files_matching(query.scoped(term))
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return {'files_matched': 0, 'results': []}
+        for term in query.excluded:
+            candidates -= files_matching(query.scoped(term))
+
+        # Rank by best chunk; fetch snippets only for the chunks shown
+        expression = query.any_term()
+        ranked = {}
+        cursor = self._conn.execute(
+            'SELECT chunks.id, chunks.file_id ' + matching + ' ORDER BY bm25(chunk_text, 2.0, 1.0)',
+            (expression, *params),
+        )
+        for chunk_id, file_id in cursor:
+            if file_id not in candidates:
+                continue
+            if file_id not in ranked:
+                if len(ranked) == limit:
+                    break
+                ranked[file_id] = []
+            if len(ranked[file_id]) < HITS_PER_FILE:
+                ranked[file_id].append(chunk_id)
+        cursor.close()
+
+        chunk_ids = [chunk_id for ids in ranked.values() for chunk_id in ids]
+        details = {}
+        if chunk_ids:
+            rows = self._conn.execute(
+                'SELECT chunks.id, files.path, files.kind, files.exp_id, chunks.chunk_type, chunks.position, '
+                f"chunks.section, snippet(chunk_text, CASE chunks.body WHEN '' THEN 0 ELSE 1 END, "
+                f"'**', '**', '…', {SNIPPET_TOKENS}) AS snippet "
+                'FROM chunk_text JOIN chunks ON chunks.id = chunk_text.rowid '
+                'JOIN files ON files.id = chunks.file_id '
+                f'WHERE chunk_text MATCH ? AND chunk_text.rowid IN ({",".join("?" * len(chunk_ids))})',
+                (expression, *chunk_ids),
+            )
+            details = {row['id']: row for row in rows}
+
+        results = []
+        for file_id, ids in ranked.items():
+            first = details[ids[0]]
+            results.append({
+                'path': first['path'],
+                'kind': first['kind'],
+                'exp': first['exp_id'],
+                'hits': [{
+                    'type': details[chunk_id]['chunk_type'],
+                    'position': details[chunk_id]['position'],
+                    'section': details[chunk_id]['section'],
+                    'snippet': ' '.join(details[chunk_id]['snippet'].split()),
+                } for chunk_id in ids],
+            })
+        return {'files_matched': len(candidates), 'results': results}
+
+    def stats(self):
+        """File and chunk counts per kind, plus the index size on disk."""
+        kinds = {}
+        for row in self._conn.execute(
+                'SELECT files.kind, count(DISTINCT files.id) AS files, count(chunks.id) AS chunks '
+                'FROM files LEFT JOIN chunks ON chunks.file_id = files.id GROUP BY files.kind'):
+            kinds[row['kind']] = {'files': row['files'], 'chunks': row['chunks']}
+        errors = [f"{row['path']}: {row['error']}" for row in self._conn.execute(
+            'SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path')]
+        page_size = self._conn.execute('PRAGMA page_size').fetchone()[0]
+        pages = self._conn.execute('PRAGMA page_count').fetchone()[0]
+        return {'kinds': kinds, 'errors': errors, 'size_mb': round(page_size * pages / 1e6, 2)}
+
+
+def _requote(arg):
+    """Re-quote a phrase the shell unquoted ("batch correction" arrives as one argument)."""
+    match = _SHELL_PHRASE.match(arg)
+    return f'{match.group(1)}"{match.group(2)}"' if match and '"' not in arg else arg
+
+
+def print_results(query, found, elapsed_ms):
+    """Human-readable rendering of search results."""
+    shown = len(found['results'])
+    more = f", showing {shown}" if shown < found['files_matched'] else ''
+    print(f"🔍 {found['files_matched']} file(s) match {query!r}{more} ({elapsed_ms} ms)")
+    for result in found['results']:
+        label = ', '.join(part for part in (result['exp'], result['kind']) if part)
+        print(f"📄 {result['path']}  ({label})")
+        notebook = result['path'].endswith('.ipynb')
+        for hit in result['hits']:
+            where = f"{'cell' if notebook else 'line'} {hit['position']}"
+            if hit['section']:
+                where += f" · {hit['section']}"
+            print(f"   {where}: {hit['snippet']}")
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 3 or args[0] != '--project':
+        print("Usage: search_index.py --project <path> <command>")
+        print()
+        print("Commands:")
+        print("  update [--rebuild]                Index new and changed files")
+        print("  query <query...> [--limit N]      Search (see the module docstring for the syntax)")
+        print("        [--json] [--no-update]")
+        print("  stats                             Indexed files and chunks per kind")
+        sys.exit(1)
+
+    project_dir = find_project_root(args[1])
+    command = args[2]
+    rest = args[3:]
+
+    if project_dir is None:
+        print(f"❌ Error: Not a research project (no STEERING.md): {Path(args[1]).resolve()}")
+        sys.exit(1)
+
+    if command == 'update':
+        started = time.perf_counter()
+        with SearchIndex(project_dir, rebuild='--rebuild' in rest) as index:
+            summary = index.update()
+        for error in summary['errors']:
+            print(f"⚠️  Skipped {error}")
+        print(f"✅ Index updated: {summary['indexed']} file(s) indexed, {summary['removed']} removed, "
+              f"{summary['unchanged']} unchanged ({time.perf_counter() - started:.2f}s)")
+
+    elif command == 'query':
+        terms = []
+        limit = DEFAULT_LIMIT
+        output = 'text'
+        update = True
+        i = 0
+        while i < len(rest):
+            if rest[i] == '--limit' and i + 1 < len(rest):
+                try:
+                    limit = int(rest[i + 1])
+                except ValueError:
+                    limit = 0
+                if limit < 1:
+                    print(f"❌ Error: --limit must be a positive integer (got {rest[i + 1]})")
+                    sys.exit(1)
+                i += 2
+            elif rest[i] == '--json':
+                output = 'json'
+                i += 1
+            elif rest[i] == '--no-update':
+                update = False
+                i += 1
+            else:
+                terms.append(_requote(rest[i]))
+                i += 1
+        query = ' '.join(terms)
+
+        started = time.perf_counter()
+        with SearchIndex(project_dir) as index:
+            summary = index.update() if update else None
+            try:
+                found = index.search(query, limit)
+            except ValueError as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        if output == 'json':
+            found['query'] = query
+            found['ms'] = elapsed_ms
+            if summary is not None:
+                found['indexed'] = summary['indexed']
+            print(json.dumps(found, ensure_ascii=False, separators=(',', ':')))
+        else:
+            if summary is not None and summary['indexed'] + summary['removed']:
+                print(f"🔄 Indexed {summary['indexed']} changed file(s), removed {summary['removed']}")
+            print_results(query, found, elapsed_ms)
+
+    elif command == 'stats':
+        with SearchIndex(project_dir) as index:
+            stats = index.stats()
+        for kind, counts in sorted(stats['kinds'].items()):
+            print(f"📋 {kind:<10} {counts['files']:>6} file(s) {counts['chunks']:>8} chunk(s)")
+        for error in stats['errors']:
+            print(f"⚠️  Not indexed: {error}")
+        print(f"💾 {INDEX_FILENAME}: {stats['size_mb']} MB")
+
+    else:
+        print(f"❌ Error: Unknown command: {' '.join(args[2:])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()